@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+benchmark_parsers.py
+
+Compara el tiempo de parseo por página de los dos caminos de page_parsers:
+XPath precompilado sobre lxml vs BeautifulSoup.
+
+Por defecto usa páginas sintéticas con el layout de SIBOM (listado de 10
+boletines con paginación y boletín de 60 normas). También acepta HTML real
+guardado desde el sitio.
+
+Uso:
+    python benchmark_parsers.py
+    python benchmark_parsers.py --listing cities_22.html --bulletin bulletin_1636.html
+    python benchmark_parsers.py --repeat 200
+
+@created 2026-10-17
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+from page_parsers import (detect_total_pages_lxml, detect_total_pages_soup,
+                          parse_content_links_lxml, parse_content_links_soup,
+                          parse_listing_lxml, parse_listing_soup)
+
+console = Console()
+
+# Encabezado y pie parecidos a los de SIBOM (el parser recorre todo el documento)
+PAGE_CHROME = ("<html><head><title>SIBOM</title>"
+               + "<link rel='stylesheet' href='/assets/app.css'>" * 5
+               + "<script src='/assets/app.js'></script></head><body>"
+               + "<nav class='navbar'><ul>" + "<li><a href='/cities'>Municipios</a></li>" * 20
+               + "</ul></nav><div class='container'>{body}</div>"
+               + "<footer><p>Sistema de Boletines Oficiales Municipales</p></footer></body></html>")
+
+
+def synthetic_listing(bulletins: int = 10, total_pages: int = 14) -> str:
+    rows = ''.join(f"""
+        <div class="row bulletin">
+          <div class="col-md-8">
+            <p class="bulletin-title">{n}º de Carlos Tejedor</p>
+            <p class="bulletin-date">Publicado el 02/01/2026</p>
+          </div>
+          <div class="col-md-4">
+            <form class="button_to" method="get" action="/bulletins/{1600 + n}">
+              <input type="submit" value="Ver">
+            </form>
+          </div>
+        </div>""" for n in range(bulletins, 0, -1))
+    pages = ''.join(f'<li><a href="/cities/22?page={p}">{p}</a></li>' for p in range(1, 6))
+    pagination = (f'<ul class="pagination">{pages}'
+                  f'<li><a href="/cities/22?page={total_pages}">Última &raquo;</a></li></ul>')
+    return PAGE_CHROME.format(body=rows + pagination)
+
+
+def synthetic_bulletin(norms: int = 60) -> str:
+    tipos = ('ordinance', 'decree', 'resolution', 'disposition')
+    links = ''.join(f"""
+        <a class="content-link" href="/bulletins/1636/contents/{1270000 + n}">
+          <div class="white-box {tipos[n % len(tipos)]}">
+            <p><strong>Decreto Nº {n}/2026</strong></p>
+            <p class="city-and-date">Carlos Tejedor, 02/01/2026</p>
+            <p>VISTO: El expediente administrativo {n} y CONSIDERANDO que resulta necesario</p>
+            <p>Que la Secretaría de Hacienda ha tomado la intervención de su competencia</p>
+            <p>Por ello, el Intendente Municipal DECRETA</p>
+          </div>
+        </a>""" for n in range(norms))
+    return PAGE_CHROME.format(body=links)
+
+
+def time_per_page(parser: Callable[[str], object], html: str, repeat: int) -> float:
+    """Milisegundos por página (mejor de 3 tandas de `repeat`)"""
+    best = float('inf')
+    for _ in range(3):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            parser(html)
+        best = min(best, (time.perf_counter() - started) / repeat)
+    return best * 1000
+
+
+def read_html(path: Optional[str]) -> Optional[str]:
+    return Path(path).read_text(encoding='utf-8') if path else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de parsers de listado y enlaces (lxml vs BeautifulSoup)")
+    parser.add_argument('--listing', help='HTML de una página de listado (default: sintético)')
+    parser.add_argument('--bulletin', help='HTML de una página de boletín (default: sintético)')
+    parser.add_argument('--repeat', type=int, default=50, help='Parseos por tanda (default: 50)')
+    args = parser.parse_args()
+
+    listing = read_html(args.listing) or synthetic_listing()
+    bulletin = read_html(args.bulletin) or synthetic_bulletin()
+
+    cases = [
+        ("Listado de boletines", parse_listing_lxml, parse_listing_soup, listing),
+        ("Paginación", detect_total_pages_lxml, detect_total_pages_soup, listing),
+        ("Enlaces a normas", parse_content_links_lxml, parse_content_links_soup, bulletin),
+    ]
+
+    table = Table(title=f"⏱ Parseo por página ({args.repeat} repeticiones, mejor de 3)")
+    table.add_column("Parser", style="cyan")
+    table.add_column("Tamaño", justify="right")
+    table.add_column("lxml/XPath", justify="right", style="green")
+    table.add_column("BeautifulSoup", justify="right", style="yellow")
+    table.add_column("Aceleración", justify="right", style="bold")
+
+    for name, fast, slow, html in cases:
+        if fast(html) != slow(html):
+            console.print(f"[red]✗ {name}: los dos caminos dan resultados distintos[/red]")
+        fast_ms = time_per_page(fast, html, args.repeat)
+        slow_ms = time_per_page(slow, html, args.repeat)
+        table.add_row(name, f"{len(html) / 1024:.1f} KB", f"{fast_ms:.3f} ms",
+                      f"{slow_ms:.3f} ms", f"{slow_ms / fast_ms:.1f}x")
+
+    console.print(table)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+bulletin_scheduler.py
+
+Planificador de boletines entre ciudades para el modo múltiples ciudades.
+Los boletines de todas las ciudades van a una única cola de prioridad que
+drena un pool de workers: mientras una ciudad termina su cola, los
+workers libres ya están procesando boletines de la siguiente.
+
+El pool es fijo o, con un AIMDController, adaptativo: se lanzan `maximum`
+workers y cada boletín espera un lugar bajo el límite actual.
+
+Prioridad: posición del boletín en el listado de su ciudad y luego orden de
+la ciudad, es decir, round-robin entre ciudades empezando por los más nuevos.
+
+Uso:
+    scheduler = BulletinScheduler(4, handler, on_city_done)
+    scheduler.start()
+    for city_id in cities:
+        scheduler.submit_city(city_id, bulletins)
+    scheduler.join()
+
+@created 2026-10-17
+"""
+
+import queue
+import sys
+import threading
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from concurrency import AIMDController
+
+# Resultado de un boletín: (bulletin, result)
+ProcessedPair = Tuple[Dict[str, Any], Dict[str, Any]]
+
+
+@dataclass(order=True)
+class BulletinTask:
+    """Boletín pendiente; se ordena solo por prioridad"""
+    priority: Tuple[int, int]
+    city_id: Optional[int] = field(compare=False, default=None)
+    bulletin: Optional[Dict[str, Any]] = field(compare=False, default=None)
+
+
+class BulletinScheduler:
+    """
+    Cola de prioridad de boletines de varias ciudades con pool de workers.
+
+    Lleva la cuenta de pendientes por ciudad y llama a `on_city_done` (desde
+    el worker que terminó el último boletín) con los resultados de la ciudad
+    en el orden del listado.
+
+    Una excepción de `on_result` u `on_city_done` no mata al worker: la
+    ciudad queda en `city_errors` y se informa una vez por `on_error`.
+    """
+
+    # Va detrás de cualquier boletín real
+    _STOP_PRIORITY = (sys.maxsize, sys.maxsize)
+
+    def __init__(self, workers: int,
+                 handler: Callable[[int, Dict[str, Any]], Dict[str, Any]],
+                 on_city_done: Callable[[int, List[ProcessedPair]], None],
+                 on_result: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+                 concurrency: Optional[AIMDController] = None,
+                 on_error: Optional[Callable[[int, str], None]] = None):
+        """
+        Args:
+            workers: Tamaño del pool (boletines en paralelo entre todas las ciudades)
+            handler: Procesa un boletín: (city_id, bulletin) -> result
+            on_city_done: (city_id, [(bulletin, result), ...]) al terminar cada ciudad
+            on_result: (city_id, result) tras cada boletín (progreso)
+            concurrency: Límite adaptativo (reemplaza a `workers`; el pool es su máximo)
+            on_error: (city_id, mensaje) la primera vez que falla un callback de
+                la ciudad; None = se escribe en stderr
+        """
+        self.concurrency = concurrency
+        self.workers = concurrency.maximum if concurrency else max(1, workers)
+        self.handler = handler
+        self.on_city_done = on_city_done
+        self.on_result = on_result
+        self.on_error = on_error
+        # city_id -> primer error de un callback de esa ciudad
+        self.city_errors: Dict[int, str] = {}
+
+        self._queue: "queue.PriorityQueue[BulletinTask]" = queue.PriorityQueue()
+        self._lock = threading.Lock()
+        self._city_order: Dict[int, int] = {}
+        self._pending: Dict[int, int] = {}
+        self._results: Dict[int, List[Optional[ProcessedPair]]] = {}
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        for n in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f'bulletin-{n}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit_city(self, city_id: int, bulletins: List[Dict[str, Any]]):
+        """Encola los boletines de una ciudad (una ciudad sin boletines termina en el acto)"""
+        with self._lock:
+            order = self._city_order.setdefault(city_id, len(self._city_order))
+            self._pending[city_id] = len(bulletins)
+            self._results[city_id] = [None] * len(bulletins)
+
+        if not bulletins:
+            self._callback(self.on_city_done, city_id, [])
+            return
+
+        for position, bulletin in enumerate(bulletins):
+            # El índice en el listado viaja en la prioridad para reordenar resultados
+            self._queue.put(BulletinTask((position, order), city_id, bulletin))
+
+    def cancel(self) -> int:
+        """
+        Descarta los boletines que todavía no empezaron.
+        Sus ciudades no se cierran (no se avanza su watermark).
+
+        Returns:
+            Cantidad de boletines descartados
+        """
+        dropped = 0
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return dropped
+            dropped += 1
+
+    def join(self):
+        """Espera a que se procesen todos los boletines encolados y detiene los workers"""
+        for _ in self._threads:
+            self._queue.put(BulletinTask(self._STOP_PRIORITY))
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _worker(self):
+        while True:
+            task = self._queue.get()
+            if task.city_id is None:
+                return
+
+            try:
+                with self.concurrency.slot() if self.concurrency else nullcontext():
+                    result = self.handler(task.city_id, task.bulletin)
+            except Exception as e:
+                result = {**task.bulletin, "status": "error", "error": str(e)}
+
+            if self.on_result:
+                self._callback(self.on_result, task.city_id, result)
+
+            position = task.priority[0]
+            with self._lock:
+                self._results[task.city_id][position] = (task.bulletin, result)
+                self._pending[task.city_id] -= 1
+                city_done = self._pending[task.city_id] == 0
+                pairs = self._results.pop(task.city_id) if city_done else None
+
+            if city_done:
+                self._callback(self.on_city_done, task.city_id, pairs)
+
+    def _callback(self, callback: Callable[[int, Any], None], city_id: int, arg: Any):
+        """
+        Llama a un callback de la ciudad. Si falla, la ciudad queda como error
+        y el worker sigue: si el pool se achicara en silencio, los boletines
+        encolados no se procesarían nunca y join() terminaría igual.
+        """
+        try:
+            callback(city_id, arg)
+        except Exception as e:
+            message = f"{type(e).__name__}: {e}"
+            with self._lock:
+                first = city_id not in self.city_errors
+                self.city_errors.setdefault(city_id, message)
+            if not first:
+                return
+            try:
+                if self.on_error:
+                    self.on_error(city_id, message)
+                    return
+            except Exception:
+                pass
+            print(f"Error en la ciudad {city_id}: {message}", file=sys.stderr)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+bulletin_writer.py
+
+Escritura incremental del JSON de un boletín.
+Cada norma se serializa y se escribe apenas se extrae, de modo que la
+memoria no crece con el tamaño del boletín. Los totales del boletín se
+acumulan al vuelo y se escriben al final.
+
+El archivo se escribe como <nombre>.json.partial y solo al finalizar se
+renombra de forma atómica a <nombre>.json: un boletín a medio escribir
+nunca se confunde con uno completo.
+
+Uso:
+    writer = BulletinWriter(filepath, {"municipio": "Merlo", ...})
+    for norma in normas:
+        writer.write(norma)
+    summary = writer.finalize()
+
+@created 2026-10-17
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+
+class BulletinWriter:
+    """
+    Escritor en streaming del formato V2 de boletines.
+
+    Produce el mismo JSON que `json.dump(result, indent=2)`; solo cambia el
+    orden de claves: `total_normas` y `metadata_boletin` van después de `normas`.
+    """
+
+    VERSION_SCRAPER = "2.0"
+
+    def __init__(self, filepath: Path, header: Dict[str, Any]):
+        """
+        Args:
+            filepath: Destino final del boletín (.json)
+            header: Campos del boletín previos a la lista de normas
+        """
+        self.filepath = Path(filepath)
+        self.partial_path = self.filepath.with_name(self.filepath.name + '.partial')
+        self.header = dict(header)
+
+        self.total_normas = 0
+        self.totals = {'total_caracteres': 0, 'total_tablas': 0, 'total_montos': 0}
+        self.tipos_count: Dict[str, int] = {}
+
+        self._file = self.partial_path.open('w', encoding='utf-8')
+        self._file.write('{\n')
+        for key, value in self.header.items():
+            self._file.write(f'  {json.dumps(key)}: {self._dumps(value, 2)},\n')
+        self._file.write('  "normas": [')
+
+    @staticmethod
+    def _dumps(value: Any, depth: int) -> str:
+        """Serializa con indent=2 como si estuviera anidado a `depth` espacios"""
+        text = json.dumps(value, indent=2, ensure_ascii=False)
+        return text.replace('\n', '\n' + ' ' * depth)
+
+    def write(self, norma: Dict[str, Any]):
+        """Agrega una norma al archivo y a los totales del boletín"""
+        separator = ',\n' if self.total_normas else '\n'
+        self._file.write(f'{separator}    {self._dumps(norma, 4)}')
+        self._file.flush()
+
+        self.total_normas += 1
+        metadata = norma.get('metadata', {})
+        self.totals['total_caracteres'] += metadata.get('longitud_caracteres', 0)
+        self.totals['total_tablas'] += metadata.get('total_tablas', 0)
+        self.totals['total_montos'] += metadata.get('total_montos', 0)
+        tipo = norma.get('tipo', 'desconocido')
+        self.tipos_count[tipo] = self.tipos_count.get(tipo, 0) + 1
+
+    def finalize(self) -> Dict[str, Any]:
+        """
+        Cierra la lista de normas, escribe los totales y publica el archivo.
+
+        Returns:
+            Resultado del boletín sin la lista de normas
+        """
+        metadata_boletin = {
+            **self.totals,
+            "fecha_scraping": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            "version_scraper": self.VERSION_SCRAPER
+        }
+        self._file.write('\n  ],\n' if self.total_normas else '],\n')
+        self._file.write(f'  "total_normas": {self.total_normas},\n')
+        self._file.write(f'  "metadata_boletin": {self._dumps(metadata_boletin, 2)}\n}}')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self.partial_path, self.filepath)
+
+        return {
+            **self.header,
+            "total_normas": self.total_normas,
+            "metadata_boletin": metadata_boletin,
+        }
+
+    def abort(self):
+        """Cierra el archivo parcial sin publicarlo (queda el .partial)"""
+        if not self._file.closed:
+            self._file.close()
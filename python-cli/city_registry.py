@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+city_registry.py
+
+Registro de ciudades de SIBOM: descubrimiento concurrente y consultas en memoria.
+
+- Descubre ciudades descargando sus listados en paralelo sobre el pool de
+  conexiones compartido (HTTPClient.fetch_many).
+- Persiste por ciudad: nombre, fecha del último boletín publicado y cantidad
+  de boletines.
+- Las consultas de nombre se sirven desde un mapa en memoria cargado una sola
+  vez por proceso.
+
+Archivos:
+    boletines/CITY_MAP.json         # {"22": "Merlo", ...} (formato histórico)
+    boletines/.city_registry.json   # {"22": {"name", "last_seen", "bulletin_count", "checked_at"}}
+
+@created 2026-10-17
+"""
+
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional
+
+SIBOM_BASE_URL = "https://sibom.slyt.gba.gob.ar"
+
+# <p class="bulletin-title">105º de Carlos Tejedor</p>
+TITLE_PATTERN = re.compile(
+    r'<p[^>]*class="[^"]*bulletin-title[^"]*"[^>]*>([^<]+)</p>', re.IGNORECASE)
+CITY_NAME_PATTERN = re.compile(r'º?\s+de\s+([A-ZÁÉÍÓÚÑ][A-Za-záéíóúñÑ\s]+)')
+# <p class="bulletin-date">Publicado el 02/01/2026</p>
+DATE_PATTERN = re.compile(
+    r'<p[^>]*class="[^"]*bulletin-date[^"]*"[^>]*>[^<]*?(\d{2}/\d{2}/\d{4})', re.IGNORECASE)
+PAGE_PATTERN = re.compile(r'[?&]page=(\d+)')
+
+
+def parse_city_listing(html: str) -> Optional[Dict[str, Any]]:
+    """
+    Extrae nombre, fecha del boletín más nuevo, boletines en la página y
+    total de páginas de la primera página de listado de una ciudad.
+
+    Returns:
+        Dict con name, last_seen, page_count, total_pages; None si no es una ciudad válida
+    """
+    titles = TITLE_PATTERN.findall(html)
+    if not titles:
+        return None
+    name_match = CITY_NAME_PATTERN.search(titles[0].strip())
+    if not name_match:
+        return None
+    date_match = DATE_PATTERN.search(html)
+    pages = [int(p) for p in PAGE_PATTERN.findall(html)]
+    return {
+        'name': name_match.group(1).strip(),
+        'last_seen': date_match.group(1) if date_match else None,
+        'page_count': len(titles),
+        'total_pages': max(pages) if pages else 1,
+    }
+
+
+class CityRegistry:
+    """
+    Registro de ciudades con mapa de nombres memoizado por proceso.
+
+    Varias instancias sobre el mismo archivo comparten la misma carga.
+    """
+
+    DEFAULT_MAP_FILE = Path("boletines/CITY_MAP.json")
+
+    # Caché por proceso: ruta de CITY_MAP -> {id: nombre}
+    _names_cache: Dict[Path, Dict[str, str]] = {}
+    _cache_lock = threading.Lock()
+
+    def __init__(self, map_path: Path = DEFAULT_MAP_FILE,
+                 fallback: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            map_path: CITY_MAP.json (el registro detallado va al lado)
+            fallback: Mapa a usar si CITY_MAP.json no existe o es inválido
+        """
+        self.map_path = Path(map_path)
+        self.registry_path = self.map_path.with_name('.city_registry.json')
+        self.fallback = dict(fallback or {})
+
+    # ========================================================================
+    # CONSULTAS
+    # ========================================================================
+
+    def names(self) -> Dict[str, str]:
+        """Mapa {id: nombre}, leído de disco solo la primera vez en el proceso"""
+        key = self.map_path.resolve()
+        with self._cache_lock:
+            names = self._names_cache.get(key)
+            if names is None:
+                names = self._read_json(self.map_path) or dict(self.fallback)
+                self._names_cache[key] = names
+            return names
+
+    def name(self, city_id: Any) -> Optional[str]:
+        return self.names().get(str(city_id))
+
+    def details(self) -> Dict[str, Dict[str, Any]]:
+        """Registro detallado (nombre, último boletín, cantidad de boletines)"""
+        return self._read_json(self.registry_path) or {}
+
+    def reload(self):
+        """Descarta el mapa memoizado (se vuelve a leer en la próxima consulta)"""
+        with self._cache_lock:
+            self._names_cache.pop(self.map_path.resolve(), None)
+
+    # ========================================================================
+    # DESCUBRIMIENTO
+    # ========================================================================
+
+    def discover(self, client, city_ids: Iterable[int], base_url: str = SIBOM_BASE_URL,
+                 on_city: Optional[Callable[[str, Optional[Dict[str, Any]]], None]] = None
+                 ) -> Dict[str, Dict[str, Any]]:
+        """
+        Descubre ciudades descargando sus listados concurrentemente.
+
+        La cantidad de boletines se calcula con la primera y la última página:
+        (páginas - 1) * boletines por página + boletines en la última.
+
+        Args:
+            client: HTTPClient (pool compartido, modo asyncio)
+            city_ids: IDs a consultar
+            base_url: URL base del sitio
+            on_city: Callback (id, entrada o None) por cada ciudad consultada
+
+        Returns:
+            Entradas del registro de las ciudades encontradas
+        """
+        ids = [str(city_id) for city_id in city_ids]
+        urls = [f"{base_url}/cities/{city_id}" for city_id in ids]
+        found: Dict[str, Dict[str, Any]] = {}
+
+        for city_id, html in zip(ids, client.fetch_many(urls, max_retries=1)):
+            parsed = parse_city_listing(html) if isinstance(html, str) else None
+            if parsed:
+                found[city_id] = parsed
+            elif on_city:
+                on_city(city_id, None)
+
+        # Segunda tanda: última página de las ciudades paginadas
+        paged = [cid for cid, p in found.items() if p['total_pages'] > 1]
+        last_pages = client.fetch_many(
+            [f"{base_url}/cities/{cid}?page={found[cid]['total_pages']}" for cid in paged],
+            max_retries=1)
+        last_counts = {
+            cid: len(TITLE_PATTERN.findall(html)) if isinstance(html, str) else None
+            for cid, html in zip(paged, last_pages)
+        }
+
+        checked_at = datetime.now().isoformat()
+        entries = {}
+        for city_id, parsed in found.items():
+            count = parsed['page_count']
+            if parsed['total_pages'] > 1:
+                last = last_counts.get(city_id)
+                count = (parsed['total_pages'] - 1) * parsed['page_count'] + (
+                    last if last is not None else parsed['page_count'])
+            entries[city_id] = {
+                'name': parsed['name'],
+                'last_seen': parsed['last_seen'],
+                'bulletin_count': count,
+                'checked_at': checked_at,
+            }
+            if on_city:
+                on_city(city_id, entries[city_id])
+
+        if entries:
+            self.update(entries)
+        return entries
+
+    # ========================================================================
+    # PERSISTENCIA
+    # ========================================================================
+
+    def update(self, entries: Dict[str, Dict[str, Any]]):
+        """Fusiona entradas en el registro y en CITY_MAP.json (atómico)"""
+        with self._cache_lock:
+            registry = self._read_json(self.registry_path) or {}
+            registry.update(entries)
+            names = self._read_json(self.map_path) or {}
+            names.update({cid: e['name'] for cid, e in entries.items()})
+            names = dict(sorted(names.items(), key=lambda item: int(item[0])))
+
+            self._write_json(self.registry_path, registry)
+            self._write_json(self.map_path, names)
+            self._names_cache[self.map_path.resolve()] = names
+
+    @staticmethod
+    def _read_json(path: Path) -> Optional[Dict]:
+        try:
+            with path.open('r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_json(path: Path, data: Dict):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        with tmp_path.open('w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+concurrency.py
+
+Control adaptativo de la cantidad de boletines en paralelo (AIMD, como el
+control de congestión de TCP):
+
+- Aumento aditivo: tras una ventana de `limit` respuestas sanas de SIBOM
+  (sin errores y con latencia cerca de la mejor observada), limit += 1
+- Disminución multiplicativa: ante un timeout, 5xx o 429 (o latencia muy
+  por encima de la mejor), limit *= 0.5; a lo sumo una vez por ventana
+
+El cliente HTTP informa cada respuesta con `record()`; los workers toman un
+lugar con `slot()` antes de procesar cada boletín. Bajar el límite no
+interrumpe a nadie: los workers sobrantes esperan al terminar su boletín.
+
+Uso:
+    controller = AIMDController(initial=3, maximum=8)
+    with controller.slot():
+        process(bulletin)
+    controller.record(latency=0.4, status=200)
+
+@created 2026-10-17
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from run_metrics import RunMetrics
+
+
+class AIMDController:
+    """Límite de concurrencia AIMD con semáforo redimensionable"""
+
+    def __init__(self, initial: int = 1, minimum: int = 1, maximum: int = 8,
+                 decrease_factor: float = 0.5, latency_tolerance: float = 2.0,
+                 metrics: Optional[RunMetrics] = None):
+        """
+        Args:
+            initial: Límite inicial
+            minimum / maximum: Rango del límite
+            decrease_factor: Factor aplicado al límite ante congestión
+            latency_tolerance: Latencia media de la ventana admitida, en
+                múltiplos de la mejor ventana observada
+            metrics: Métricas de la corrida (gauges concurrency_limit*)
+        """
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.metrics = metrics
+
+        self._limit = min(self.maximum, max(self.minimum, initial))
+        self._in_use = 0
+        self._cond = threading.Condition()
+
+        # Ventana actual: respuestas desde el último cambio de límite
+        self._window_count = 0
+        self._window_latency = 0.0
+        self._baseline_latency: Optional[float] = None
+        # Respuestas desde la última disminución (None = nunca disminuyó)
+        self._since_decrease: Optional[int] = None
+
+        self.increases = 0
+        self.decreases = 0
+        self.peak_limit = self._limit
+        self.low_limit = self._limit
+        self._report()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    # ========================================================================
+    # LUGARES
+    # ========================================================================
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Bloquea hasta que haya lugar bajo el límite actual"""
+        with self._cond:
+            while self._in_use >= self._limit:
+                self._cond.wait()
+            self._in_use += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+
+    # ========================================================================
+    # SEÑALES
+    # ========================================================================
+
+    @staticmethod
+    def is_congestion(status: Optional[int]) -> bool:
+        """Timeout/conexión caída (None), 429 o 5xx"""
+        return status is None or status == 429 or status >= 500
+
+    def record(self, latency: float, status: Optional[int]):
+        """
+        Registra una respuesta de SIBOM.
+
+        Args:
+            latency: Segundos de la petición (sin la espera del rate limiter)
+            status: Código HTTP, o None si hubo timeout o error de conexión
+        """
+        with self._cond:
+            if self._since_decrease is not None:
+                self._since_decrease += 1
+            if self.is_congestion(status):
+                # Una sola disminución por ventana: los errores de peticiones
+                # que ya estaban en vuelo no vuelven a castigar el límite
+                if self._since_decrease is None or self._since_decrease > self._limit:
+                    self._decrease()
+                return
+
+            self._window_count += 1
+            self._window_latency += latency
+            if self._window_count < self._limit:
+                return
+
+            mean = self._window_latency / self._window_count
+            if self._baseline_latency is None or mean < self._baseline_latency:
+                self._baseline_latency = mean
+
+            if mean <= self._baseline_latency * self.latency_tolerance:
+                self._increase()
+            elif self._limit > self.minimum:
+                self._decrease()
+            else:
+                # Ya en el mínimo: el sitio está más lento, es la nueva referencia
+                self._baseline_latency = mean
+                self._reset_window()
+
+    def _increase(self):
+        if self._limit < self.maximum:
+            self._limit += 1
+            self.increases += 1
+            self.peak_limit = max(self.peak_limit, self._limit)
+            self._cond.notify_all()
+        self._reset_window()
+        self._report()
+
+    def _decrease(self):
+        new_limit = max(self.minimum, int(self._limit * self.decrease_factor))
+        self._since_decrease = 0
+        if new_limit < self._limit:
+            self._limit = new_limit
+            self.decreases += 1
+            self.low_limit = min(self.low_limit, self._limit)
+        self._reset_window()
+        self._report()
+
+    def _reset_window(self):
+        self._window_count = 0
+        self._window_latency = 0.0
+
+    def _report(self):
+        if self.metrics:
+            self.metrics.set_gauge('concurrency_limit', self._limit)
+            self.metrics.set_gauge('concurrency_limit_peak', self.peak_limit)
+            self.metrics.set_gauge('concurrency_limit_low', self.low_limit)
+            self.metrics.set_gauge('concurrency_increases', self.increases)
+            self.metrics.set_gauge('concurrency_decreases', self.decreases)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                'limit': self._limit,
+                'in_use': self._in_use,
+                'peak_limit': self.peak_limit,
+                'low_limit': self.low_limit,
+                'increases': self.increases,
+                'decreases': self.decreases,
+                'baseline_latency': self._baseline_latency,
+            }
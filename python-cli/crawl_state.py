@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+crawl_state.py
+
+Estado persistente del crawl incremental por ciudad.
+Guarda, para cada ciudad, la marca de agua (watermark): el ID del boletín
+más nuevo ya scrapeado. Los listados de SIBOM están ordenados del más nuevo
+al más viejo, así que la paginación puede cortarse en cuanto aparece
+territorio conocido.
+
+Formato de boletines/.watermarks.json:
+    {"22": {"bulletin_id": 14250, "number": "33º", "updated_at": "2026-10-17T..."}}
+
+@created 2026-10-17
+"""
+
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+BULLETIN_ID_PATTERN = re.compile(r'/bulletins/(\d+)')
+
+
+def bulletin_id_from_link(link: str) -> Optional[int]:
+    """Extrae el ID numérico de un enlace de boletín (/bulletins/14250 -> 14250)"""
+    match = BULLETIN_ID_PATTERN.search(link or '')
+    return int(match.group(1)) if match else None
+
+
+class CityWatermarks:
+    """
+    Watermarks por ciudad persistidas en JSON.
+
+    Thread-safe; cada `update()` persiste el archivo de forma atómica para
+    que una interrupción no deje el estado corrupto.
+    """
+
+    DEFAULT_FILE = Path("boletines/.watermarks.json")
+
+    def __init__(self, path: Path = DEFAULT_FILE):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._data: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            try:
+                with self.path.open('r', encoding='utf-8') as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError):
+                self._data = {}
+
+    def get(self, city_id: Any) -> Optional[int]:
+        """ID del boletín más nuevo ya scrapeado para la ciudad (o None)"""
+        with self._lock:
+            entry = self._data.get(str(city_id))
+        return entry.get('bulletin_id') if entry else None
+
+    def is_known(self, city_id: Any, bulletin: Dict[str, Any]) -> bool:
+        """True si el boletín está en o por debajo de la watermark de la ciudad"""
+        watermark = self.get(city_id)
+        bulletin_id = bulletin_id_from_link(bulletin.get('link', ''))
+        return watermark is not None and bulletin_id is not None and bulletin_id <= watermark
+
+    def update(self, city_id: Any, bulletin_id: int, number: str = ''):
+        """Avanza la watermark de la ciudad (nunca retrocede) y persiste"""
+        with self._lock:
+            current = self._data.get(str(city_id), {}).get('bulletin_id')
+            if current is not None and bulletin_id <= current:
+                return
+            self._data[str(city_id)] = {
+                'bulletin_id': bulletin_id,
+                'number': number,
+                'updated_at': datetime.now().isoformat(),
+            }
+            self._save()
+
+    def advance(self, city_id: Any, processed: Iterable[tuple]):
+        """
+        Avanza la watermark a partir de los resultados de una ciudad.
+
+        Solo cuentan boletines terminados sin error. Si alguno falló, la
+        watermark no puede superarlo: quedaría marcado como conocido y no
+        se reintentaría en la próxima corrida.
+
+        Args:
+            processed: Pares (bulletin, result) de process_bulletin
+        """
+        ok, failed = [], []
+        for bulletin, result in processed:
+            bulletin_id = bulletin_id_from_link(bulletin.get('link', ''))
+            if bulletin_id is None:
+                continue
+            if result.get('status') == 'error':
+                failed.append(bulletin_id)
+            else:
+                ok.append((bulletin_id, bulletin.get('number', '')))
+
+        if failed:
+            ok = [item for item in ok if item[0] < min(failed)]
+        if ok:
+            bulletin_id, number = max(ok)
+            self.update(city_id, bulletin_id, number)
+
+    def cities(self) -> List[str]:
+        """IDs de ciudades con watermark"""
+        with self._lock:
+            return list(self._data)
+
+    def merge_min(self, others: Iterable['CityWatermarks']):
+        """
+        Reemplaza las watermarks por la menor de `others` para cada ciudad.
+
+        Se usa al combinar shards: si un shard quedó atrás en una ciudad, la
+        watermark combinada no puede superarlo.
+        """
+        merged: Dict[str, Dict[str, Any]] = {}
+        for other in others:
+            with other._lock:
+                entries = dict(other._data)
+            for city_id, entry in entries.items():
+                current = merged.get(city_id)
+                if current is None or entry['bulletin_id'] < current['bulletin_id']:
+                    merged[city_id] = entry
+        with self._lock:
+            self._data.update(merged)
+            self._save()
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with tmp_path.open('w', encoding='utf-8') as f:
+            json.dump(self._data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
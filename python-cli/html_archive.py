@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+html_archive.py
+
+Archivo local del HTML crudo de todas las páginas descargadas de SIBOM,
+direccionado por contenido y comprimido. Permite volver a correr los
+niveles 2 y 3 (con extractores mejorados) sin descargar nada: ver
+`SIBOMScraper.replay` y `--replay`.
+
+- Cada cuerpo se guarda una sola vez, comprimido con gzip, bajo el SHA-256
+  de su contenido (dos URLs con el mismo HTML comparten blob)
+- Un índice SQLite (modo WAL) mapea URL -> hash, con la clase de URL y la
+  fecha de la última descarga
+
+Estructura en disco:
+    boletines/.html_archive/index.db
+    boletines/.html_archive/blobs/ab/abcdef....html.gz
+
+@created 2026-10-17
+"""
+
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+from http_cache import classify_url
+
+
+class ArchiveMissError(LookupError):
+    """La URL pedida no está en el archivo (en replay no hay red)"""
+
+
+class HTMLArchive:
+    """
+    Archivo URL -> hash -> blob comprimido, seguro entre hilos.
+
+    Los blobs se escriben atómicamente (archivo temporal + rename) y nunca
+    se modifican; el índice usa una conexión SQLite por hilo.
+    """
+
+    DEFAULT_DIR = Path("boletines/.html_archive")
+
+    def __init__(self, root: Path = DEFAULT_DIR, compresslevel: int = 6):
+        self.root = Path(root)
+        self.blobs_dir = self.root / 'blobs'
+        self.compresslevel = compresslevel
+        self._local = threading.local()
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._conn().execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                hash TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                size INTEGER,
+                stored_size INTEGER,
+                fetched_at REAL
+            )
+        """)
+        self._conn().execute("CREATE INDEX IF NOT EXISTS pages_kind ON pages (kind)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.root / 'index.db', timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.blobs_dir / digest[:2] / f"{digest}.html.gz"
+
+    # ========================================================================
+    # ESCRITURA
+    # ========================================================================
+
+    def put(self, url: str, body: str) -> str:
+        """
+        Archiva el cuerpo de una URL.
+
+        Returns:
+            Hash SHA-256 del contenido
+        """
+        data = body.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            with tmp_path.open('wb') as f:
+                # mtime=0: el mismo contenido produce el mismo blob
+                f.write(gzip.compress(data, compresslevel=self.compresslevel, mtime=0))
+            os.replace(tmp_path, path)
+
+        self._conn().execute("""
+            INSERT INTO pages (url, hash, kind, size, stored_size, fetched_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                hash = excluded.hash, size = excluded.size,
+                stored_size = excluded.stored_size, fetched_at = excluded.fetched_at
+        """, (url, digest, classify_url(url), len(data), path.stat().st_size, time.time()))
+        return digest
+
+    # ========================================================================
+    # LECTURA
+    # ========================================================================
+
+    def get(self, url: str) -> Optional[str]:
+        """HTML archivado de una URL (None si no está)"""
+        row = self._conn().execute(
+            "SELECT hash FROM pages WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        try:
+            with self._blob_path(row[0]).open('rb') as f:
+                return gzip.decompress(f.read()).decode('utf-8')
+        except OSError:
+            return None
+
+    def __contains__(self, url: str) -> bool:
+        return self._conn().execute(
+            "SELECT 1 FROM pages WHERE url = ?", (url,)).fetchone() is not None
+
+    def urls(self, kind: Optional[str] = None) -> List[str]:
+        """URLs archivadas (de una clase: listing, bulletin, norm, other), en orden de alta"""
+        if kind is None:
+            rows = self._conn().execute("SELECT url FROM pages ORDER BY rowid")
+        else:
+            rows = self._conn().execute(
+                "SELECT url FROM pages WHERE kind = ? ORDER BY rowid", (kind,))
+        return [url for (url,) in rows]
+
+    def summary(self) -> Dict[str, int]:
+        """Páginas, blobs únicos y bytes (sin comprimir / en disco)"""
+        pages, raw_bytes = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages").fetchone()
+        blobs, stored_bytes = self._conn().execute("""
+            SELECT COUNT(*), COALESCE(SUM(stored_size), 0)
+            FROM (SELECT MAX(stored_size) AS stored_size FROM pages GROUP BY hash)
+        """).fetchone()
+        return {
+            'pages': pages,
+            'blobs': blobs,
+            'raw_bytes': raw_bytes,
+            'stored_bytes': stored_bytes,
+        }
+
+
+class ReplayClient:
+    """
+    Reemplazo de HTTPClient para el modo replay: sirve todo desde el
+    archivo y nunca abre una conexión.
+    """
+
+    def __init__(self, archive: HTMLArchive):
+        self.archive = archive
+        self.cache = None
+
+    def fetch_text(self, url: str, max_retries: int = 3) -> str:
+        """
+        Raises:
+            ArchiveMissError: Si la URL no se descargó nunca
+        """
+        body = self.archive.get(url)
+        if body is None:
+            raise ArchiveMissError(f"{url} no está en el archivo HTML")
+        return body
+
+    def fetch_many(self, urls: Sequence[str],
+                   max_retries: int = 3) -> List[Union[str, Exception]]:
+        results: List[Union[str, Exception]] = []
+        for url in urls:
+            try:
+                results.append(self.fetch_text(url))
+            except ArchiveMissError as e:
+                results.append(e)
+        return results
+
+    def close(self):
+        pass
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+http_cache.py
+
+Caché HTTP persistente en disco para páginas de SIBOM, indexada por URL.
+Guarda ETag/Last-Modified, envía peticiones condicionales y sirve las
+respuestas 304 desde el caché. Cada clase de URL tiene su propio TTL:
+los listados de ciudad expiran rápido, las normas son prácticamente inmutables.
+
+Las páginas inmutables (TTL None) también quedan en el archivo de HTML
+(html_archive.py) cuando está activo: esas entradas se guardan con
+`archived` y sin cuerpo, que el cliente HTTP lee del archivo comprimido.
+
+Estructura en disco:
+    boletines/.http_cache/ab/abcdef....json   # {url, etag, last_modified, stored_at, archived, body}
+
+@created 2026-10-17
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# ============================================================================
+# CONFIGURACIÓN
+# ============================================================================
+
+# Clasificación de URLs de SIBOM (el orden importa: la más específica primero)
+URL_CLASSES = [
+    ('norm', re.compile(r'/bulletins/\d+/contents/\d+')),
+    ('bulletin', re.compile(r'/bulletins/\d+')),
+    ('listing', re.compile(r'/cities/\d+')),
+]
+
+# TTL en segundos por clase de URL (None = no expira nunca)
+DEFAULT_TTLS: Dict[str, Optional[float]] = {
+    'listing': 15 * 60,       # Los listados cambian cuando se publica un boletín
+    'bulletin': 24 * 3600,    # Un boletín publicado rara vez cambia
+    'norm': None,             # Una norma publicada es inmutable
+    'other': 3600,
+}
+
+
+def classify_url(url: str) -> str:
+    """Retorna la clase de URL: norm, bulletin, listing u other"""
+    for name, pattern in URL_CLASSES:
+        if pattern.search(url):
+            return name
+    return 'other'
+
+
+class HTTPCache:
+    """
+    Caché de respuestas HTTP en disco con revalidación condicional.
+
+    Thread-safe: cada entrada se escribe atómicamente (archivo temporal +
+    rename) y los contadores se actualizan bajo lock.
+    """
+
+    DEFAULT_DIR = Path("boletines/.http_cache")
+
+    def __init__(self, cache_dir: Path = DEFAULT_DIR,
+                 ttls: Optional[Dict[str, Optional[float]]] = None):
+        self.cache_dir = Path(cache_dir)
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self._lock = threading.Lock()
+        self.stats = {
+            'hits': 0,          # Servidas sin red (entrada fresca)
+            'revalidated': 0,   # 304 Not Modified servidas desde caché
+            'misses': 0,        # Descarga completa
+        }
+
+    def _path_for(self, url: str) -> Path:
+        digest = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / digest[:2] / f"{digest}.json"
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    # ========================================================================
+    # LECTURA
+    # ========================================================================
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """Retorna la entrada cacheada de una URL (o None)"""
+        path = self._path_for(url)
+        try:
+            with path.open('r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get('url') == url else None
+
+    def is_immutable(self, url: str) -> bool:
+        """True si la clase de la URL no expira nunca (ej. normas)"""
+        return self.ttls.get(classify_url(url), self.ttls['other']) is None
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """True si la entrada todavía está dentro del TTL de su clase"""
+        ttl = self.ttls.get(classify_url(entry['url']), self.ttls['other'])
+        if ttl is None:
+            return True
+        return time.time() - entry.get('stored_at', 0) < ttl
+
+    def conditional_headers(self, entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Headers If-None-Match / If-Modified-Since para revalidar una entrada"""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def serve_fresh(self, entry: Dict[str, Any]) -> str:
+        """Sirve una entrada fresca sin tocar la red"""
+        self._count('hits')
+        return entry['body']
+
+    # ========================================================================
+    # ESCRITURA
+    # ========================================================================
+
+    def _write(self, entry: Dict[str, Any]):
+        if entry.get('archived'):
+            # El cuerpo vive en el archivo de HTML: solo se guardan los validadores
+            entry = {**entry, 'body': None}
+        path = self._path_for(entry['url'])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with tmp_path.open('w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def store(self, url: str, body: str, headers: Dict[str, str], archived: bool = False):
+        """
+        Guarda una respuesta completa (200) y la cuenta como miss.
+
+        Args:
+            archived: El cuerpo ya está en el archivo de HTML (no se duplica)
+        """
+        self._count('misses')
+        self._write({
+            'url': url,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'stored_at': time.time(),
+            'archived': archived,
+            'body': body,
+        })
+
+    def mark_archived(self, entry: Dict[str, Any]):
+        """Quita el cuerpo de una entrada cuyo HTML ya está en el archivo"""
+        self._write({**entry, 'archived': True})
+
+    def revalidate(self, entry: Dict[str, Any], headers: Dict[str, str]) -> str:
+        """Registra un 304: renueva el TTL de la entrada y retorna su cuerpo"""
+        self._count('revalidated')
+        entry = {
+            **entry,
+            'etag': headers.get('ETag') or entry.get('etag'),
+            'last_modified': headers.get('Last-Modified') or entry.get('last_modified'),
+            'stored_at': time.time(),
+        }
+        self._write(entry)
+        return entry['body']
+
+    def summary(self) -> Dict[str, Any]:
+        """Contadores y tasa de aciertos (hits + 304 sobre el total)"""
+        with self._lock:
+            stats = dict(self.stats)
+        total = sum(stats.values())
+        served = stats['hits'] + stats['revalidated']
+        stats['hit_rate'] = served / total if total else 0.0
+        return stats
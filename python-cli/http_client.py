@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+http_client.py
+
+Motor de descarga HTTP para SIBOM con pool de conexiones compartido.
+Reutiliza conexiones keep-alive (una sola negociación TLS por conexión) y
+ofrece un modo asyncio para mantener muchas descargas en vuelo bajo un
+único límite de concurrencia.
+
+Uso:
+    client = HTTPClient(headers)
+    html = client.fetch_text("https://sibom.slyt.gba.gob.ar/cities/22")
+    pages = client.fetch_many([url1, url2, url3])  # mismo orden que urls
+
+@created 2026-10-17
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from concurrency import AIMDController
+from html_archive import HTMLArchive
+from http_cache import HTTPCache
+from rate_limiter import RateLimiter, parse_retry_after
+from run_metrics import RunMetrics
+
+
+class HTTPClient:
+    """
+    Cliente HTTP con pool de conexiones compartido entre hilos.
+
+    Todas las descargas (sincrónicas o asyncio) pasan por la misma
+    `requests.Session`, por lo que las conexiones a sibom.slyt.gba.gob.ar
+    se reutilizan entre páginas de listado, boletines y normas.
+    """
+
+    DEFAULT_TIMEOUT = 30
+    DEFAULT_MAX_CONNECTIONS = 8
+    # Respuestas que indican que el servidor pide bajar el ritmo
+    THROTTLE_STATUSES = (429, 503)
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 cache: Optional[HTTPCache] = None,
+                 archive: Optional[HTMLArchive] = None,
+                 metrics: Optional[RunMetrics] = None,
+                 concurrency: Optional[AIMDController] = None):
+        """
+        Args:
+            headers: Headers por defecto para todas las peticiones
+            max_connections: Tamaño del pool por host y límite de descargas en vuelo
+            timeout: Timeout por petición en segundos
+            rate_limiter: Limitador por host consultado antes de cada petición
+            cache: Caché HTTP en disco usado por fetch_text (None = sin caché)
+            archive: Archivo de HTML crudo donde fetch_text guarda cada página
+            metrics: Métricas de la corrida (espera, latencia y bytes por petición)
+            concurrency: Controlador AIMD al que se informa latencia y status de cada respuesta
+        """
+        self.timeout = timeout
+        self.max_connections = max(1, max_connections)
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.archive = archive
+        self.metrics = metrics
+        self.concurrency = concurrency
+
+        self.session = requests.Session()
+        if headers:
+            self.session.headers.update(headers)
+
+        # pool_block=True: si todas las conexiones están ocupadas se espera
+        # una libre en vez de abrir (y descartar) conexiones extra
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=self.max_connections,
+            pool_block=True
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # Executor compartido por el modo asyncio: su tamaño es el límite
+        # global de peticiones en vuelo, sin importar cuántos lotes se lancen
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_connections,
+            thread_name_prefix='http-fetch'
+        )
+
+    # ========================================================================
+    # MODO SINCRÓNICO
+    # ========================================================================
+
+    def get(self, url: str, timeout: Optional[float] = None,
+            headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """
+        Realiza un GET sobre el pool compartido (sin reintentos).
+
+        Si hay rate limiter, espera presupuesto del host antes de la petición
+        y lo frena ante 429/503 respetando Retry-After.
+        """
+        if self.rate_limiter:
+            waited = self.rate_limiter.acquire(url)
+            if self.metrics:
+                self.metrics.observe('rate_limit_wait', waited)
+
+        started = time.perf_counter()
+        try:
+            response = self.session.get(url, timeout=timeout or self.timeout,
+                                        headers=headers)
+        except requests.RequestException:
+            # Timeout o conexión caída: señal de congestión
+            if self.concurrency:
+                self.concurrency.record(time.perf_counter() - started, None)
+            raise
+        elapsed = time.perf_counter() - started
+        if self.concurrency:
+            self.concurrency.record(elapsed, response.status_code)
+        if self.metrics:
+            self.metrics.observe('fetch', elapsed)
+            self.metrics.count('http_requests')
+            self.metrics.count('bytes_fetched', len(response.content))
+            if response.status_code >= 400:
+                self.metrics.count('http_errors')
+
+        if self.rate_limiter:
+            if response.status_code in self.THROTTLE_STATUSES:
+                self.rate_limiter.penalize(
+                    url, parse_retry_after(response.headers.get('Retry-After')))
+            else:
+                self.rate_limiter.record_success(url)
+        return response
+
+    def fetch_text(self, url: str, max_retries: int = 3) -> str:
+        """
+        Obtiene el HTML de una URL con reintentos y backoff exponencial.
+
+        Con caché: las entradas frescas se sirven sin red; las vencidas se
+        revalidan con una petición condicional (304 → cuerpo cacheado).
+        Con archivo: cada página descargada queda archivada para replay; de
+        las páginas inmutables (normas) el caché guarda solo los validadores.
+
+        Raises:
+            requests.RequestException: Si fallan todos los intentos
+        """
+        entry = self._cached_entry(url)
+        if entry and self.cache.is_fresh(entry):
+            return self._archive_cached(entry, self.cache.serve_fresh(entry))
+        conditional = self.cache.conditional_headers(entry) if self.cache else None
+
+        for attempt in range(max_retries):
+            try:
+                response = self.get(url, headers=conditional)
+                if response.status_code == 304:
+                    if entry is None:
+                        # Sin petición condicional no hay cuerpo que servir:
+                        # nunca guardar el 304 vacío como si fuera un 200
+                        raise requests.HTTPError(
+                            f"304 Not Modified sin entrada en caché: {url}", response=response)
+                    return self._archive_cached(
+                        entry, self.cache.revalidate(entry, response.headers))
+                response.raise_for_status()
+                archived = bool(self.archive and response.text)
+                if archived:
+                    self.archive.put(url, response.text)
+                if self.cache:
+                    self.cache.store(url, response.text, response.headers,
+                                     archived=archived and self.cache.is_immutable(url))
+                return response.text
+            except requests.RequestException as e:
+                if attempt == max_retries - 1:
+                    raise
+                # Ante 429/503 el rate limiter ya impone la espera (Retry-After)
+                status = getattr(e.response, 'status_code', None)
+                if not (self.rate_limiter and status in self.THROTTLE_STATUSES):
+                    time.sleep(2 ** attempt)
+
+    def _cached_entry(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Entrada del caché con su cuerpo; el de las entradas `archived` se lee
+        del archivo. Sin archivo (o sin el blob) cuenta como miss.
+        """
+        entry = self.cache.lookup(url) if self.cache else None
+        if entry and entry.get('archived'):
+            body = self.archive.get(url) if self.archive else None
+            if body is None:
+                return None
+            entry['body'] = body
+        return entry
+
+    def _archive_cached(self, entry: Dict[str, Any], body: str) -> str:
+        """
+        Cuerpo servido desde el caché: solo se archiva si el archivo todavía
+        no tiene la URL (caché anterior al archivo), sin re-hashear en cada hit.
+        Una página inmutable archivada deja de guardar su cuerpo en el caché.
+        """
+        if not self.archive or not body or entry.get('archived'):
+            return body
+        url = entry['url']
+        if url not in self.archive:
+            self.archive.put(url, body)
+        if self.cache.is_immutable(url):
+            self.cache.mark_archived(entry)
+        return body
+
+    # ========================================================================
+    # MODO ASYNCIO
+    # ========================================================================
+
+    async def fetch_text_async(self, url: str, max_retries: int = 3) -> str:
+        """Versión awaitable de fetch_text (se ejecuta sobre el pool compartido)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self.fetch_text, url, max_retries)
+
+    async def fetch_many_async(self, urls: Sequence[str],
+                               max_retries: int = 3) -> List[Union[str, Exception]]:
+        """
+        Descarga varias URLs concurrentemente.
+
+        Returns:
+            Lista alineada con `urls`: HTML o la excepción de esa URL
+        """
+        tasks = [self.fetch_text_async(url, max_retries) for url in urls]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    def fetch_many(self, urls: Sequence[str],
+                   max_retries: int = 3) -> List[Union[str, Exception]]:
+        """
+        Punto de entrada sincrónico al modo asyncio.
+
+        Returns:
+            Lista alineada con `urls`: HTML o la excepción de esa URL
+        """
+        if not urls:
+            return []
+        return asyncio.run(self.fetch_many_async(urls, max_retries))
+
+    def close(self):
+        """Libera el executor y las conexiones del pool"""
+        self._executor.shutdown(wait=False)
+        self.session.close()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+index_spool.py
+
+Sinks JSONL en disco para los índices globales (montos y normativas).
+Durante la corrida cada registro se agrega al archivo apenas se extrae, así
+que la memoria no crece con la cantidad de boletines y una caída no pierde
+lo ya extraído. Al final, los índices consolidados se generan leyendo estos
+archivos en una sola pasada (ver `MontoExtractor.save_index_from_jsonl` y
+`normativas_extractor.save_indexes_from_jsonl`).
+
+Estructura en disco:
+    boletines/.index_spool/<run_id>/montos.jsonl
+    boletines/.index_spool/<run_id>/normativas.jsonl
+
+@created 2026-10-17
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+
+def iter_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+    """Itera los registros de un archivo JSONL (ignora una última línea truncada)"""
+    if not Path(path).exists():
+        return
+    with Path(path).open('r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+class JsonlSink:
+    """
+    Archivo JSONL append-only thread-safe.
+
+    Cada registro se escribe en una línea completa bajo lock y se vacía al
+    sistema operativo inmediatamente.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.count = 0
+        self._lock = threading.Lock()
+        self._file = None
+
+    def append(self, record: Dict[str, Any]):
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = self.path.open('a', encoding='utf-8')
+            self._file.write(line + '\n')
+            self._file.flush()
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                os.fsync(self._file.fileno())
+                self._file.close()
+                self._file = None
+
+
+class IndexSpool:
+    """Par de sinks (montos y normativas) de una corrida del scraper"""
+
+    DEFAULT_ROOT = Path("boletines/.index_spool")
+
+    def __init__(self, run_dir: Optional[Path] = None):
+        if run_dir is None:
+            run_id = f"{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+            run_dir = self.DEFAULT_ROOT / run_id
+        self.run_dir = Path(run_dir)
+        self.montos = JsonlSink(self.run_dir / 'montos.jsonl')
+        self.normativas = JsonlSink(self.run_dir / 'normativas.jsonl')
+
+    def close(self):
+        self.montos.close()
+        self.normativas.close()
+
+    def remove(self):
+        """Elimina los archivos de la corrida (una vez consolidados)"""
+        self.close()
+        shutil.rmtree(self.run_dir, ignore_errors=True)
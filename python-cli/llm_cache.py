@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+llm_cache.py
+
+Caché persistente de respuestas del LLM (SQLite, modo WAL). Una misma
+consulta (modelo + prompt normalizado + response_format) no se paga dos
+veces: ni al re-correr un boletín ni al reintentar tras un corte.
+
+- Clave: SHA-256 del modelo, el prompt normalizado (NFC, saltos de línea
+  unificados, espacios repetidos colapsados) y el response_format
+- TTL: las entradas más viejas que `ttl` cuentan como miss y se borran
+- Tamaño: si el total supera `max_bytes` se descartan las menos usadas
+  recientemente (LRU por last_used_at)
+
+Estructura en disco:
+    boletines/.llm_cache.db
+
+@created 2026-10-17
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Espacios y tabs repetidos dentro de una línea
+SPACES_PATTERN = re.compile(r'[ \t]+')
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Prompt canónico: las diferencias solo de espacios dan la misma clave"""
+    text = unicodedata.normalize('NFC', prompt).replace('\r\n', '\n').replace('\r', '\n')
+    return '\n'.join(SPACES_PATTERN.sub(' ', line).strip() for line in text.split('\n')).strip()
+
+
+def cache_key(model: str, prompt: str, response_format: Optional[Dict[str, Any]] = None) -> str:
+    payload = json.dumps([model, normalize_prompt(prompt), response_format],
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    """
+    Caché de completions del LLM, seguro entre hilos (una conexión SQLite
+    por hilo, contadores bajo lock).
+    """
+
+    DEFAULT_PATH = Path("boletines/.llm_cache.db")
+    DEFAULT_TTL = 90 * 24 * 3600
+    DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+    def __init__(self, path: Path = DEFAULT_PATH, ttl: Optional[float] = DEFAULT_TTL,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            path: Archivo SQLite del caché
+            ttl: Vida de una entrada en segundos (None = no expira)
+            max_bytes: Tamaño máximo de las respuestas guardadas
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'expired': 0,      # Misses por TTL vencido
+            'stores': 0,
+            'evictions': 0,    # Descartadas por tamaño
+        }
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn().execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response_format TEXT,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL
+            )
+        """)
+        self._conn().execute(
+            "CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used_at)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    # ========================================================================
+    # LECTURA / ESCRITURA
+    # ========================================================================
+
+    def get(self, model: str, prompt: str,
+            response_format: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Respuesta guardada para la consulta, o None (miss o vencida)"""
+        key = cache_key(model, prompt, response_format)
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self._count('misses')
+            return None
+
+        response, created_at = row
+        now = time.time()
+        if self.ttl is not None and now - created_at > self.ttl:
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._count('expired')
+            self._count('misses')
+            return None
+
+        conn.execute("UPDATE responses SET last_used_at = ? WHERE key = ?", (now, key))
+        self._count('hits')
+        return response
+
+    def put(self, model: str, prompt: str, response: str,
+            response_format: Optional[Dict[str, Any]] = None):
+        """Guarda la respuesta y descarta las menos usadas si se supera max_bytes"""
+        key = cache_key(model, prompt, response_format)
+        now = time.time()
+        size = len(response.encode('utf-8'))
+        self._conn().execute("""
+            INSERT OR REPLACE INTO responses
+                (key, model, response_format, response, size, created_at, last_used_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (key, model, json.dumps(response_format) if response_format else None,
+              response, size, now, now))
+        self._count('stores')
+        self._evict()
+
+    def _evict(self):
+        conn = self._conn()
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_used_at").fetchall()
+        doomed = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        with self._lock:
+            self.stats['evictions'] += len(doomed)
+
+    # ========================================================================
+    # ESTADÍSTICAS
+    # ========================================================================
+
+    def summary(self) -> Dict[str, Any]:
+        """Contadores de la corrida, tasa de aciertos y tamaño del caché"""
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        entries, size = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        stats['entries'] = entries
+        stats['bytes'] = size
+        return stats
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+llm_client.py
+
+Capa de llamadas al LLM compartida por todos los workers del scraper:
+
+- Concurrencia acotada: a lo sumo `max_concurrency` llamadas en vuelo
+  (el resto espera su turno en vez de gastar presupuesto del proveedor)
+- Rate limiting: token bucket del host del LLM (ver rate_limiter.py)
+- Reintentos con backoff exponencial (con jitter) ante 429, 5xx, timeouts
+  y conexiones caídas; los 4xx restantes fallan enseguida
+- Timeout por llamada
+- Coalescing: si el mismo prompt ya está en vuelo, se espera esa respuesta
+  en vez de pagar otra llamada
+- Caché persistente opcional (ver llm_cache.py)
+- Métricas: latencia (etapa llm_call), llamadas, reintentos, errores,
+  prompts coalescidos y tokens de prompt/completion
+
+Uso:
+    llm = LLMClient(OpenAI(api_key=..., max_retries=0), model, rate_limiter=limiter)
+    content = llm.complete(prompt, response_format={"type": "json_object"})
+
+@created 2026-10-17
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+from openai import APIConnectionError
+
+from llm_cache import LLMCache, cache_key
+from rate_limiter import RateLimiter, parse_retry_after
+from run_metrics import RunMetrics
+
+
+def error_status(error: Exception) -> Optional[int]:
+    """Código HTTP de un error del SDK (None si no hubo respuesta)"""
+    return getattr(error, 'status_code', None)
+
+
+class LLMClient:
+    """Cliente del LLM seguro entre hilos, con reintentos y coalescing"""
+
+    DEFAULT_MAX_CONCURRENCY = 4
+    DEFAULT_TIMEOUT = 120
+    DEFAULT_MAX_RETRIES = 3
+    # Respuestas que indican que el proveedor pide bajar el ritmo
+    THROTTLE_STATUSES = (429, 503)
+
+    def __init__(self, client: Any, model: str,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 host: str = "openrouter.ai",
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 backoff_base: float = 1.0, backoff_max: float = 30.0,
+                 cache: Optional[LLMCache] = None,
+                 metrics: Optional[RunMetrics] = None):
+        """
+        Args:
+            client: Cliente OpenAI (con max_retries=0: los reintentos son de esta capa)
+            model: Modelo de OpenRouter
+            rate_limiter: Limitador con el presupuesto de `host`
+            max_concurrency: Llamadas en vuelo como máximo
+            timeout: Segundos por llamada
+            max_retries: Reintentos ante errores transitorios
+            backoff_base / backoff_max: Espera del reintento n: base * 2^n, tope max
+            cache: Caché persistente de respuestas
+            metrics: Métricas de la corrida
+        """
+        self.client = client
+        self.model = model
+        self.rate_limiter = rate_limiter
+        self.host = host
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.cache = cache
+        self.metrics = metrics
+
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._active = 0
+        self._peak_active = 0
+
+    def _count(self, name: str, value: float = 1):
+        if self.metrics:
+            self.metrics.count(name, value)
+
+    # ========================================================================
+    # LLAMADAS
+    # ========================================================================
+
+    def complete(self, prompt: str, response_format: Optional[Dict[str, Any]] = None,
+                 cacheable: Optional[Callable[[str], bool]] = None) -> str:
+        """
+        Contenido de la respuesta del LLM para `prompt`.
+
+        Args:
+            response_format: Ej. {"type": "json_object"}
+            cacheable: Decide si una respuesta se guarda en el caché
+                (ej. solo JSON parseable); None = todas
+
+        Raises:
+            Exception: El error del SDK si se agotaron los reintentos
+        """
+        if self.cache:
+            cached = self.cache.get(self.model, prompt, response_format)
+            if cached is not None:
+                self._count('llm_cache_hits')
+                return cached
+
+        key = cache_key(self.model, prompt, response_format)
+        with self._inflight_lock:
+            pending = self._inflight.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._inflight[key] = Future()
+        if not owner:
+            # Mismo prompt ya en vuelo en otro worker: compartir la respuesta
+            self._count('llm_coalesced')
+            return pending.result()
+
+        try:
+            content = self._call_with_retries(prompt, response_format)
+            if self.cache and content and (cacheable is None or cacheable(content)):
+                self.cache.put(self.model, prompt, content, response_format)
+            pending.set_result(content)
+            return content
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+
+    def _call_with_retries(self, prompt: str, response_format: Optional[Dict[str, Any]]) -> str:
+        params = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "timeout": self.timeout,
+        }
+        if response_format:
+            params["response_format"] = response_format
+
+        attempt = 0
+        while True:
+            try:
+                return self._call(params)
+            except Exception as e:
+                if attempt == self.max_retries or not self.is_retryable(e):
+                    self._count('llm_errors')
+                    raise
+                self._count('llm_retries')
+                # Ante 429/503 el rate limiter ya impone la espera (Retry-After)
+                if not (self.rate_limiter and error_status(e) in self.THROTTLE_STATUSES):
+                    time.sleep(self.backoff_delay(attempt))
+                attempt += 1
+
+    def _call(self, params: Dict[str, Any]) -> str:
+        with self._slots:
+            self._track_active(+1)
+            try:
+                if self.rate_limiter:
+                    waited = self.rate_limiter.acquire(self.host)
+                    if self.metrics:
+                        self.metrics.observe('llm_rate_limit_wait', waited)
+
+                self._count('llm_calls')
+                started = time.perf_counter()
+                try:
+                    response = self.client.chat.completions.create(**params)
+                except Exception as e:
+                    self._throttle(e)
+                    raise
+                finally:
+                    if self.metrics:
+                        self.metrics.observe('llm_call', time.perf_counter() - started)
+            finally:
+                self._track_active(-1)
+
+        if self.rate_limiter:
+            self.rate_limiter.record_success(self.host)
+        usage = getattr(response, 'usage', None)
+        if usage is not None:
+            self._count('llm_prompt_tokens', getattr(usage, 'prompt_tokens', 0) or 0)
+            self._count('llm_completion_tokens', getattr(usage, 'completion_tokens', 0) or 0)
+        return response.choices[0].message.content
+
+    def _throttle(self, error: Exception):
+        # Frenar el presupuesto del LLM si el proveedor pide bajar el ritmo
+        if self.rate_limiter and error_status(error) in self.THROTTLE_STATUSES:
+            headers = getattr(getattr(error, 'response', None), 'headers', {}) or {}
+            self.rate_limiter.penalize(self.host, parse_retry_after(headers.get('retry-after')))
+
+    def _track_active(self, delta: int):
+        with self._inflight_lock:
+            self._active += delta
+            if self._active > self._peak_active:
+                self._peak_active = self._active
+                if self.metrics:
+                    self.metrics.set_gauge('llm_concurrency_peak', self._peak_active)
+
+    # ========================================================================
+    # REINTENTOS
+    # ========================================================================
+
+    @staticmethod
+    def is_retryable(error: Exception) -> bool:
+        """429, 5xx, timeout o conexión caída"""
+        status = error_status(error)
+        if status is None:
+            return isinstance(error, (APIConnectionError, TimeoutError, ConnectionError))
+        return status == 429 or status >= 500
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Espera antes del reintento `attempt` (0 = primero), con jitter"""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        return delay * random.uniform(0.5, 1.0)
@@ -11,9 +11,10 @@ Genera registros estructurados con citas textuales para cómputos comparativos.
 
 import re
 import json
-from typing import List, Dict, Any, Optional
+from bisect import bisect_right
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from pathlib import Path
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 
 
 @dataclass
@@ -35,11 +36,44 @@ class MontoRecord:
         return asdict(self)
 
 
+@dataclass
+class MarkerIndex:
+    """
+    Offsets ordenados de los encabezados de norma y las marcas de artículo
+    de un texto, para atribuir cada monto por búsqueda binaria.
+    """
+    norma_offsets: List[int] = field(default_factory=list)
+    normas: List[Tuple[str, str]] = field(default_factory=list)  # (tipo, número)
+    articulo_offsets: List[int] = field(default_factory=list)
+    articulos: List[str] = field(default_factory=list)
+
+    def norma_at(self, pos: int) -> Tuple[int, str, str]:
+        """
+        Norma más cercana que empieza antes de `pos`.
+
+        Returns:
+            (offset, tipo, número); offset -1 si no hay ninguna
+        """
+        i = bisect_right(self.norma_offsets, pos) - 1
+        if i < 0:
+            return -1, "Norma", "S/N"
+        return (self.norma_offsets[i],) + self.normas[i]
+
+    def articulo_at(self, pos: int, since: int = -1) -> str:
+        """Artículo más cercano antes de `pos`, si empieza después de `since` (la norma)"""
+        i = bisect_right(self.articulo_offsets, pos) - 1
+        if i < 0 or self.articulo_offsets[i] < since:
+            return "S/N"
+        return self.articulos[i]
+
+
 class MontoExtractor:
     """Extractor de montos monetarios de boletines"""
 
     # Patrones de moneda y número en formato argentino
     # Formatos: "$ 155.162,86", "$155.162,86", "PESOS ... ($ ...)"
+    # Definición de referencia: _iter_amounts da los mismos montos en una
+    # sola pasada (el prefijo lazy re-escanea el texto antes de cada "$")
     AMOUNT_PATTERN = re.compile(
         r'(?:PESOS\s+(?:CIENTO\s+)?[^$]+?)?'  # Prefijo "PESOS ..." opcional
         r'\$\s*'  # Símbolo de peso
@@ -48,22 +82,38 @@ class MontoExtractor:
         re.IGNORECASE
     )
 
-    # Patrones para identificar tipo de norma
-    NORMA_PATTERNS = {
-        'Ordenanza': re.compile(r'ORDENANZA\s+N[º°]\s*(\d+[^\s]*)', re.IGNORECASE),
-        'Decreto': re.compile(r'DECRETO\s+N[º°]\s*(\d+[^\s]*)', re.IGNORECASE),
-        'Resolución': re.compile(r'RESOLUCIÓN\s+N[º°]\s*(\d+[^\s]*)', re.IGNORECASE),
-        'Resolucion': re.compile(r'RESOLUCION\s+N[º°]\s*(\d+[^\s]*)', re.IGNORECASE),
-        'Disposición': re.compile(r'DISPOSICIÓN\s+N[º°]\s*(\d+[^\s]*)', re.IGNORECASE),
-        'Disposicion': re.compile(r'DISPOSICION\s+N[º°]\s*(\d+[^\s]*)', re.IGNORECASE),
-        'Edicto': re.compile(r'EDITO\s+N[º°]\s*(\d+[^\s]*)', re.IGNORECASE),
+    # Monto a partir de un "$" (sufijo de AMOUNT_PATTERN)
+    AMOUNT_AT_DOLLAR = re.compile(
+        r'\$\s*'
+        r'(\d{1,3}(?:\.\d{3})*(?:,\d+)?|\d+)(?:\s*,\s*\d+)?'
+        r'(?:\s*con\s+(\d+)\s+centavos)?',
+        re.IGNORECASE
+    )
+    # Prefijo "PESOS ..." de AMOUNT_PATTERN: PESOS, un espacio y al menos un
+    # carácter más antes del "$" (sin otro "$" en el medio)
+    PESOS_PREFIX = re.compile(r'PESOS\s[^$]', re.IGNORECASE)
+
+    # Palabra del encabezado de una norma (ej. "ORDENANZA Nº 1234") -> tipo
+    NORMA_TIPOS = {
+        'ORDENANZA': 'Ordenanza',
+        'DECRETO': 'Decreto',
+        'RESOLUCIÓN': 'Resolución',
+        'RESOLUCION': 'Resolucion',
+        'DISPOSICIÓN': 'Disposición',
+        'DISPOSICION': 'Disposicion',
+        'EDITO': 'Edicto',
     }
 
-    # Patrón para artículos
-    ARTICULO_PATTERN = re.compile(
-        r'ART[ÍI]CULO\s+N?[º°]?\s*(\d+[A-Za-z]?)',
+    # Encabezados de norma y marcas de artículo en una sola regex (índice de marcas)
+    MARKER_PATTERN = re.compile(
+        r'(?P<tipo>' + '|'.join(NORMA_TIPOS) + r')'
+        r'\s+N[º°]\s*(?P<numero>\d+[^\s]*)'
+        r'|ART[ÍI]CULO\s+N?[º°]?\s*(?P<articulo>\d+[A-Za-z]?)',
         re.IGNORECASE
     )
+    # Toda marca empieza con una de estas palabras (en minúsculas), salvo
+    # "culo", que está 4 caracteres después del inicio de "artículo"
+    MARKER_WORDS = tuple((word.lower(), 0) for word in NORMA_TIPOS) + (('culo', 4),)
 
     # Palabras clave que indican contexto relevante
     CONTEXT_KEYWORDS = [
@@ -74,6 +124,10 @@ class MontoExtractor:
         ' subsidio', 'subvención', 'subvencion', 'beca', 'beneficio'
     ]
 
+    # Frase alrededor de cada palabra clave
+    KEYWORD_PHRASES = {k: re.compile(rf'.{{0,50}}{re.escape(k)}.{{0,100}}', re.IGNORECASE)
+                       for k in CONTEXT_KEYWORDS}
+
     def __init__(self):
         self.stats = {
             'processed': 0,
@@ -111,22 +165,48 @@ class MontoExtractor:
         match = re.search(r'(\d+)[º°]', description)
         return match.group(1) if match else "0"
 
-    def _extract_norma_info(self, text: str) -> tuple[str, str]:
+    def _marker_matches(self, text: str) -> Iterator[re.Match]:
         """
-        Extrae tipo y número de norma del texto.
-        Returns: (tipo, numero)
+        Lo mismo que MARKER_PATTERN.finditer(text), pero la regex solo se
+        prueba donde empieza una de MARKER_WORDS (búsqueda de subcadenas
+        sobre el texto en minúsculas, mucho más rápida que la alternación
+        sin distinguir mayúsculas en cada posición).
         """
-        for tipo, pattern in self.NORMA_PATTERNS.items():
-            match = pattern.search(text)
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Alguna letra cambia de largo al pasar a minúsculas
+            yield from self.MARKER_PATTERN.finditer(text)
+            return
+
+        candidates = set()
+        for word, offset in self.MARKER_WORDS:
+            pos = lowered.find(word)
+            while pos >= 0:
+                if pos >= offset:
+                    candidates.add(pos - offset)
+                pos = lowered.find(word, pos + 1)
+
+        end = 0
+        for pos in sorted(candidates):
+            if pos < end:
+                continue
+            match = self.MARKER_PATTERN.match(text, pos)
             if match:
-                return tipo, match.group(1)
-        return "Norma", "S/N"
-
-    def _extract_articulo(self, text: str) -> str:
-        """Extrae número de artículo del texto"""
-        # Buscar en una ventana cercana al monto
-        match = self.ARTICULO_PATTERN.search(text)
-        return match.group(1) if match else "S/N"
+                end = match.end()
+                yield match
+
+    def _index_markers(self, text: str) -> MarkerIndex:
+        """Encabezados de norma y artículos del texto, en orden"""
+        index = MarkerIndex()
+        for match in self._marker_matches(text):
+            if match.group('articulo'):
+                index.articulo_offsets.append(match.start())
+                index.articulos.append(match.group('articulo'))
+            else:
+                index.norma_offsets.append(match.start())
+                index.normas.append((self.NORMA_TIPOS[match.group('tipo').upper()],
+                                     match.group('numero')))
+        return index
 
     def _extract_context(self, text: str, monto_pos: int, window: int = 200) -> str:
         """
@@ -152,15 +232,15 @@ class MontoExtractor:
         """
         Intenta extraer el concepto del gasto/tasa del contexto.
         """
-        # Buscar palabras clave en el contexto
+        # La primera de CONTEXT_KEYWORDS que aparece define el concepto.
+        # Búsqueda de subcadenas sobre el contexto en minúsculas (una sola
+        # vez): más rápida que una alternación de todas las claves, que
+        # se prueba en cada posición del contexto
+        lowered = context.lower()
         for keyword in self.CONTEXT_KEYWORDS:
-            if keyword.lower() in context.lower():
+            if keyword in lowered:
                 # Extraer frase alrededor de la keyword
-                pattern = re.compile(
-                    rf'.{{0,50}}{re.escape(keyword)}.{{0,100}}',
-                    re.IGNORECASE
-                )
-                match = pattern.search(context)
+                match = self.KEYWORD_PHRASES[keyword].search(context)
                 if match:
                     concepto = match.group(0).strip()
                     # Limpiar
@@ -171,6 +251,29 @@ class MontoExtractor:
         words = context.split()[:10]
         return ' '.join(words)
 
+    def _iter_amounts(self, text: str) -> Iterator[Tuple[int, int, str, Optional[str]]]:
+        """
+        Montos del texto, iguales a los de AMOUNT_PATTERN.finditer, en una
+        pasada que salta de "$" en "$".
+
+        Yields:
+            (inicio del monto o de su prefijo "PESOS ...", posición del "$",
+            número, centavos)
+        """
+        # El prefijo PESOS no puede cruzar un "$" ni el monto anterior
+        prefix_from = 0
+        dollar = text.find('$')
+        while dollar >= 0:
+            match = self.AMOUNT_AT_DOLLAR.match(text, dollar)
+            if match is None:
+                prefix_from = dollar + 1
+                dollar = text.find('$', prefix_from)
+                continue
+            prefix = self.PESOS_PREFIX.search(text, prefix_from, dollar)
+            yield (prefix.start() if prefix else dollar), dollar, match.group(1), match.group(2)
+            prefix_from = match.end()
+            dollar = text.find('$', prefix_from)
+
     def extract_from_boletin(self, boletin: Dict[str, Any]) -> List[MontoRecord]:
         """
         Extrae todos los montos de un boletín completo.
@@ -196,13 +299,11 @@ class MontoExtractor:
             return []
 
         records = []
-        doc_start = 0
+        # Se arma con el primer monto válido (la mayoría de las normas no tiene)
+        markers: Optional[MarkerIndex] = None
 
         # Buscar todos los montos en el texto
-        for match in self.AMOUNT_PATTERN.finditer(text):
-            monto_str = match.group(1)
-            centavos_str = match.group(2)
-
+        for monto_pos, dollar_pos, monto_str, centavos_str in self._iter_amounts(text):
             # Parsear monto
             monto = self._parse_argentine_number(monto_str)
             if monto is None or monto < 1:  # Filtrar valores inválidos
@@ -211,20 +312,17 @@ class MontoExtractor:
             if centavos_str:
                 monto += int(centavos_str) / 100
 
-            # Posición del monto en el texto
-            monto_pos = match.start()
+            # Norma y artículo: los más cercanos antes del "$" (el artículo,
+            # solo si es de esa misma norma). No se usa el inicio del prefijo
+            # "PESOS ...", que puede estar antes de encabezados anteriores
+            if markers is None:
+                markers = self._index_markers(text)
+            norma_pos, norma_tipo, norma_numero = markers.norma_at(dollar_pos)
+            articulo = markers.articulo_at(dollar_pos, since=norma_pos)
 
-            # Extraer contexto antes del monto (para obtener info de norma/artículo)
+            # Contexto alrededor del monto (para el concepto)
             context_window = text[max(0, monto_pos - 500):monto_pos + 200]
 
-            # Extraer información de norma
-            norma_tipo, norma_numero = self._extract_norma_info(context_window)
-
-            # Extraer artículo
-            # Buscar artículo cercano al monto
-            articulo_match = self.ARTICULO_PATTERN.search(context_window)
-            articulo = articulo_match.group(1) if articulo_match else "S/N"
-
             # Extraer concepto del contexto
             concepto = self._extract_concept(context_window, text)
 
@@ -315,6 +413,37 @@ class MontoExtractor:
         with output_file.open('w', encoding='utf-8') as f:
             json.dump(index, f, indent=2, ensure_ascii=False)
 
+    def save_index_from_jsonl(self, records: Iterable[Dict[str, Any]], output_file: Path) -> int:
+        """
+        Guarda el índice de montos en una sola pasada, sin cargar los registros
+        en memoria (p. ej. leyendo el spool JSONL de una corrida).
+
+        Mismo formato que _save_index; 'metadata' se escribe después de 'records'.
+
+        Returns:
+            Cantidad de registros escritos
+        """
+        total = 0
+        municipios = set()
+
+        with output_file.open('w', encoding='utf-8') as f:
+            f.write('{\n  "records": [')
+            for record in records:
+                entry = json.dumps(record, indent=2, ensure_ascii=False)
+                f.write(('\n    ' if not total else ',\n    ') + entry.replace('\n', '\n    '))
+                total += 1
+                municipios.add(record['municipio'])
+
+            metadata = {
+                'total_records': total,
+                'municipios': len(municipios),
+                'generated_at': str(Path(__file__).stat().st_mtime)
+            }
+            f.write('\n  ],\n' if total else '],\n')
+            f.write('  "metadata": ' + json.dumps(metadata, indent=2).replace('\n', '\n  ') + '\n}')
+
+        return total
+
     def _print_stats(self):
         """Imprime estadísticas de extracción"""
         print(f"\n📊 Estadísticas:")
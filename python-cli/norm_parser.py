@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+norm_parser.py
+
+Parseo y extracción de una norma individual (nivel 3) a partir de su HTML
+ya descargado: texto, tablas estructuradas y montos.
+
+Es la etapa CPU del pipeline de normas: no hace I/O ni imprime, y todas las
+funciones son de módulo (picklables) para poder correr en un
+ProcessPoolExecutor. Cada proceso crea sus extractores una sola vez.
+
+El HTML se parsea una sola vez por norma (ParsedDocument) y ese árbol se
+comparte entre la extracción de texto, la de tablas y los fallbacks.
+
+@created 2026-10-17
+"""
+
+import re
+import time
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple, Union
+
+import lxml.html
+from lxml import etree
+from bs4 import BeautifulSoup
+
+from monto_extractor import MontoExtractor
+from table_extractor import StructuredTable, TableExtractor
+
+# Ordenanza Nº 2319 -> 2319
+NUMERO_PATTERN = re.compile(r'N[º°]\s*(\d+[/-]?\d*)')
+TABLE_TAG_PATTERN = re.compile(r'<table[\s>/]', re.IGNORECASE)
+XML_DECLARATION_PATTERN = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+# Etiquetas cuyo texto no es contenido (TableExtractor las elimina; el
+# texto de <template> BeautifulSoup no lo devuelve en get_text)
+PAGE_SKIP_TAGS = frozenset({'script', 'style', 'noscript', 'template'})
+# Etiquetas que se descartan cuando el contenedor es todo el <body>
+BODY_SKIP_TAGS = frozenset({'script', 'style', 'nav', 'footer', 'header', 'noscript'})
+
+# Extractores del proceso actual (se crean en el primer uso)
+_extractors: Optional[Tuple[TableExtractor, MontoExtractor]] = None
+
+
+def _get_extractors() -> Tuple[TableExtractor, MontoExtractor]:
+    global _extractors
+    if _extractors is None:
+        _extractors = (TableExtractor(), MontoExtractor())
+    return _extractors
+
+
+class ParsedDocument:
+    """
+    HTML parseado una sola vez y compartido por la extracción de texto, la
+    de tablas y sus fallbacks (también lo usan los parsers de listado).
+
+    - `tree`: árbol lxml (sin BeautifulSoup); camino rápido para el texto
+    - `soup`: árbol BeautifulSoup; solo se construye si el HTML tiene
+      <table>, porque TableExtractor trabaja sobre él
+
+    Ambos se construyen en el primer uso. `soup` es del TableExtractor (lo
+    modifica); el texto y los fallbacks leen siempre `tree`.
+    """
+
+    def __init__(self, html: str):
+        self.html = html or ''
+        self.has_tables = TABLE_TAG_PATTERN.search(self.html) is not None
+        self._tree = None
+        self._soup = None
+
+    @property
+    def tree(self) -> lxml.html.HtmlElement:
+        if self._tree is None:
+            try:
+                self._tree = lxml.html.document_fromstring(self.html)
+            except ValueError:
+                # lxml no acepta str con declaración de encoding
+                self._tree = lxml.html.document_fromstring(
+                    XML_DECLARATION_PATTERN.sub('', self.html, count=1))
+            except etree.ParserError:
+                # Documento sin elementos (vacío o solo comentarios)
+                self._tree = lxml.html.Element('html')
+        return self._tree
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.html, 'lxml')
+        return self._soup
+
+
+def _as_document(html: Union[str, ParsedDocument]) -> ParsedDocument:
+    return html if isinstance(html, ParsedDocument) else ParsedDocument(html)
+
+
+def iter_strings(root: lxml.html.HtmlElement, skip: FrozenSet[str] = frozenset(),
+                  comments: bool = False) -> Iterator[str]:
+    """
+    Nodos de texto bajo `root` en orden de documento (los mismos que recorre
+    BeautifulSoup), sin entrar en las etiquetas de `skip`.
+    """
+    if root.text:
+        yield root.text
+    stack = [(iter(root), None)]
+    while stack:
+        child = next(stack[-1][0], None)
+        if child is None:
+            _, parent = stack.pop()
+            if parent is not None and parent.tail:
+                yield parent.tail
+            continue
+        if not isinstance(child.tag, str):
+            # Comentario o instrucción de procesamiento
+            if comments and child.text:
+                yield child.text
+        elif child.tag not in skip:
+            if child.text:
+                yield child.text
+            stack.append((iter(child), child))
+            continue
+        if child.tail:
+            yield child.tail
+
+
+def _join_strings(strings: Iterable[str]) -> str:
+    text = '\n'.join(part for part in (s.strip() for s in strings) if part)
+    return re.sub(r'\n{3,}', '\n\n', text)
+
+
+def page_text(doc: ParsedDocument) -> str:
+    """Texto de toda la página; igual a TableExtractor._extract_text_content"""
+    return _join_strings(iter_strings(doc.tree, PAGE_SKIP_TAGS)).strip()
+
+
+def extract_text(html: Union[str, ParsedDocument]) -> Tuple[str, str]:
+    """
+    Extrae el texto completo del documento.
+
+    Returns:
+        (texto, estrategia usada para encontrar el contenedor)
+
+    Raises:
+        ValueError: Si el HTML o el texto extraído son demasiado cortos
+    """
+    doc = _as_document(html)
+    if len(doc.html) < 100:
+        raise ValueError(f"HTML inválido o demasiado corto ({len(doc.html)} caracteres)")
+
+    root = doc.tree
+    skip = frozenset()
+
+    # Estrategia 1: Buscar contenedor principal por ID
+    container = next((div for div in root.iter('div')
+                      if div.get('id') == 'frontend-container'), None)
+    strategy_used = "ID #frontend-container"
+
+    if container is None:
+        # Estrategia 2: Buscar contenedor por clase que contenga 'content'
+        container = next((div for div in root.iter('div')
+                          if 'content' in div.get('class', '').lower()), None)
+        strategy_used = "clase con 'content'"
+
+    if container is None:
+        # Estrategia 3: Buscar elementos semánticos main o article
+        container = next(root.iter('main'), None)
+        if container is None:
+            container = next(root.iter('article'), None)
+        strategy_used = "elemento <main> o <article>"
+
+    if container is None:
+        # Estrategia 4: Usar body pero excluir elementos no deseados
+        container = next(root.iter('body'), None)
+        skip = BODY_SKIP_TAGS
+        strategy_used = "<body> limpio"
+
+    if container is None:
+        raise ValueError(
+            "No se pudo encontrar contenido válido en el HTML con ninguna estrategia")
+
+    text = _join_strings(iter_strings(container, skip, comments=True))
+
+    if len(text) < 100:
+        raise ValueError(
+            f"Texto extraído demasiado corto ({len(text)} caracteres)")
+
+    return text, strategy_used
+
+
+def extract_content(html: Union[str, ParsedDocument],
+                    table_extractor: Optional[TableExtractor] = None
+                    ) -> Tuple[str, List[StructuredTable]]:
+    """
+    Texto con placeholders [TABLA_N] y tablas estructuradas; si la extracción
+    estructurada falla o da poco texto, texto plano sin tablas.
+
+    Sin <table> en el HTML el texto sale directo del árbol lxml, sin
+    construir el de BeautifulSoup.
+    """
+    doc = _as_document(html)
+    if len(doc.html) >= 50 and not doc.has_tables:
+        text_content = page_text(doc)
+        if len(text_content) >= 50:
+            return text_content, []
+    else:
+        table_extractor = table_extractor or _get_extractors()[0]
+        try:
+            text_content, tables = table_extractor.extract_tables(
+                doc.html, soup=doc.soup if doc.has_tables else None)
+            if len(text_content) >= 50:
+                return text_content, tables
+        except Exception:
+            pass
+    return extract_text(doc)[0], []
+
+
+NormTask = Tuple[Dict[str, Any], str, Optional[str], Optional[str], str]
+
+
+def build_norm(task: NormTask) -> Dict[str, Any]:
+    """
+    Construye la norma completa a partir de su HTML.
+
+    Args:
+        task: (metadatos de la norma, URL absoluta, HTML, error de descarga, municipio)
+
+    Returns:
+        Norma con contenido, tablas y montos; versión mínima con solo
+        metadatos si la descarga o la extracción fallaron
+    """
+    return build_norm_timed(task)[0]
+
+
+def build_norm_timed(task: NormTask) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """
+    Igual que build_norm, pero además devuelve la duración de cada etapa
+    (norm_parse, norm_extract, norm_montos) para las métricas de la corrida,
+    que viven en el proceso principal.
+    """
+    norma_metadata, norm_url, html, error, municipio = task
+    timings: Dict[str, float] = {}
+    try:
+        if error is not None:
+            raise RuntimeError(error)
+
+        started = time.perf_counter()
+        doc = ParsedDocument(html)
+        # Árbol que va a usar extract_content (BeautifulSoup solo con <table>)
+        _ = doc.soup if doc.has_tables else doc.tree
+        timings['norm_parse'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        contenido, tablas = extract_content(doc)
+        tablas = [t.to_dict() for t in tablas]
+        timings['norm_extract'] = time.perf_counter() - started
+
+        # Extraer montos del contenido
+        started = time.perf_counter()
+        _, monto_extractor = _get_extractors()
+        montos = monto_extractor.extract_from_boletin({
+            'text_content': contenido,
+            'description': municipio,
+            'date': norma_metadata.get('fecha', ''),
+            'link': norm_url
+        })
+        montos_list = [m.to_dict() for m in montos] if montos else []
+        timings['norm_montos'] = time.perf_counter() - started
+
+        numero_match = NUMERO_PATTERN.search(norma_metadata['titulo'])
+        numero = numero_match.group(1) if numero_match else norma_metadata['id']
+
+        return {
+            "id": norma_metadata['id'],
+            "tipo": norma_metadata['tipo'],
+            "numero": numero,
+            "titulo": norma_metadata['titulo'],
+            "fecha": norma_metadata['fecha'],
+            "municipio": municipio,
+            "url": norm_url,
+            "contenido": contenido,
+            "tablas": tablas,
+            "montos_extraidos": montos_list,
+            "metadata": {
+                "longitud_caracteres": len(contenido),
+                "tiene_tablas": len(tablas) > 0,
+                "total_tablas": len(tablas),
+                "total_montos": len(montos_list)
+            }
+        }, timings
+
+    except Exception as e:
+        return {
+            "id": norma_metadata['id'],
+            "tipo": norma_metadata['tipo'],
+            "numero": norma_metadata.get('id', 'unknown'),
+            "titulo": norma_metadata['titulo'],
+            "fecha": norma_metadata['fecha'],
+            "municipio": municipio,
+            "url": norm_url,
+            "contenido": norma_metadata.get('preview', ''),
+            "tablas": [],
+            "montos_extraidos": [],
+            "metadata": {
+                "error": str(e),
+                "scraping_failed": True
+            }
+        }, timings
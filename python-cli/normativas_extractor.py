@@ -22,7 +22,7 @@ import argparse
 import sys
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Iterable, Tuple
 from dataclasses import dataclass, asdict
 from collections import Counter
 
@@ -419,6 +419,21 @@ def save_index(normativas: List[Normativa], output_path: Path, compact: bool = F
         print(f"   Modo: COMPACTO (sin contenido)")
 
 
+def _minimal_entry(n: Normativa) -> Dict[str, Any]:
+    """Entrada del índice minimalista (claves abreviadas para reducir tamaño)"""
+    return {
+        'id': n.id,
+        'm': n.municipality,  # Abreviado para reducir tamaño
+        't': n.type,
+        'n': n.number,
+        'y': n.year,
+        'd': n.date,
+        'ti': n.title[:100] if len(n.title) > 100 else n.title,  # Truncar título
+        'sb': n.source_bulletin,
+        'url': n.norma_url if hasattr(n, 'norma_url') and n.norma_url else n.source_bulletin_url,  # Usar URL individual si existe (V2), fallback a boletín (V1)
+    }
+
+
 def save_minimal_index(normativas: List[Normativa], output_path: Path):
     """
     Guarda un índice MINIMALISTA para búsqueda rápida en frontend.
@@ -426,19 +441,7 @@ def save_minimal_index(normativas: List[Normativa], output_path: Path):
 
     Campos: id, municipality, type, number, year, date, title, source_bulletin, norma_url
     """
-    data = []
-    for n in normativas:
-        data.append({
-            'id': n.id,
-            'm': n.municipality,  # Abreviado para reducir tamaño
-            't': n.type,
-            'n': n.number,
-            'y': n.year,
-            'd': n.date,
-            'ti': n.title[:100] if len(n.title) > 100 else n.title,  # Truncar título
-            'sb': n.source_bulletin,
-            'url': n.norma_url if hasattr(n, 'norma_url') and n.norma_url else n.source_bulletin_url,  # Usar URL individual si existe (V2), fallback a boletín (V1)
-        })
+    data = [_minimal_entry(n) for n in normativas]
 
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(data, f, ensure_ascii=False, separators=(',', ':'))  # Sin espacios
@@ -449,6 +452,51 @@ def save_minimal_index(normativas: List[Normativa], output_path: Path):
     print(f"   Tamaño: {size_mb:.2f} MB")
 
 
+def save_indexes_from_jsonl(records: Iterable[Dict[str, Any]], full_path: Path,
+                            compact_path: Path, minimal_path: Path) -> int:
+    """
+    Genera los tres índices (completo, compacto y minimal) en una sola pasada
+    sobre los registros, sin cargarlos en memoria.
+
+    Produce los mismos archivos que save_index / save_minimal_index.
+
+    Args:
+        records: Normativas como dicts (p. ej. leídas del spool JSONL de una corrida)
+
+    Returns:
+        Cantidad de normativas escritas
+    """
+    total = 0
+    with open(full_path, 'w', encoding='utf-8') as full, \
+            open(compact_path, 'w', encoding='utf-8') as compact, \
+            open(minimal_path, 'w', encoding='utf-8') as minimal:
+        for f in (full, compact, minimal):
+            f.write('[')
+
+        for record in records:
+            n = Normativa(**record)
+            entry = n.to_dict()
+            full.write(('\n  ' if not total else ',\n  ') +
+                       json.dumps(entry, ensure_ascii=False, indent=2).replace('\n', '\n  '))
+            del entry['content']  # Omitir contenido
+            compact.write((', ' if total else '') + json.dumps(entry, ensure_ascii=False))
+            minimal.write((',' if total else '') +
+                          json.dumps(_minimal_entry(n), ensure_ascii=False, separators=(',', ':')))
+            total += 1
+
+        full.write('\n]' if total else ']')
+        compact.write(']')
+        minimal.write(']')
+
+    for path, label in ((full_path, ''), (compact_path, ' COMPACTO'), (minimal_path, ' MINIMAL')):
+        size_mb = path.stat().st_size / (1024 * 1024)
+        print(f"\n✅ Índice{label} guardado: {path}")
+        print(f"   Total normativas: {total}")
+        print(f"   Tamaño: {size_mb:.2f} MB")
+
+    return total
+
+
 def print_statistics(normativas: List[Normativa]):
     """Imprime estadísticas de las normativas extraídas."""
     print("\n" + "=" * 60)
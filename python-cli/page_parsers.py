@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+page_parsers.py
+
+Parsers de las páginas de SIBOM de niveles 1 y 2: listado de boletines,
+paginación, metadatos y enlaces a normas de un boletín.
+
+Cada parser tiene dos caminos con el mismo resultado:
+- `*_lxml`: XPath precompilados sobre el árbol lxml (camino rápido para los
+  layouts conocidos de SIBOM)
+- `*_soup`: BeautifulSoup, para cuando el camino rápido no encuentra nada
+
+El scraper prueba lxml, después BeautifulSoup y, en el listado, el LLM.
+Ver benchmark_parsers.py para los tiempos de ambos caminos.
+
+Cuando hace falta el LLM, `prune_html` reduce la página a los nodos con
+contenido (sin scripts, estilos, navegación ni atributos de presentación)
+antes de armar el prompt.
+
+@created 2026-10-17
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+from bs4 import BeautifulSoup
+from lxml import etree
+
+from norm_parser import ParsedDocument, iter_strings
+
+PAGE_NUMBER_PATTERN = re.compile(r'page=(\d+)')
+BULLETIN_NUMBER_PATTERN = re.compile(r'(\d+º)')
+DATE_PATTERN = re.compile(r'\b(\d{1,2}/\d{1,2}/\d{4})\b')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Mapeo de clases CSS a tipos legibles
+TIPO_MAP = {
+    'ordinance': 'ordenanza',
+    'decree': 'decreto',
+    'resolution': 'resolución',
+    'disposition': 'disposición',
+    'edict': 'edicto'
+}
+
+
+def _has_class(name: str) -> str:
+    # Igual que class_='x' en BeautifulSoup: 'x' es una de las clases
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# ============================================================================
+# SELECTORES PRECOMPILADOS
+# ============================================================================
+
+# <div class="row bulletin"> (BeautifulSoup compara el atributo completo)
+BULLETIN_ROWS = etree.XPath("//div[normalize-space(@class)='row bulletin']")
+BULLETIN_TITLE = etree.XPath(f"(.//p[{_has_class('bulletin-title')}])[1]")
+BULLETIN_DATE = etree.XPath(f"(.//p[{_has_class('bulletin-date')}])[1]")
+BULLETIN_ACTION = etree.XPath(f"(.//form[{_has_class('button_to')}])[1]/@action")
+
+PAGINATION = etree.XPath(f"(//ul[{_has_class('pagination')}])[1]")
+PAGINATION_LINKS = etree.XPath(".//a[@href]")
+
+CONTENT_LINKS_PATH = f"//a[{_has_class('content-link')}]"
+CONTENT_LINKS = etree.XPath(CONTENT_LINKS_PATH)
+WHITE_BOX = etree.XPath(f"(.//div[{_has_class('white-box')}])[1]")
+PARAGRAPHS = etree.XPath(".//p")
+CITY_AND_DATE = etree.XPath(f"(.//p[{_has_class('city-and-date')}])[1]")
+
+# Página de un boletín: encabezado con el mismo título/fecha que en el
+# listado; si no está, los títulos h1-h4 y el <title> del documento
+HEADER_TITLE = etree.XPath(f"(//*[{_has_class('bulletin-title')}])[1]")
+HEADER_DATE = etree.XPath(f"(//*[{_has_class('bulletin-date')}])[1]")
+HEADINGS = etree.XPath(
+    f"//*[self::h1 or self::h2 or self::h3 or self::h4][not(ancestor::a[{_has_class('content-link')}])]")
+DOCUMENT_TITLE = etree.XPath("//title")
+# Texto fuera de las normas (para buscar "Publicado el dd/mm/aaaa")
+PAGE_TEXT = etree.XPath(
+    f"//body//text()[not(ancestor::a[{_has_class('content-link')}])]"
+    "[not(ancestor::script)][not(ancestor::style)]")
+
+
+def _text(element) -> str:
+    """Equivalente a get_text(strip=True) de BeautifulSoup"""
+    return ''.join(part.strip() for part in iter_strings(element))
+
+
+def _first(results: List[Any]) -> Optional[Any]:
+    return results[0] if results else None
+
+
+def _bulletin_entry(title: str, date_text: str, link: str) -> Dict[str, str]:
+    # Extraer número del título (ej: "105º de Carlos Tejedor" -> "105º")
+    number_match = BULLETIN_NUMBER_PATTERN.search(title)
+    number = number_match.group(1) if number_match else title.split()[0]
+    return {
+        'number': number,
+        # Limpiar "Publicado el " del texto
+        'date': date_text.replace('Publicado el ', ''),
+        'description': title,
+        'link': link
+    }
+
+
+def _norm_entry(url: str, classes: List[str], titulo: Optional[str],
+                fecha: str, paragraphs: List[str]) -> Dict[str, str]:
+    # Extraer ID de la URL (/bulletins/1636/contents/1270278 -> 1270278)
+    norm_id = url.split('/')[-1] if '/' in url else 'unknown'
+
+    # Tipo de norma según las clases CSS del white-box
+    tipo_raw = [c for c in classes if c != 'white-box']
+    tipo = TIPO_MAP.get(tipo_raw[0], tipo_raw[0]) if tipo_raw else 'norma'
+
+    if titulo is None:
+        titulo = f"{tipo.capitalize()} {norm_id}"
+
+    # Preview: párrafos 3 y 4 (después de título y fecha)
+    preview_parts = [p for p in paragraphs[2:4] if p]
+    preview = ' '.join(preview_parts)[:200] if preview_parts else ''
+
+    return {
+        'id': norm_id,
+        'url': url,
+        'tipo': tipo,
+        'titulo': titulo,
+        'fecha': fecha,
+        'preview': preview
+    }
+
+
+# ============================================================================
+# NIVEL 1: LISTADO DE BOLETINES
+# ============================================================================
+
+def parse_listing_lxml(html: str) -> List[Dict[str, str]]:
+    """Boletines de una página de listado (number, date, description, link)"""
+    bulletins = []
+    for row in BULLETIN_ROWS(ParsedDocument(html).tree):
+        title_elem = _first(BULLETIN_TITLE(row))
+        date_elem = _first(BULLETIN_DATE(row))
+        bulletins.append(_bulletin_entry(
+            _text(title_elem) if title_elem is not None else "N/A",
+            _text(date_elem) if date_elem is not None else "N/A",
+            str(_first(BULLETIN_ACTION(row)) or '')))
+    return bulletins
+
+
+def parse_listing_soup(html: str) -> List[Dict[str, str]]:
+    soup = BeautifulSoup(html, 'lxml')
+    bulletins = []
+    for bulletin_div in soup.find_all('div', class_='row bulletin'):
+        title_elem = bulletin_div.find('p', class_='bulletin-title')
+        date_elem = bulletin_div.find('p', class_='bulletin-date')
+        form_elem = bulletin_div.find('form', class_='button_to')
+        bulletins.append(_bulletin_entry(
+            title_elem.get_text(strip=True) if title_elem else "N/A",
+            date_elem.get_text(strip=True) if date_elem else "N/A",
+            form_elem.get('action', '') if form_elem else ''))
+    return bulletins
+
+
+# ============================================================================
+# NIVEL 1: PAGINACIÓN
+# ============================================================================
+
+def _total_from_hrefs(last_href: Optional[str], hrefs: List[str]) -> Optional[int]:
+    # Enlace "Última »" primero; si no, el mayor page= de la paginación
+    if last_href:
+        match = PAGE_NUMBER_PATTERN.search(last_href)
+        if match:
+            return int(match.group(1))
+    pages = [int(m.group(1)) for m in map(PAGE_NUMBER_PATTERN.search, hrefs) if m]
+    return max(pages) if pages else None
+
+
+def detect_total_pages_lxml(html: str) -> Optional[int]:
+    """
+    Páginas totales según <ul class="pagination">.
+
+    Returns:
+        1 si no hay paginación; None si hay pero no se pudo leer
+    """
+    pagination = _first(PAGINATION(ParsedDocument(html).tree))
+    if pagination is None:
+        return 1
+    links = PAGINATION_LINKS(pagination)
+    last_href = next((a.get('href', '') for a in links
+                      if len(a) == 0 and a.text and 'Última' in a.text), None)
+    return _total_from_hrefs(last_href, [a.get('href', '') for a in links])
+
+
+def detect_total_pages_soup(html: str) -> Optional[int]:
+    pagination = BeautifulSoup(html, 'lxml').find('ul', class_='pagination')
+    if not pagination:
+        return 1
+    # Patrón: <a href="/cities/22?page=14">Última &raquo;</a>
+    last_link = pagination.find('a', string=lambda text: text and 'Última' in text)
+    return _total_from_hrefs(
+        last_link.get('href', '') if last_link else None,
+        [a.get('href', '') for a in pagination.find_all('a', href=PAGE_NUMBER_PATTERN)])
+
+
+# ============================================================================
+# NIVEL 2: METADATOS DEL BOLETÍN
+# ============================================================================
+
+def parse_bulletin_metadata_lxml(html: str) -> Optional[Dict[str, str]]:
+    """
+    Número, fecha y descripción de la página de un boletín (el `link`
+    queda vacío: lo completa el scraper con la URL pedida).
+
+    Returns:
+        None si no se encontró el número del boletín (ej. "105º")
+    """
+    tree = ParsedDocument(html).tree
+
+    title = None
+    title_elem = _first(HEADER_TITLE(tree))
+    candidates = [title_elem] if title_elem is not None else []
+    for elem in candidates + HEADINGS(tree) + DOCUMENT_TITLE(tree):
+        text = WHITESPACE_PATTERN.sub(' ', ' '.join(iter_strings(elem))).strip()
+        if BULLETIN_NUMBER_PATTERN.search(text):
+            title = text
+            break
+    if title is None:
+        return None
+
+    date_elem = _first(HEADER_DATE(tree))
+    date_match = DATE_PATTERN.search(_text(date_elem)) if date_elem is not None else None
+    if date_match is None:
+        # "Publicado el 02/01/2026" en cualquier lugar fuera de las normas
+        page_text = WHITESPACE_PATTERN.sub(' ', ' '.join(PAGE_TEXT(tree)))
+        published = page_text.find('Publicado el')
+        date_match = DATE_PATTERN.search(page_text, published) if published >= 0 else None
+
+    return _bulletin_entry(title, date_match.group(1) if date_match else "N/A", '')
+
+
+# ============================================================================
+# REDUCCIÓN DE HTML PARA EL LLM
+# ============================================================================
+
+# Etiquetas sin contenido útil para el LLM (se borran con sus hijos)
+PRUNED_TAGS = ('script', 'style', 'noscript', 'svg', 'iframe', 'link', 'meta',
+               'img', 'picture', 'video', 'audio', 'canvas', 'nav', 'footer', 'button',
+               'input', 'select', 'textarea')
+# Atributos que identifican los nodos de SIBOM; el resto se descarta
+KEPT_ATTRIBUTES = frozenset({'class', 'href', 'action'})
+
+
+def _remove_keeping_tail(node):
+    # El texto que sigue al nodo (tail) no es parte de él: pasa al hermano
+    # anterior o al padre
+    parent = node.getparent()
+    if node.tail and node.tail.strip():
+        previous = node.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or '') + node.tail
+        else:
+            parent.text = (parent.text or '') + node.tail
+    parent.remove(node)
+
+
+def prune_html(html: str, drop: Optional[str] = None, max_chars: Optional[int] = None) -> str:
+    """
+    HTML reducido a los nodos con contenido, para prompts del LLM.
+
+    Borra comentarios, <head> (salvo el <title>), scripts, estilos,
+    navegación, pie y controles de formulario; deja solo los atributos
+    class/href/action, quita los elementos vacíos y colapsa los espacios.
+
+    Args:
+        drop: XPath de nodos a borrar además de los anteriores
+            (ej. las normas, cuando solo interesan los metadatos)
+        max_chars: Largo máximo del resultado
+    """
+    tree = ParsedDocument(html).tree
+
+    doomed = tree.xpath('//comment() | //processing-instruction()')
+    doomed += tree.xpath('//head/*[not(self::title)]')
+    doomed += tree.xpath('|'.join(f'//{tag}' for tag in PRUNED_TAGS))
+    if drop:
+        doomed += tree.xpath(drop)
+    for node in doomed:
+        if node.getparent() is not None:
+            _remove_keeping_tail(node)
+
+    # De abajo hacia arriba: un padre que queda vacío también se borra
+    for elem in reversed(list(tree.iter(etree.Element))):
+        for name in list(elem.attrib):
+            if name not in KEPT_ATTRIBUTES:
+                del elem.attrib[name]
+        if elem.text:
+            elem.text = WHITESPACE_PATTERN.sub(' ', elem.text)
+        if elem.tail:
+            elem.tail = WHITESPACE_PATTERN.sub(' ', elem.tail)
+        if (elem.getparent() is not None and len(elem) == 0 and not (elem.text or '').strip()
+                and not elem.get('href') and not elem.get('action')):
+            _remove_keeping_tail(elem)
+
+    pruned = etree.tostring(tree, method='html', encoding='unicode').strip()
+    return pruned[:max_chars] if max_chars else pruned
+
+
+# ============================================================================
+# NIVEL 2: ENLACES A NORMAS
+# ============================================================================
+
+def parse_content_links_lxml(html: str) -> List[Dict[str, str]]:
+    """Normas de un boletín (id, url, tipo, titulo, fecha, preview)"""
+    normas = []
+    for link in CONTENT_LINKS(ParsedDocument(html).tree):
+        url = link.get('href', '')
+        div = _first(WHITE_BOX(link)) if url else None
+        if div is None:
+            continue
+        paragraphs = PARAGRAPHS(div)[:5]
+        date_elem = _first(CITY_AND_DATE(div))
+        normas.append(_norm_entry(
+            url, div.get('class', '').split(),
+            _text(paragraphs[0]) if paragraphs else None,
+            _text(date_elem) if date_elem is not None else '',
+            [_text(p) for p in paragraphs]))
+    return normas
+
+
+def parse_content_links_soup(html: str) -> List[Dict[str, str]]:
+    normas = []
+    for link_elem in BeautifulSoup(html, 'lxml').find_all('a', class_='content-link'):
+        url = link_elem.get('href', '')
+        div = link_elem.find('div', class_='white-box') if url else None
+        if not div:
+            continue
+        title_elem = div.find('p')
+        date_elem = div.find('p', class_='city-and-date')
+        normas.append(_norm_entry(
+            url, div.get('class', []),
+            title_elem.get_text(strip=True) if title_elem else None,
+            date_elem.get_text(strip=True) if date_elem else '',
+            [p.get_text(strip=True) for p in div.find_all('p', limit=5)]))
+    return normas
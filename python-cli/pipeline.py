@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+pipeline.py
+
+Pipeline por etapas con colas acotadas entre ellas:
+
+    entrada -> fetch (hilos, I/O) -> process (pool de procesos, CPU) -> write
+
+- fetch: N hilos (descargas; el GIL se libera durante la red)
+- process: parseo y extracción; corre en un ProcessPoolExecutor si se pasa
+  uno (sin GIL compartido), o en un hilo si no
+- write: el hilo que consume `Pipeline.run()`, recibe los resultados en el
+  orden de entrada (una sola etapa escritora)
+
+Las colas entre etapas son acotadas y además hay un tope de elementos en
+vuelo: si el escritor o la etapa de CPU se atrasan, la entrada se frena
+(backpressure) y la memoria no depende de la cantidad de elementos.
+
+Cada etapa registra cantidad procesada, tiempo ocupado, throughput y
+profundidad (actual y máxima) de su cola de entrada.
+
+Uso:
+    pipeline = Pipeline(fetch, process, fetch_workers=4, process_pool=pool)
+    for result in pipeline.run(items):
+        write(result)
+    print(pipeline.format_metrics())
+
+@created 2026-10-17
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# Fin de la entrada de una etapa
+_DONE = object()
+
+
+class _Failure:
+    """Excepción de una etapa; viaja hasta el escritor y se relanza ahí"""
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+@dataclass
+class StageMetrics:
+    """Métricas de una etapa del pipeline"""
+    name: str
+    workers: int
+    processed: int = 0
+    busy_seconds: float = 0.0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def observe_queue(self, depth: int):
+        with self._lock:
+            self.queue_depth = depth
+            self.max_queue_depth = max(self.max_queue_depth, depth)
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.processed += 1
+            self.busy_seconds += seconds
+
+    def to_dict(self, elapsed: float) -> Dict[str, Any]:
+        return {
+            'workers': self.workers,
+            'processed': self.processed,
+            'throughput': self.processed / elapsed if elapsed > 0 else 0.0,
+            'busy_seconds': round(self.busy_seconds, 3),
+            'utilization': (self.busy_seconds / (elapsed * self.workers)
+                            if elapsed > 0 else 0.0),
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+        }
+
+
+class Pipeline:
+    """
+    Pipeline fetch -> process -> write con colas acotadas y orden preservado.
+
+    Las excepciones de `fetch` o `process` se relanzan en el escritor al
+    llegar al elemento que las produjo. Si el consumidor deja de iterar
+    (break o excepción), las etapas se detienen.
+    """
+
+    def __init__(self, fetch: Callable[[Any], Any], process: Callable[[Any], Any],
+                 fetch_workers: int = 4, process_pool: Optional[Executor] = None,
+                 process_workers: int = 1, queue_size: Optional[int] = None,
+                 max_in_flight: Optional[int] = None):
+        """
+        Args:
+            fetch: Etapa de I/O: item -> payload (corre en hilos)
+            process: Etapa de CPU: payload -> result (debe ser picklable si hay pool)
+            fetch_workers: Hilos de la etapa fetch
+            process_pool: Pool de procesos para `process` (None = en hilos locales)
+            process_workers: Elementos en paralelo en la etapa process
+            queue_size: Capacidad de cada cola entre etapas
+            max_in_flight: Elementos admitidos y todavía no escritos
+        """
+        self.fetch = fetch
+        self.process = process
+        self.fetch_workers = max(1, fetch_workers)
+        self.process_pool = process_pool
+        self.process_workers = max(1, process_workers)
+        self.max_in_flight = max_in_flight or 2 * max(self.fetch_workers, self.process_workers)
+        self.queue_size = queue_size or self.max_in_flight
+
+        self.stages = {
+            'fetch': StageMetrics('fetch', self.fetch_workers),
+            'process': StageMetrics('process', self.process_workers),
+            'write': StageMetrics('write', 1),
+        }
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+
+    # ========================================================================
+    # EJECUCIÓN
+    # ========================================================================
+
+    def run(self, items: Iterable[Any]) -> Iterator[Any]:
+        """Procesa `items` y entrega los resultados en el orden de entrada"""
+        self._started_at = time.monotonic()
+        self._finished_at = None
+        stop = threading.Event()
+        slots = threading.Semaphore(self.max_in_flight)
+        fetch_q: queue.Queue = queue.Queue(self.queue_size)
+        process_q: queue.Queue = queue.Queue(self.queue_size)
+        write_q: queue.Queue = queue.Queue(self.queue_size)
+
+        def put(q: queue.Queue, item: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def get(q: queue.Queue, metrics: StageMetrics) -> Any:
+            while not stop.is_set():
+                try:
+                    item = q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                metrics.observe_queue(q.qsize())
+                return item
+            return _DONE
+
+        def feed():
+            seq = 0
+            try:
+                for item in items:
+                    while not slots.acquire(timeout=0.1):
+                        if stop.is_set():
+                            return
+                    if not put(fetch_q, (seq, item)):
+                        return
+                    seq += 1
+            except Exception as e:
+                # La entrada falló: viaja como un elemento más, en orden
+                put(fetch_q, (seq, _Failure(e)))
+            finally:
+                for _ in range(self.fetch_workers):
+                    put(fetch_q, _DONE)
+
+        def stage_worker(source: queue.Queue, metrics: StageMetrics,
+                         call: Callable[[Any], Any], sink: queue.Queue,
+                         remaining: List[int], downstream: int):
+            lock = threading.Lock()
+
+            def work():
+                while True:
+                    entry = get(source, metrics)
+                    if entry is _DONE:
+                        break
+                    seq, payload = entry
+                    if not isinstance(payload, _Failure):
+                        started = time.monotonic()
+                        try:
+                            payload = call(payload)
+                        except Exception as e:
+                            payload = _Failure(e)
+                        metrics.record(time.monotonic() - started)
+                    if not put(sink, (seq, payload)):
+                        return
+                # El último worker de la etapa cierra la siguiente
+                with lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    for _ in range(downstream):
+                        put(sink, _DONE)
+
+            return work
+
+        if self.process_pool is not None:
+            pool = self.process_pool
+
+            def process(payload):
+                return pool.submit(self.process, payload).result()
+        else:
+            process = self.process
+
+        threads = [threading.Thread(target=feed, name='pipeline-feed', daemon=True)]
+        fetch_work = stage_worker(fetch_q, self.stages['fetch'], self.fetch,
+                                  process_q, [self.fetch_workers], self.process_workers)
+        threads += [threading.Thread(target=fetch_work, name=f'pipeline-fetch-{n}', daemon=True)
+                    for n in range(self.fetch_workers)]
+        process_work = stage_worker(process_q, self.stages['process'], process,
+                                    write_q, [self.process_workers], 1)
+        threads += [threading.Thread(target=process_work, name=f'pipeline-process-{n}',
+                                     daemon=True)
+                    for n in range(self.process_workers)]
+        for thread in threads:
+            thread.start()
+
+        write_metrics = self.stages['write']
+        pending: Dict[int, Any] = {}
+        next_seq = 0
+        try:
+            while True:
+                entry = get(write_q, write_metrics)
+                if entry is _DONE:
+                    break
+                seq, result = entry
+                pending[seq] = result
+                write_metrics.observe_queue(write_q.qsize() + len(pending))
+                while next_seq in pending:
+                    result = pending.pop(next_seq)
+                    next_seq += 1
+                    if isinstance(result, _Failure):
+                        raise result.exc
+                    started = time.monotonic()
+                    yield result
+                    write_metrics.record(time.monotonic() - started)
+                    slots.release()
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            self._finished_at = time.monotonic()
+
+    # ========================================================================
+    # MÉTRICAS
+    # ========================================================================
+
+    def elapsed(self) -> float:
+        if self._started_at is None:
+            return 0.0
+        return (self._finished_at or time.monotonic()) - self._started_at
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Métricas por etapa: processed, throughput (/s), utilization, colas"""
+        elapsed = self.elapsed()
+        return {name: stage.to_dict(elapsed) for name, stage in self.stages.items()}
+
+    def format_metrics(self) -> str:
+        """Resumen de una línea para la consola"""
+        parts = []
+        for name, m in self.metrics().items():
+            parts.append(f"{name} {m['processed']} ({m['throughput']:.1f}/s, "
+                         f"{m['utilization']:.0%} ocupado, cola máx {m['max_queue_depth']})")
+        return ' | '.join(parts)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+progress_journal.py
+
+Journal de progreso append-only para el scraping de un boletín.
+Cada norma terminada agrega una línea JSON con su contenido completo, así
+que checkpointear cuesta O(1) por norma y retomar cuesta O(n). Las escrituras
+se sincronizan a disco (fsync) por lotes.
+
+Formato de boletines/.progress_<bulletin_id>.jsonl:
+    {"id": "12345", "ts": 1760000000.0, "norma": {...norma completa...}}
+
+También lee el formato anterior (.progress_<bulletin_id>.json con listas de
+IDs); esas normas no traen contenido y se vuelven a scrapear.
+
+@created 2026-10-17
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class ProgressJournal:
+    """
+    Journal JSONL de normas completadas de un boletín.
+
+    Thread-safe: varios hilos pueden llamar a `append()`; cada línea se
+    escribe completa bajo lock. Una línea truncada por un corte abrupto se
+    ignora al cargar.
+    """
+
+    # Sincronizar a disco cada N líneas o cada N segundos (lo que ocurra primero)
+    FSYNC_EVERY = 16
+    FSYNC_INTERVAL = 2.0
+
+    def __init__(self, output_dir: Path, bulletin_id: str,
+                 fsync_every: int = FSYNC_EVERY,
+                 fsync_interval: float = FSYNC_INTERVAL):
+        self.path = Path(output_dir) / f".progress_{bulletin_id}.jsonl"
+        self.legacy_path = Path(output_dir) / f".progress_{bulletin_id}.json"
+        self.fsync_every = max(1, fsync_every)
+        self.fsync_interval = fsync_interval
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def exists(self) -> bool:
+        return self.path.exists() or self.legacy_path.exists()
+
+    def load(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Carga las normas ya completadas.
+
+        Returns:
+            {id_norma: norma completa}; None si la norma viene del formato
+            anterior (sin contenido)
+        """
+        completed: Dict[str, Optional[Dict[str, Any]]] = {}
+
+        if self.legacy_path.exists():
+            try:
+                with self.legacy_path.open('r', encoding='utf-8') as f:
+                    legacy = json.load(f)
+                for norma_id in legacy.get('normas_procesadas', []):
+                    completed[str(norma_id)] = None
+            except (OSError, ValueError):
+                pass
+
+        if self.path.exists():
+            with self.path.open('r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # Línea truncada por un corte
+                    completed[str(record['id'])] = record.get('norma')
+
+        return completed
+
+    def append(self, norma_id: str, norma: Dict[str, Any]):
+        """Registra una norma completada (fsync por lotes)"""
+        line = json.dumps({'id': norma_id, 'ts': time.time(), 'norma': norma},
+                          ensure_ascii=False)
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = self.path.open('a', encoding='utf-8')
+            self._file.write(line + '\n')
+            self._unsynced += 1
+            if (self._unsynced >= self.fsync_every or
+                    time.monotonic() - self._last_sync >= self.fsync_interval):
+                self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        """Sincroniza lo pendiente y cierra el archivo"""
+        with self._lock:
+            if self._file is not None:
+                if self._unsynced:
+                    self._sync()
+                self._file.close()
+                self._file = None
+
+    def remove(self):
+        """Elimina el journal (y el formato anterior) una vez completado el boletín"""
+        self.close()
+        for path in (self.path, self.legacy_path):
+            if path.exists():
+                path.unlink()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+rate_limiter.py
+
+Rate limiting thread-safe con token buckets independientes por host.
+Permite presupuestos separados para SIBOM y para el proveedor LLM, ráfagas
+configurables y frenado automático ante HTTP 429/503 respetando Retry-After.
+
+Uso:
+    limiter = RateLimiter()
+    limiter.configure('sibom.slyt.gba.gob.ar', rate=1.0, burst=5)
+    limiter.acquire('https://sibom.slyt.gba.gob.ar/bulletins/1636')
+    limiter.penalize('sibom.slyt.gba.gob.ar', retry_after=30)
+
+@created 2026-10-17
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+def host_of(url_or_host: str) -> str:
+    """Normaliza una URL o host a su nombre de host"""
+    if '://' in url_or_host:
+        return urlparse(url_or_host).hostname or url_or_host
+    return url_or_host
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Interpreta el header Retry-After (segundos o fecha HTTP).
+
+    Returns:
+        Segundos a esperar, o None si el valor no es interpretable
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """
+    Token bucket thread-safe con reservas.
+
+    Cada `acquire()` reserva un token bajo lock y duerme fuera del lock,
+    de modo que N hilos concurrentes quedan espaciados correctamente en
+    vez de competir por el mismo instante.
+    """
+
+    # Factor de frenado ante 429/503 y recuperación por respuesta exitosa
+    SLOWDOWN_FACTOR = 0.5
+    RECOVERY_FACTOR = 1.1
+
+    def __init__(self, rate: float, burst: int = 1, jitter: float = 0.0):
+        """
+        Args:
+            rate: Tokens por segundo en régimen normal
+            burst: Máximo de tokens acumulables (ráfaga permitida)
+            jitter: Espera aleatoria extra máxima por petición (segundos)
+        """
+        if rate <= 0:
+            raise ValueError(f"rate debe ser positivo: {rate}")
+        self.base_rate = rate
+        self.rate = rate
+        self.min_rate = rate / 16
+        self.burst = max(1, burst)
+        self.jitter = max(0.0, jitter)
+
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.total_wait = 0.0
+        self.acquired = 0
+        self.penalties = 0
+
+    def _reserve(self) -> float:
+        """Reserva un token y retorna cuántos segundos hay que esperar"""
+        with self._lock:
+            now = time.monotonic()
+            if now > self._last:
+                self._tokens = min(self.burst,
+                                   self._tokens + (now - self._last) * self.rate)
+                self._last = now
+            self._tokens -= 1
+            ready_at = self._last + max(0.0, -self._tokens) / self.rate
+            wait = max(0.0, ready_at - now)
+            if self.jitter:
+                wait += random.uniform(0, self.jitter)
+            self.total_wait += wait
+            self.acquired += 1
+            return wait
+
+    def acquire(self) -> float:
+        """
+        Bloquea hasta obtener un token.
+
+        Returns:
+            Segundos efectivamente esperados
+        """
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def penalize(self, retry_after: Optional[float] = None):
+        """
+        Frena el bucket tras un 429/503.
+
+        Reduce la tasa a la mitad (hasta un mínimo) y, si hay Retry-After,
+        no entrega tokens nuevos hasta que se cumpla ese plazo.
+        """
+        with self._lock:
+            self.penalties += 1
+            self.rate = max(self.min_rate, self.rate * self.SLOWDOWN_FACTOR)
+            self._tokens = min(self._tokens, 0.0)
+            if retry_after:
+                self._last = max(self._last, time.monotonic() + retry_after)
+
+    def record_success(self):
+        """Recupera gradualmente la tasa base tras respuestas exitosas"""
+        if self.rate < self.base_rate:
+            with self._lock:
+                self.rate = min(self.base_rate, self.rate * self.RECOVERY_FACTOR)
+
+
+class RateLimiter:
+    """
+    Conjunto de token buckets independientes por host.
+
+    Los hosts sin configuración explícita usan la tasa y ráfaga por defecto.
+    """
+
+    def __init__(self, default_rate: float = 1.0, default_burst: int = 1,
+                 default_jitter: float = 0.0):
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.default_jitter = default_jitter
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, host: str, rate: float, burst: int = 1, jitter: float = 0.0):
+        """Define (o reemplaza) el presupuesto de un host"""
+        with self._lock:
+            self._buckets[host_of(host)] = TokenBucket(rate, burst, jitter)
+
+    def bucket(self, url_or_host: str) -> TokenBucket:
+        """Retorna el bucket del host, creándolo con valores por defecto"""
+        host = host_of(url_or_host)
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.default_rate, self.default_burst,
+                                     self.default_jitter)
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url_or_host: str) -> float:
+        """Bloquea hasta que el host tenga presupuesto disponible"""
+        return self.bucket(url_or_host).acquire()
+
+    def penalize(self, url_or_host: str, retry_after: Optional[float] = None):
+        """Frena el host tras un 429/503"""
+        self.bucket(url_or_host).penalize(retry_after)
+
+    def record_success(self, url_or_host: str):
+        """Registra una respuesta exitosa del host"""
+        self.bucket(url_or_host).record_success()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Estadísticas por host: peticiones, espera acumulada, frenadas y tasa actual"""
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {
+            host: {
+                'acquired': b.acquired,
+                'total_wait': b.total_wait,
+                'penalties': b.penalties,
+                'rate': b.rate,
+            }
+            for host, b in buckets.items()
+        }
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+run_metrics.py
+
+Instrumentación de una corrida del scraper: contadores, latencias por etapa
+(p50/p95/max), bytes descargados, tiempo frenado por el rate limiter y
+memoria pico.
+
+Etapas que registra el scraper:
+- fetch: petición HTTP a SIBOM (sin contar la espera del rate limiter)
+- rate_limit_wait / llm_rate_limit_wait: espera por el token bucket
+- llm_call: llamada al LLM
+- parse_listing / parse_pagination / parse_content_links /
+  parse_bulletin_metadata: niveles 1 y 2
+- norm_parse / norm_extract / norm_montos: parseo, texto+tablas y montos
+  de cada norma (medidos en el pool de procesos)
+- write_norm: escritura de la norma en el JSON del boletín
+- bulletin: boletín completo (niveles 2 y 3)
+
+El reporte se exporta como JSON o como textfile de Prometheus (según la
+extensión del archivo) al final de la corrida y, opcionalmente, cada N
+segundos mientras corre.
+
+Uso:
+    metrics = RunMetrics()
+    with metrics.timer('fetch'):
+        ...
+    metrics.count('bytes_fetched', len(body))
+    metrics.write(Path('boletines/run_metrics.json'))
+
+@created 2026-10-17
+"""
+
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class LatencyStats:
+    """
+    Histograma de latencias de una etapa.
+
+    count, total y max son exactos; los percentiles salen de un reservorio
+    de tamaño fijo (muestreo uniforme), así la memoria no depende de la
+    cantidad de observaciones.
+    """
+
+    def __init__(self, reservoir_size: int = 4096):
+        self.reservoir_size = reservoir_size
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._samples: List[float] = []
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        if len(self._samples) < self.reservoir_size:
+            self._samples.append(seconds)
+        else:
+            slot = random.randrange(self.count)
+            if slot < self.reservoir_size:
+                self._samples[slot] = seconds
+
+    def quantile(self, q: float) -> float:
+        """Percentil q (0-1) por rango más cercano; 0 sin observaciones"""
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+        return ordered[index]
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'total_seconds': round(self.total, 6),
+            'mean_seconds': round(self.total / self.count, 6) if self.count else 0.0,
+            'p50_seconds': round(self.quantile(0.50), 6),
+            'p95_seconds': round(self.quantile(0.95), 6),
+            'max_seconds': round(self.max, 6),
+        }
+
+
+def peak_rss_bytes() -> Dict[str, Optional[int]]:
+    """
+    Memoria residente pico del proceso y de sus hijos ya terminados
+    (None si la plataforma no la informa).
+    """
+    if resource is None:
+        return {'self': None, 'children': None}
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return {
+        'self': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+        'children': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale,
+    }
+
+
+class RunMetrics:
+    """Contadores y latencias por etapa de una corrida, seguros entre hilos"""
+
+    def __init__(self, reservoir_size: int = 4096):
+        self.reservoir_size = reservoir_size
+        self.started_at = time.time()
+        self._started = time.monotonic()
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._stages: Dict[str, LatencyStats] = {}
+        self._lock = threading.Lock()
+        self._reporter: Optional[threading.Thread] = None
+        self._stop_reporter = threading.Event()
+
+    # ========================================================================
+    # REGISTRO
+    # ========================================================================
+
+    def count(self, name: str, value: float = 1):
+        """Suma `value` al contador `name`"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float):
+        """Fija el valor actual de `name` (ej. el límite de concurrencia)"""
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, stage: str, seconds: float):
+        """Registra una duración de la etapa `stage`"""
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = LatencyStats(self.reservoir_size)
+            stats.observe(seconds)
+
+    def observe_many(self, timings: Dict[str, float]):
+        """Registra varias etapas a la vez (ej. las medidas en otro proceso)"""
+        for stage, seconds in timings.items():
+            self.observe(stage, seconds)
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """Mide el bloque como una observación de `stage` (también si falla)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    # ========================================================================
+    # REPORTE
+    # ========================================================================
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado actual de la corrida como dict serializable"""
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            stages = {name: stats.to_dict() for name, stats in sorted(self._stages.items())}
+        rss = peak_rss_bytes()
+        return {
+            'run': {
+                'started_at': self.started_at,
+                'elapsed_seconds': round(time.monotonic() - self._started, 3),
+                'peak_rss_bytes': rss['self'],
+                'peak_rss_children_bytes': rss['children'],
+            },
+            'counters': dict(sorted(counters.items())),
+            'gauges': dict(sorted(gauges.items())),
+            'stages': stages,
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2, ensure_ascii=False)
+
+    def to_prometheus(self, prefix: str = 'sibom_scraper') -> str:
+        """Formato de exposición de Prometheus (para el textfile collector)"""
+        snap = self.snapshot()
+        run = snap['run']
+        lines = [
+            f"# HELP {prefix}_run_elapsed_seconds Duración de la corrida hasta el reporte",
+            f"# TYPE {prefix}_run_elapsed_seconds gauge",
+            f"{prefix}_run_elapsed_seconds {run['elapsed_seconds']}",
+        ]
+        if run['peak_rss_bytes'] is not None:
+            lines += [
+                f"# HELP {prefix}_peak_rss_bytes Memoria residente pico",
+                f"# TYPE {prefix}_peak_rss_bytes gauge",
+                f'{prefix}_peak_rss_bytes{{process="self"}} {run["peak_rss_bytes"]}',
+                f'{prefix}_peak_rss_bytes{{process="children"}} {run["peak_rss_children_bytes"]}',
+            ]
+
+        for name, value in snap['counters'].items():
+            metric = f"{prefix}_{name}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+
+        for name, value in snap['gauges'].items():
+            metric = f"{prefix}_{name}"
+            lines += [f"# TYPE {metric} gauge", f"{metric} {value}"]
+
+        if snap['stages']:
+            metric = f"{prefix}_stage_seconds"
+            lines += [f"# HELP {metric} Latencia por etapa",
+                      f"# TYPE {metric} summary"]
+            for stage, s in snap['stages'].items():
+                lines += [
+                    f'{metric}{{stage="{stage}",quantile="0.5"}} {s["p50_seconds"]}',
+                    f'{metric}{{stage="{stage}",quantile="0.95"}} {s["p95_seconds"]}',
+                    f'{metric}{{stage="{stage}",quantile="1"}} {s["max_seconds"]}',
+                    f'{metric}_sum{{stage="{stage}"}} {s["total_seconds"]}',
+                    f'{metric}_count{{stage="{stage}"}} {s["count"]}',
+                ]
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: Path) -> Path:
+        """
+        Escribe el reporte de forma atómica: Prometheus si la extensión es
+        .prom, JSON en otro caso.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        content = self.to_prometheus() if path.suffix == '.prom' else self.to_json()
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(content, encoding='utf-8')
+        os.replace(tmp_path, path)
+        return path
+
+    def start_reporting(self, path: Path, interval: float):
+        """Reescribe el reporte cada `interval` segundos en un hilo de fondo"""
+        if interval <= 0 or self._reporter is not None:
+            return
+        self._stop_reporter.clear()
+
+        def report():
+            while not self._stop_reporter.wait(interval):
+                try:
+                    self.write(path)
+                except OSError:
+                    pass
+
+        self._reporter = threading.Thread(target=report, name='run-metrics', daemon=True)
+        self._reporter.start()
+
+    def stop_reporting(self):
+        if self._reporter is not None:
+            self._stop_reporter.set()
+            self._reporter.join()
+            self._reporter = None
@@ -17,6 +17,7 @@ import sqlite3
 import os
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
 from rich.console import Console
 from rich.progress import Progress
 
@@ -126,12 +127,16 @@ def extract_normativas_from_bulletin(bulletin_data: dict, filename: str) -> list
     
     return normativas
 
-def build_database():
+def build_database(boletines_dir: Optional[Path] = None, db_path: Optional[Path] = None):
     """
     Construye la base de datos desde los archivos JSON
+
+    Args:
+        boletines_dir: Carpeta con los JSON de boletines (default: boletines/)
+        db_path: Base a generar (default: <boletines_dir>/normativas.db)
     """
-    boletines_dir = Path(__file__).parent / 'boletines'
-    db_path = boletines_dir / 'normativas.db'
+    boletines_dir = Path(boletines_dir) if boletines_dir else Path(__file__).parent / 'boletines'
+    db_path = Path(db_path) if db_path else boletines_dir / 'normativas.db'
     
     # Eliminar DB existente
     if db_path.exists():
@@ -156,7 +161,7 @@ def build_database():
     
     total_normativas = 0
     
-    with Progress() as progress:
+    with Progress(console=console) as progress:
         task = progress.add_task("Procesando boletines...", total=len(json_files))
         
         for json_file in json_files:
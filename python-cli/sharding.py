@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+sharding.py
+
+Partición determinística de un crawl entre N procesos o runners de CI, y
+merge de sus salidas.
+
+Cada shard se elige con --shard i/N (i de 1 a N). La asignación usa CRC32
+de la clave (ID de ciudad o link del boletín), así que es estable entre
+máquinas y corridas sin coordinación.
+
+    python sibom_scraper.py --cities 1-136 --shard 1/4      # runner 1
+    python sibom_scraper.py --cities 1-136 --shard 2/4      # runner 2 ...
+    python sibom_scraper.py --merge-shards shard1 shard2 shard3 shard4
+
+Cada directorio de shard es el directorio de trabajo de un runner (con
+montos_index.json, normativas_index.json y boletines/).
+
+@created 2026-10-17
+"""
+
+import json
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from crawl_state import CityWatermarks
+from monto_extractor import MontoExtractor
+from normativas_extractor import save_indexes_from_jsonl
+from status_store import BulletinStatusStore
+
+SHARD_MODES = ('cities', 'bulletins')
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """
+    Interpreta "i/N" (1 <= i <= N).
+
+    Raises:
+        ValueError: Si el formato o el rango son inválidos
+    """
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise ValueError(f"Shard inválido '{value}': se espera i/N, ej. 2/4")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Shard inválido '{value}': i debe estar entre 1 y N")
+    return index, count
+
+
+def shard_of(key: Any, count: int) -> int:
+    """Shard (1..count) asignado a una clave; estable entre procesos"""
+    return zlib.crc32(str(key).encode('utf-8')) % count + 1
+
+
+def in_shard(key: Any, shard: Tuple[int, int]) -> bool:
+    index, count = shard
+    return shard_of(key, count) == index
+
+
+def filter_shard(items: Iterable[Any], shard: Tuple[int, int], key=lambda item: item) -> List[Any]:
+    """Elementos que le tocan al shard, en el orden original"""
+    return [item for item in items if in_shard(key(item), shard)]
+
+
+# ============================================================================
+# MERGE DE SALIDAS
+# ============================================================================
+
+def _iter_json_list(path: Path) -> Iterator[Dict[str, Any]]:
+    if path.exists():
+        with path.open('r', encoding='utf-8') as f:
+            data = json.load(f)
+        yield from (data.get('records', []) if isinstance(data, dict) else data)
+
+
+def _iter_shards(shard_dirs: Sequence[Path], filename: str) -> Iterator[Dict[str, Any]]:
+    """Registros de todos los shards, con un solo shard en memoria a la vez"""
+    for shard_dir in shard_dirs:
+        yield from _iter_json_list(Path(shard_dir) / filename)
+
+
+def _unique(records: Iterable[Dict[str, Any]], key) -> Iterator[Dict[str, Any]]:
+    seen = set()
+    for record in records:
+        if key(record) not in seen:
+            seen.add(key(record))
+            yield record
+
+
+def merge_shards(shard_dirs: Sequence[Path], output_dir: Path = Path('.')) -> Dict[str, int]:
+    """
+    Combina las salidas de varios shards en `output_dir`.
+
+    - montos_index.json y normativas_index*.json: concatenados en streaming
+      (normativas sin duplicados por ID)
+    - boletines/.status.db y boletines.md: upsert de todas las filas
+    - boletines/.watermarks.json: por ciudad, la menor watermark entre shards
+      (conservador: ningún shard queda con boletines sin procesar debajo)
+
+    Returns:
+        Cantidades combinadas por tipo de salida
+    """
+    shard_dirs = [Path(d) for d in shard_dirs]
+    output_dir = Path(output_dir)
+    boletines_dir = output_dir / 'boletines'
+    boletines_dir.mkdir(parents=True, exist_ok=True)
+    counts = {}
+
+    # Los shards son disjuntos: los montos se concatenan tal cual (un mismo
+    # monto puede repetirse legítimamente dentro de una norma)
+    counts['montos'] = MontoExtractor().save_index_from_jsonl(
+        _iter_shards(shard_dirs, 'montos_index.json'),
+        output_dir / 'montos_index.json')
+
+    counts['normativas'] = save_indexes_from_jsonl(
+        _unique(_iter_shards(shard_dirs, 'normativas_index.json'), key=lambda r: r['id']),
+        output_dir / 'normativas_index.json',
+        output_dir / 'normativas_index_compact.json',
+        output_dir / 'normativas_index_minimal.json')
+
+    store = BulletinStatusStore(boletines_dir / '.status.db',
+                                markdown_path=boletines_dir / 'boletines.md')
+    counts['boletines'] = 0
+    for shard_dir in shard_dirs:
+        shard_db = shard_dir / 'boletines' / '.status.db'
+        if shard_db.exists():
+            for row in BulletinStatusStore(shard_db).rows():
+                store.upsert(*row)
+                counts['boletines'] += 1
+    store.render_markdown()
+
+    watermarks = CityWatermarks(boletines_dir / '.watermarks.json')
+    watermarks.merge_min([CityWatermarks(d / 'boletines' / '.watermarks.json')
+                          for d in shard_dirs])
+    counts['ciudades'] = len(watermarks.cities())
+
+    return counts
@@ -12,13 +12,16 @@ import json
 import time
 import re
 import argparse
-import random
 import platform
 import subprocess
+import threading
+import multiprocessing
+from collections import deque
 from datetime import datetime
-from typing import List, Dict, Optional, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Optional, Any, Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import urlsplit
 
 import requests
 from openai import OpenAI
@@ -28,20 +31,63 @@ from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskPr
 from rich.table import Table
 from rich.panel import Panel
 from rich import print as rprint
-from bs4 import BeautifulSoup
 
 # Importar módulo de extracción de tablas
 from table_extractor import TableExtractor
 # Importar módulo de extracción de montos
 from monto_extractor import MontoExtractor
 # Importar módulo de extracción de normativas
-from normativas_extractor import extract_normativas_from_bulletin, save_index, save_minimal_index, Normativa
+from normativas_extractor import extract_normativas_from_bulletin, save_indexes_from_jsonl, Normativa
+# Importar motor de descarga HTTP con pool de conexiones
+from http_client import HTTPClient
+# Importar rate limiter por host (token buckets)
+from rate_limiter import RateLimiter
+# Importar caché HTTP condicional en disco
+from http_cache import HTTPCache
+# Importar caché persistente de respuestas del LLM
+from llm_cache import LLMCache
+# Importar cliente del LLM (concurrencia acotada, reintentos, coalescing)
+from llm_client import LLMClient
+# Importar archivo de HTML crudo (replay sin red)
+from html_archive import HTMLArchive, ReplayClient
+# Importar métricas por etapa de la corrida
+from run_metrics import RunMetrics
+# Importar control adaptativo (AIMD) de boletines en paralelo
+from concurrency import AIMDController
+# Importar estado del crawl incremental (watermarks por ciudad)
+from crawl_state import CityWatermarks
+# Importar journal de progreso append-only (resume por boletín)
+from progress_journal import ProgressJournal
+# Importar escritor en streaming de boletines
+from bulletin_writer import BulletinWriter
+# Importar spool JSONL de los índices globales
+from index_spool import IndexSpool, iter_jsonl
+# Importar store de status de boletines (SQLite)
+from status_store import BulletinStatusStore
+# Importar registro de ciudades (descubrimiento concurrente)
+from city_registry import CityRegistry
+# Importar planificador de boletines entre ciudades
+from bulletin_scheduler import BulletinScheduler
+# Importar particionado determinístico entre runners
+from sharding import SHARD_MODES, filter_shard, merge_shards, parse_shard
+# Importar pipeline por etapas y parseo de normas (etapa CPU)
+from pipeline import Pipeline
+from norm_parser import (ParsedDocument, build_norm, build_norm_timed, extract_content,
+                         extract_text)
+# Importar parsers de listado y enlaces (XPath sobre lxml + BeautifulSoup)
+from page_parsers import (CONTENT_LINKS_PATH, detect_total_pages_lxml,
+                          detect_total_pages_soup, parse_bulletin_metadata_lxml,
+                          parse_content_links_lxml, parse_content_links_soup,
+                          parse_listing_lxml, parse_listing_soup, prune_html)
 
 # Cargar variables de entorno
 load_dotenv()
 
 console = Console()
 
+# Procesos de parseo por defecto: un núcleo queda para descargas y escritura
+DEFAULT_CPU_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+
 
 class SIBOMScraper:
     # Mapeo de IDs de ciudades a nombres (fallback)
@@ -60,28 +106,19 @@ class SIBOMScraper:
 
     CITY_MAP_FILE = Path("boletines/CITY_MAP.json")
 
+    # Hosts con presupuesto de rate limiting independiente
+    SIBOM_HOST = "sibom.slyt.gba.gob.ar"
+    LLM_HOST = "openrouter.ai"
+
     def _load_city_map(self) -> Dict[str, str]:
         """
-        Carga el mapa de ciudades desde CITY_MAP.json.
+        Mapa de IDs a nombres de ciudades (CITY_MAP.json o CITY_MAP_FALLBACK).
+        Se lee de disco una sola vez por proceso.
 
         Returns:
             Dict con el mapeo de IDs a nombres
         """
-        if self.CITY_MAP_FILE.exists():
-            try:
-                with self.CITY_MAP_FILE.open('r', encoding='utf-8') as f:
-                    city_map = json.load(f)
-                console.print(
-                    f"[dim]  ✓ CITY_MAP cargado: {len(city_map)} ciudades[/dim]")
-                return city_map
-            except Exception as e:
-                console.print(
-                    f"[yellow]  ⚠ Error cargando CITY_MAP: {e}[/yellow]")
-
-        # Fallback al mapa interno
-        console.print(
-            f"[dim]  ✓ Usando CITY_MAP_FALLBACK: {len(self.CITY_MAP_FALLBACK)} ciudades[/dim]")
-        return self.CITY_MAP_FALLBACK.copy()
+        return self.city_registry.names()
 
     def get_city_name(self, city_id: str, city_url: str = None) -> str:
         """
@@ -94,26 +131,32 @@ class SIBOMScraper:
         Returns:
             Nombre de la ciudad o "Ciudad ID {id}" si no se puede obtener
         """
-        # Cargar CITY_MAP desde archivo
-        city_map = self._load_city_map()
-
-        # Buscar en CITY_MAP
-        name = city_map.get(city_id)
-        if name:
-            return name
-
-        # Fallback
-        return f"Ciudad ID {city_id}"
-
-    def __init__(self, api_key: str, model: str = "z-ai/glm-4.5-air:free"):
+        return self.city_registry.name(city_id) or f"Ciudad ID {city_id}"
+
+    def __init__(self, api_key: str, model: str = "z-ai/glm-4.5-air:free",
+                 max_connections: int = HTTPClient.DEFAULT_MAX_CONNECTIONS,
+                 sibom_rate: float = 1.0, sibom_burst: int = 5,
+                 llm_rate: float = 0.5, llm_burst: int = 2,
+                 use_cache: bool = True, norm_workers: int = 4,
+                 cpu_workers: int = 0, use_archive: bool = True,
+                 use_llm_cache: bool = True,
+                 llm_concurrency: int = LLMClient.DEFAULT_MAX_CONCURRENCY,
+                 llm_timeout: float = LLMClient.DEFAULT_TIMEOUT):
+        # Sin reintentos del SDK: los maneja LLMClient (backoff + rate limiter)
         self.client = OpenAI(
             api_key=api_key,
-            base_url="https://openrouter.ai/api/v1"
+            base_url="https://openrouter.ai/api/v1",
+            max_retries=0
         )
         self.model = model
-        self.rate_limit_delay = 3  # segundos entre llamadas (base)
-        self.jitter_range = 1.0  # +/- 1 segundo de variación aleatoria
-        self.last_call_time = 0
+
+        # Rate limiting por host: SIBOM y LLM tienen presupuestos separados.
+        # El jitter en SIBOM evita un patrón de peticiones perfectamente regular.
+        self.rate_limiter = RateLimiter()
+        self.rate_limiter.configure(
+            self.SIBOM_HOST, rate=sibom_rate, burst=sibom_burst, jitter=0.25)
+        self.rate_limiter.configure(
+            self.LLM_HOST, rate=llm_rate, burst=llm_burst)
 
         # User-Agent para simular navegador real
         self.headers = {
@@ -125,14 +168,57 @@ class SIBOMScraper:
             'Upgrade-Insecure-Requests': '1'
         }
 
+        # Caché HTTP condicional (ETag/Last-Modified) para páginas de SIBOM
+        self.http_cache = HTTPCache() if use_cache else None
+        # Caché de respuestas del LLM (modelo + prompt + response_format)
+        self.llm_cache = LLMCache() if use_llm_cache else None
+
+        # Archivo del HTML crudo descargado (re-extracción offline con --replay)
+        self.html_archive = HTMLArchive() if use_archive else None
+        # Modo replay: todo sale del archivo y los JSON se sobreescriben
+        self.replaying = False
+
+        # Contadores y latencias por etapa (reporte JSON/Prometheus al final)
+        self.metrics = RunMetrics()
+
+        # Llamadas al LLM compartidas por todos los workers
+        self.llm = LLMClient(self.client, self.model, rate_limiter=self.rate_limiter,
+                             host=self.LLM_HOST, max_concurrency=llm_concurrency,
+                             timeout=llm_timeout, cache=self.llm_cache,
+                             metrics=self.metrics)
+
+        # Pool de conexiones compartido para todas las descargas de SIBOM
+        self.http = HTTPClient(self.headers, max_connections=max_connections,
+                               rate_limiter=self.rate_limiter,
+                               cache=self.http_cache,
+                               archive=self.html_archive,
+                               metrics=self.metrics)
+
         # Inicializar extractor de tablas
         self.table_extractor = TableExtractor()
         # Inicializar extractor de montos
         self.monto_extractor = MontoExtractor()
-        # Almacén de montos extraídos durante el scraping
-        self.montos_acumulados = []
-        # Almacén de normativas extraídas durante el scraping
-        self.normativas_acumuladas: List[Normativa] = []
+        # Status de boletines por carpeta de salida (SQLite, render a boletines.md al final)
+        self._status_stores: Dict[Path, BulletinStatusStore] = {}
+        self._status_lock = threading.Lock()
+        # Montos y normativas extraídos durante el scraping (spool JSONL en disco)
+        self.index_spool = IndexSpool()
+        # Registro de ciudades (nombres memoizados por proceso)
+        self.city_registry = CityRegistry(self.CITY_MAP_FILE, fallback=self.CITY_MAP_FALLBACK)
+        # Shard (i, N) de boletines a procesar con --shard-by bulletins (None = todos)
+        self.bulletin_shard: Optional[tuple] = None
+        # Watermarks del crawl incremental por ciudad
+        self.watermarks = CityWatermarks()
+        # Páginas de listado descargadas en paralelo
+        self.listing_workers = 4
+        # Normas scrapeadas en paralelo dentro de cada boletín
+        self.norm_workers = max(1, norm_workers)
+        # Procesos para parseo y extracción (0 = en un hilo del proceso principal)
+        self.cpu_workers = max(0, cpu_workers)
+        self._cpu_pool: Optional[ProcessPoolExecutor] = None
+        self._cpu_pool_lock = threading.Lock()
+        # Límite adaptativo de boletines en paralelo (None = --parallel fijo)
+        self.concurrency: Optional[AIMDController] = None
 
     def _play_sound(self, sound_type: str = 'success'):
         """
@@ -172,57 +258,6 @@ class SIBOMScraper:
             # Silenciosamente ignorar errores de sonido
             pass
 
-    def _get_progress_file(self, bulletin_id: str, output_dir: Path) -> Path:
-        """Retorna path del archivo de progreso para un boletín"""
-        return output_dir / f".progress_{bulletin_id}.json"
-
-    def _save_progress(self, bulletin_id: str, output_dir: Path,
-                       normas_procesadas: List[str], normas_pendientes: List[str]):
-        """Guarda progreso incremental del scraping de un boletín"""
-        progress_file = self._get_progress_file(bulletin_id, output_dir)
-
-        progress_data = {
-            "bulletin_id": bulletin_id,
-            "timestamp": time.time(),
-            "normas_procesadas": normas_procesadas,
-            "normas_pendientes": normas_pendientes,
-            "total": len(normas_procesadas) + len(normas_pendientes),
-            "completed": len(normas_procesadas)
-        }
-
-        try:
-            with progress_file.open('w', encoding='utf-8') as f:
-                json.dump(progress_data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            console.print(
-                f"[yellow]⚠ No se pudo guardar progreso: {e}[/yellow]")
-
-    def _load_progress(self, bulletin_id: str, output_dir: Path) -> Optional[Dict]:
-        """Carga progreso existente de un boletín"""
-        progress_file = self._get_progress_file(bulletin_id, output_dir)
-
-        if not progress_file.exists():
-            return None
-
-        try:
-            with progress_file.open('r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            console.print(
-                f"[yellow]⚠ No se pudo cargar progreso: {e}[/yellow]")
-            return None
-
-    def _clean_progress(self, bulletin_id: str, output_dir: Path):
-        """Elimina archivo de progreso una vez completado el boletín"""
-        progress_file = self._get_progress_file(bulletin_id, output_dir)
-
-        if progress_file.exists():
-            try:
-                progress_file.unlink()
-            except Exception as e:
-                console.print(
-                    f"[dim]No se pudo eliminar archivo de progreso: {e}[/dim]")
-
     def _detect_document_types(self, text: str) -> List[str]:
         """
         Detecta tipos de documentos presentes en el texto de un boletín.
@@ -250,20 +285,6 @@ class SIBOMScraper:
 
         return types_found
 
-    def _wait_for_rate_limit(self):
-        """Espera según rate limiting con jitter aleatorio para evitar patrón detecta"""
-        elapsed = time.time() - self.last_call_time
-
-        # Agregar jitter aleatorio: delay base +/- variación aleatoria
-        jitter = random.uniform(-self.jitter_range, self.jitter_range)
-        actual_delay = max(1.0, self.rate_limit_delay +
-                           jitter)  # Mínimo 1 segundo
-
-        if elapsed < actual_delay:
-            time.sleep(actual_delay - elapsed)
-
-        self.last_call_time = time.time()
-
     def _extract_json(self, text: str) -> str:
         """Limpia markdown code blocks de la respuesta"""
         cleaned = text.strip()
@@ -301,32 +322,19 @@ class SIBOMScraper:
 
     def _get_city_name_from_url(self, url: str) -> Optional[str]:
         """
-        Extrae el nombre de la ciudad desde la URL usando el mapeo CITY_MAP.
+        Extrae el nombre de la ciudad desde la URL usando el mapeo CITY_MAP.json.
         Ejemplo: "https://sibom.slyt.gba.gob.ar/cities/22" -> "Merlo"
-        """
-        # Buscar patrón /cities/[ID]
-        match = re.search(r'/cities/(\d+)', url)
-        if match:
-            city_id = match.group(1)
-            return self.CITY_MAP.get(city_id)
-        return None
 
-    def _get_city_name_from_url(self, url: str) -> Optional[str]:
-        """
-        Extrae el nombre de la ciudad desde la URL usando el mapeo CITY_MAP.json.
-        
         Args:
             url: URL de la ciudad
-            
+
         Returns:
             Nombre de la ciudad o None si no se puede obtener
         """
         # Buscar patrón en la URL
         match = re.search(r'/cities/(\d+)', url)
         if match:
-            city_id = match.group(1)
-            city_map = self._load_city_map()
-            return city_map.get(city_id)
+            return self.city_registry.name(match.group(1))
         return None
 
     def _sanitize_filename(self, description: str, number: str = None) -> str:
@@ -369,147 +377,231 @@ class SIBOMScraper:
         # Formato final: NombreCiudad_Numero
         return f"{cleaned}_{num}" if cleaned else f"boletin_{num}"
 
+    def _status_store(self, output_dir: Path) -> BulletinStatusStore:
+        """Store de status de la carpeta de salida (uno por carpeta, compartido entre hilos)"""
+        key = Path(output_dir).resolve()
+        with self._status_lock:
+            store = self._status_stores.get(key)
+            if store is None:
+                store = BulletinStatusStore(output_dir / ".status.db",
+                                            markdown_path=output_dir / "boletines.md")
+                self._status_stores[key] = store
+            return store
+
     def _update_index_md(self, bulletin: Dict, output_dir: Path, base_url: str):
         """
-        Actualiza el archivo boletines.md con la información del boletín procesado
+        Registra el status del boletín procesado (upsert por URL en SQLite).
+        boletines.md se genera al final de la corrida con render_status_indexes().
         """
-        index_file = output_dir / "boletines.md"
-
-        # Crear archivo si no existe
-        if not index_file.exists():
-            with index_file.open('w', encoding='utf-8') as f:
-                f.write("# Boletines Procesados\n\n")
-                f.write(
-                    "JSON2Markdown Converter = https://memochou1993.github.io/json2markdown-converter/\n\n\n")
-                f.write("| Number | Date | Description | Link | Status |\n")
-                f.write("|--------|------|-------------|------|--------|\n")
-
-        # Preparar datos
-        number = bulletin.get('number', 'N/A')
-        date = bulletin.get('date', 'N/A')
-        description = bulletin.get('description', 'N/A')
         link = bulletin.get('link', '')
-        status = bulletin.get('status', 'unknown')
+        full_url = (link if link.startswith('http') else f"{base_url}{link}") if link else 'N/A'
+
+        self._status_store(output_dir).upsert(
+            bulletin.get('number', 'N/A'),
+            bulletin.get('date', 'N/A'),
+            bulletin.get('description', 'N/A'),
+            full_url,
+            bulletin.get('status', 'unknown')
+        )
 
-        # Construir URL completa
-        if link:
-            full_url = link if link.startswith('http') else f"{base_url}{link}"
-        else:
-            full_url = 'N/A'
-
-        # Formato de status con emoji
-        status_display = {
-            'completed': '✅ Completado',
-            'skipped': '🤖 Creado',
-            'error': '❌ Error',
-            'no_content': '⚠️ Sin contenido',
-            'unknown': '❓ Desconocido'
-        }.get(status, status)
-
-        # Leer archivo existente para verificar si ya existe esta entrada
-        with index_file.open('r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Crear nueva línea
-        new_line = f"| {number} | {date} | {description} | [{full_url}]({full_url}) | {status_display} |\n"
-
-        # Verificar si ya existe una entrada para este boletín
-        if f"| {number} |" in content:
-            # Reemplazar la línea existente
-            lines = content.split('\n')
-            updated_lines = []
-            for line in lines:
-                if line.startswith(f"| {number} |"):
-                    updated_lines.append(new_line.rstrip())
-                else:
-                    updated_lines.append(line)
-            content = '\n'.join(updated_lines)
-
-            with index_file.open('w', encoding='utf-8') as f:
-                f.write(content)
-        else:
-            # Agregar nueva línea al final
-            with index_file.open('a', encoding='utf-8') as f:
-                f.write(new_line)
+    def render_status_indexes(self):
+        """Genera boletines.md de cada carpeta de salida usada en la corrida"""
+        with self._status_lock:
+            stores = list(self._status_stores.values())
+        for store in stores:
+            path = store.render_markdown()
+            console.print(f"[dim]📝 Índice actualizado: {path}[/dim]")
 
     def _make_llm_call(self, prompt: str, use_json_mode: bool = True) -> str:
-        """Realiza una llamada al LLM con rate limiting"""
-        self._wait_for_rate_limit()
-
-        params = {
-            "model": self.model,
-            "messages": [{"role": "user", "content": prompt}]
-        }
-
-        if use_json_mode:
-            params["response_format"] = {"type": "json_object"}
-
+        """
+        Realiza una llamada al LLM (ver LLMClient: caché, coalescing,
+        concurrencia acotada, rate limiting y reintentos con backoff)
+        """
+        response_format = {"type": "json_object"} if use_json_mode else None
         try:
-            response = self.client.chat.completions.create(**params)
-            return response.choices[0].message.content
+            return self.llm.complete(
+                prompt, response_format,
+                cacheable=lambda content: self._cacheable(content, use_json_mode))
         except Exception as e:
             console.print(f"[red]Error en llamada LLM: {e}[/red]")
             raise
 
+    def _cacheable(self, content: str, use_json_mode: bool) -> bool:
+        """En modo JSON solo se cachean respuestas parseables (un reintento no debe repetir basura)"""
+        if not use_json_mode:
+            return True
+        try:
+            json.loads(self._extract_json(content))
+            return True
+        except ValueError:
+            return False
+
     def fetch_html(self, url: str, max_retries: int = 3) -> str:
-        """Obtiene HTML de una URL con reintentos y User-Agent real"""
-        for attempt in range(max_retries):
+        """Obtiene HTML de una URL con reintentos, User-Agent real y conexiones reutilizadas"""
+        try:
+            return self.http.fetch_text(url, max_retries=max_retries)
+        except requests.RequestException as e:
+            console.print(f"[red]Error al obtener {url}: {e}[/red]")
+            raise
+
+    def fetch_many_html(self, urls: List[str], max_retries: int = 3) -> List[Any]:
+        """
+        Descarga varias URLs concurrentemente (modo asyncio del pool compartido).
+
+        Returns:
+            Lista alineada con `urls`: HTML o la excepción de esa URL
+        """
+        results = self.http.fetch_many(urls, max_retries=max_retries)
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                console.print(f"[red]Error al obtener {url}: {result}[/red]")
+        return results
+
+    def cache_summary_rows(self) -> List[tuple]:
+        """Filas (métrica, valor) con los contadores de los cachés HTTP y LLM para los resúmenes"""
+        if not self.http_cache:
+            rows = [("Caché HTTP", "desactivado")]
+        else:
+            stats = self.http_cache.summary()
+            rows = [
+                ("Caché HTTP: hits", str(stats['hits'])),
+                ("Caché HTTP: revalidados (304)", str(stats['revalidated'])),
+                ("Caché HTTP: misses", str(stats['misses'])),
+                ("Caché HTTP: tasa de aciertos", f"{stats['hit_rate']:.1%}"),
+            ]
+
+        if not self.llm_cache:
+            rows.append(("Caché LLM", "desactivado"))
+        else:
+            stats = self.llm_cache.summary()
+            if stats['hits'] or stats['misses']:
+                rows += [
+                    ("Caché LLM: hits / misses", f"{stats['hits']} / {stats['misses']}"),
+                    ("Caché LLM: tasa de aciertos", f"{stats['hit_rate']:.1%}"),
+                ]
+            rows.append(("Caché LLM: entradas",
+                         f"{stats['entries']} ({stats['bytes'] / 1024:.0f} KB)"))
+        return rows
+
+    def metrics_summary_rows(self) -> List[tuple]:
+        """Filas (métrica, valor) con bytes, espera, memoria y latencia por etapa"""
+        snap = self.metrics.snapshot()
+        counters, stages = snap['counters'], snap['stages']
+        rows = [("Descargado", f"{counters.get('bytes_fetched', 0) / (1024 * 1024):.1f} MB "
+                               f"en {int(counters.get('http_requests', 0))} peticiones")]
+        waited = sum(stages.get(name, {}).get('total_seconds', 0.0)
+                     for name in ('rate_limit_wait', 'llm_rate_limit_wait'))
+        rows.append(("Tiempo frenado (rate limit)", f"{waited:.1f}s"))
+        if snap['run']['peak_rss_bytes'] is not None:
+            rows.append(("Memoria pico",
+                         f"{snap['run']['peak_rss_bytes'] / (1024 * 1024):.0f} MB "
+                         f"(hijos {snap['run']['peak_rss_children_bytes'] / (1024 * 1024):.0f} MB)"))
+        gauges = snap['gauges']
+        if 'concurrency_limit' in gauges:
+            rows.append(("Paralelismo adaptativo",
+                         f"final {gauges['concurrency_limit']:.0f} "
+                         f"(rango {gauges['concurrency_limit_low']:.0f}-"
+                         f"{gauges['concurrency_limit_peak']:.0f}, "
+                         f"+{gauges['concurrency_increases']:.0f}/"
+                         f"-{gauges['concurrency_decreases']:.0f} ajustes)"))
+        if counters.get('llm_calls'):
+            rows.append(("LLM", f"{int(counters['llm_calls'])} llamadas "
+                                f"({int(counters.get('llm_retries', 0))} reintentos, "
+                                f"{int(counters.get('llm_errors', 0))} errores, "
+                                f"{int(counters.get('llm_coalesced', 0))} coalescidas), "
+                                f"{int(counters.get('llm_prompt_tokens', 0)):,} + "
+                                f"{int(counters.get('llm_completion_tokens', 0)):,} tokens"))
+        if counters.get('llm_html_chars_raw'):
+            rows.append(("HTML enviado al LLM",
+                         f"{counters['llm_html_chars_sent'] / 1024:.0f} KB "
+                         f"de {counters['llm_html_chars_raw'] / 1024:.0f} KB (reducido)"))
+        for name, stage in stages.items():
+            rows.append((f"Etapa {name}",
+                         f"{stage['count']}× p50 {stage['p50_seconds'] * 1000:.1f}ms "
+                         f"p95 {stage['p95_seconds'] * 1000:.1f}ms "
+                         f"máx {stage['max_seconds'] * 1000:.1f}ms"))
+        return rows
+
+    def _parse_fast(self, fast: Callable[[str], Any], fallback: Callable[[str], Any],
+                    html: str, stage: str) -> tuple:
+        """
+        Corre el parser XPath/lxml y, si no encuentra nada (o falla), el de
+        BeautifulSoup. El tiempo total queda en la etapa `stage` de las métricas.
+
+        Returns:
+            (resultado, nombre del parser usado)
+        """
+        with self.metrics.timer(stage):
             try:
-                response = requests.get(url, headers=self.headers, timeout=30)
-                response.raise_for_status()
-                return response.text
-            except requests.RequestException as e:
-                if attempt == max_retries - 1:
-                    console.print(f"[red]Error al obtener {url}: {e}[/red]")
-                    raise
-                time.sleep(2 ** attempt)
-        return ""
+                result = fast(html)
+                if result:
+                    return result, 'lxml'
+            except Exception:
+                pass
+            self.metrics.count(f'{stage}_fallbacks')
+            return fallback(html), 'BeautifulSoup'
+
+    def _html_for_llm(self, html: str, max_chars: int, drop: Optional[str] = None) -> str:
+        """
+        HTML reducido con prune_html para un prompt. Los contadores
+        llm_html_chars_raw / llm_html_chars_sent miden el ahorro.
+        """
+        pruned = prune_html(html, drop=drop, max_chars=max_chars)
+        self.metrics.count('llm_html_chars_raw', len(html))
+        self.metrics.count('llm_html_chars_sent', len(pruned))
+        return pruned
+
+    def fetch_bulletin_metadata(self, url: str, bulletin_id: str) -> Dict[str, str]:
+        """
+        Metadatos (number, date, description, link) de un boletín individual.
+
+        Se leen del DOM de la página; el LLM solo se usa si no aparece el
+        número del boletín, y recibe la página reducida (sin las normas).
+        """
+        link = f"/bulletins/{bulletin_id}"
+        bulletin_html = self.fetch_html(url)
+
+        with self.metrics.timer('parse_bulletin_metadata'):
+            try:
+                metadata = parse_bulletin_metadata_lxml(bulletin_html)
+            except Exception:
+                metadata = None
+        if metadata:
+            self.metrics.count('bulletin_metadata_dom')
+            return {**metadata, 'link': link}
+
+        # Fallback: LLM sobre los nodos relevantes de la página
+        self.metrics.count('bulletin_metadata_llm')
+        html = self._html_for_llm(bulletin_html, 50000, drop=CONTENT_LINKS_PATH)
+        metadata_prompt = f"""Extrae los metadatos de este boletín oficial.
+Busca el número del boletín (ej: "105º", "Boletín 98º"), la fecha de publicación, y una descripción breve.
+Devuelve SOLO un JSON válido con el formato: {{"number": string, "date": string, "description": string}}
+
+HTML: {html}"""
+
+        response = self._make_llm_call(metadata_prompt, use_json_mode=True)
+        cleaned = self._extract_json(response)
+        metadata = json.loads(cleaned)
+
+        return {
+            "number": metadata.get("number", f"#{bulletin_id}"),
+            "date": metadata.get("date", "N/A"),
+            "description": metadata.get("description", f"Boletín {bulletin_id}"),
+            "link": link
+        }
 
     def parse_listing_page(self, html: str, url: str) -> List[Dict]:
-        """Nivel 1: Extrae listado de boletines usando BeautifulSoup (con fallback a LLM)"""
+        """Nivel 1: Extrae listado de boletines (lxml, BeautifulSoup y fallback a LLM)"""
         console.print(
             "[cyan]📋 Nivel 1: Extrayendo listado de boletines...[/cyan]")
 
         try:
-            # Intentar con BeautifulSoup primero (95% de casos)
-            soup = BeautifulSoup(html, 'lxml')
-            bulletins = []
-
-            # Buscar todos los divs con clase "row bulletin"
-            bulletin_divs = soup.find_all('div', class_='row bulletin')
-
-            for bulletin_div in bulletin_divs:
-                # Extraer título (número + descripción)
-                title_elem = bulletin_div.find('p', class_='bulletin-title')
-                title = title_elem.get_text(
-                    strip=True) if title_elem else "N/A"
-
-                # Extraer fecha
-                date_elem = bulletin_div.find('p', class_='bulletin-date')
-                date_text = date_elem.get_text(
-                    strip=True) if date_elem else "N/A"
-                # Limpiar "Publicado el " del texto
-                date = date_text.replace('Publicado el ', '')
-
-                # Extraer enlace
-                form_elem = bulletin_div.find('form', class_='button_to')
-                link = form_elem.get('action', '') if form_elem else ''
-
-                # Extraer número del título (ej: "105º de Carlos Tejedor" -> "105º")
-                number_match = re.search(r'(\d+º)', title)
-                number = number_match.group(
-                    1) if number_match else title.split()[0]
-
-                bulletins.append({
-                    'number': number,
-                    'date': date,
-                    'description': title,
-                    'link': link
-                })
+            bulletins, parser_used = self._parse_fast(
+                parse_listing_lxml, parse_listing_soup, html, 'parse_listing')
 
             if bulletins:
                 console.print(
-                    f"[green]✓ Encontrados {len(bulletins)} boletines (BeautifulSoup)[/green]")
+                    f"[green]✓ Encontrados {len(bulletins)} boletines ({parser_used})[/green]")
                 return bulletins
             else:
                 raise ValueError(
@@ -524,7 +616,7 @@ class SIBOMScraper:
 IMPORTANTE: Busca el número, la fecha, una breve descripción y el enlace (href).
 Devuelve SOLO un JSON válido (sin texto adicional) con el formato: {{"bulletins": [{{"number": string, "date": string, "description": string, "link": string}}]}}
 
-HTML: {html[:200000]}"""
+HTML: {self._html_for_llm(html, 200000)}"""
 
             response = self._make_llm_call(prompt, use_json_mode=True)
             cleaned = self._extract_json(response)
@@ -537,8 +629,9 @@ HTML: {html[:200000]}"""
 
     def detect_total_pages(self, html: str) -> int:
         """
-        Detecta el número total de páginas usando BeautifulSoup.
-        Extrae el número de la última página del elemento <ul class="pagination">.
+        Detecta el número total de páginas (XPath sobre lxml, BeautifulSoup
+        como fallback). Extrae el número de la última página del elemento
+        <ul class="pagination">.
 
         Args:
             html: HTML de la página de listado
@@ -547,58 +640,26 @@ HTML: {html[:200000]}"""
             int: Número total de páginas (1 si no hay paginación)
         """
         try:
-            soup = BeautifulSoup(html, 'lxml')
-
-            # Buscar el contenedor de paginación
-            pagination = soup.find('ul', class_='pagination')
-
-            if not pagination:
-                console.print(
-                    "[dim]No se encontró paginación, asumiendo 1 página[/dim]")
-                return 1
-
-            # Buscar el enlace "Última" que contiene el número total de páginas
-            # Patrón: <a href="/cities/22?page=14">Última &raquo;</a>
-            last_page_link = pagination.find(
-                'a', string=lambda text: text and 'Última' in text)
-
-            if last_page_link:
-                href = last_page_link.get('href', '')
-                # Extraer número de página usando regex
-                match = re.search(r'page=(\d+)', href)
-                if match:
-                    total_pages = int(match.group(1))
-                    console.print(
-                        f"[green]✓ Detectadas {total_pages} páginas totales[/green]")
-                    return total_pages
-
-            # Fallback: buscar todos los enlaces con page= y tomar el máximo
-            all_page_links = pagination.find_all(
-                'a', href=re.compile(r'page=\d+'))
-            if all_page_links:
-                page_numbers = []
-                for link in all_page_links:
-                    href = link.get('href', '')
-                    match = re.search(r'page=(\d+)', href)
-                    if match:
-                        page_numbers.append(int(match.group(1)))
-
-                if page_numbers:
-                    total_pages = max(page_numbers)
-                    console.print(
-                        f"[yellow]✓ Detectadas {total_pages} páginas (fallback)[/yellow]")
-                    return total_pages
+            total_pages, parser_used = self._parse_fast(
+                detect_total_pages_lxml, detect_total_pages_soup, html, 'parse_pagination')
+        except Exception as e:
+            console.print(
+                f"[yellow]⚠ Error detectando páginas: {e}, asumiendo 1 página[/yellow]")
+            return 1
 
-            # Si no se encontró nada, asumir 1 página
+        if total_pages is None:
             console.print(
                 "[dim]No se pudo determinar número de páginas, asumiendo 1[/dim]")
             return 1
-
-        except Exception as e:
+        if total_pages == 1:
             console.print(
-                f"[yellow]⚠ Error detectando páginas: {e}, asumiendo 1 página[/yellow]")
+                "[dim]No se encontró paginación, asumiendo 1 página[/dim]")
             return 1
 
+        console.print(
+            f"[green]✓ Detectadas {total_pages} páginas totales ({parser_used})[/green]")
+        return total_pages
+
     def parse_bulletin_content_links(self, html: str) -> List[Dict[str, Any]]:
         """
         Nivel 2: Extrae enlaces de contenido con metadatos completos.
@@ -615,69 +676,12 @@ HTML: {html[:200000]}"""
             "[cyan]🔗 Nivel 2: Extrayendo metadatos de normas...[/cyan]")
 
         try:
-            # Intentar con BeautifulSoup primero (95% de casos)
-            soup = BeautifulSoup(html, 'lxml')
-
-            # Buscar todos los enlaces con clase "content-link"
-            content_links = soup.find_all('a', class_='content-link')
-
-            normas = []
-            for link_elem in content_links:
-                url = link_elem.get('href', '')
-                if not url:
-                    continue
-
-                # Extraer ID de la URL (/bulletins/1636/contents/1270278 -> 1270278)
-                norm_id = url.split('/')[-1] if '/' in url else 'unknown'
-
-                # Buscar el div interno con la clase que indica el tipo
-                div = link_elem.find('div', class_='white-box')
-                if not div:
-                    continue
-
-                # Extraer tipo de norma de las clases CSS
-                clases = div.get('class', [])
-                tipo_raw = [c for c in clases if c != 'white-box']
-                tipo = tipo_raw[0] if tipo_raw else 'norma'
-
-                # Mapeo de clases CSS a tipos legibles
-                tipo_map = {
-                    'ordinance': 'ordenanza',
-                    'decree': 'decreto',
-                    'resolution': 'resolución',
-                    'disposition': 'disposición',
-                    'edict': 'edicto'
-                }
-                tipo = tipo_map.get(tipo, tipo)
-
-                # Extraer título (primer párrafo)
-                title_elem = div.find('p')
-                titulo = title_elem.get_text(
-                    strip=True) if title_elem else f"{tipo.capitalize()} {norm_id}"
-
-                # Extraer fecha (párrafo con clase city-and-date)
-                date_elem = div.find('p', class_='city-and-date')
-                fecha = date_elem.get_text(strip=True) if date_elem else ''
-
-                # Extraer preview (siguiente párrafo después de título)
-                all_p = div.find_all('p', limit=5)
-                preview_parts = [p.get_text(strip=True)
-                                 for p in all_p[2:4] if p.get_text(strip=True)]
-                preview = ' '.join(preview_parts)[
-                    :200] if preview_parts else ''
-
-                normas.append({
-                    'id': norm_id,
-                    'url': url,
-                    'tipo': tipo,
-                    'titulo': titulo,
-                    'fecha': fecha,
-                    'preview': preview
-                })
+            normas, parser_used = self._parse_fast(
+                parse_content_links_lxml, parse_content_links_soup, html, 'parse_content_links')
 
             if normas:
                 console.print(
-                    f"[green]✓ Encontradas {len(normas)} normas con metadatos (BeautifulSoup)[/green]")
+                    f"[green]✓ Encontradas {len(normas)} normas con metadatos ({parser_used})[/green]")
                 return normas
             else:
                 raise ValueError("No se encontraron normas con BeautifulSoup")
@@ -693,7 +697,7 @@ HTML: {html[:200000]}"""
             return []
 
     def parse_final_content(self, html: str) -> str:
-        """Nivel 3: Extrae texto completo del documento usando BeautifulSoup mejorado (sin LLM)"""
+        """Nivel 3: Extrae texto completo del documento (árbol lxml, sin LLM)"""
         console.print(
             "[cyan]📄 Nivel 3: Extrayendo contenido textual...[/cyan]")
 
@@ -706,55 +710,9 @@ HTML: {html[:200000]}"""
         console.print(
             f"[dim]  → HTML recibido: {html_size:,} caracteres[/dim]")
 
-        soup = BeautifulSoup(html, 'lxml')
-
-        # Estrategia 1: Buscar contenedor principal por ID
-        container = soup.find('div', id='frontend-container')
-        strategy_used = "ID #frontend-container"
-
-        if not container:
-            # Estrategia 2: Buscar contenedor por clase que contenga 'content'
-            container = soup.find(
-                'div', class_=lambda x: x and 'content' in str(x).lower())
-            strategy_used = "clase con 'content'"
-
-        if not container:
-            # Estrategia 3: Buscar elementos semánticos main o article
-            container = soup.find('main') or soup.find('article')
-            strategy_used = "elemento <main> o <article>"
-
-        if not container:
-            # Estrategia 4: Usar body pero excluir elementos no deseados
-            body = soup.find('body')
-            if body:
-                # Remover elementos no deseados
-                for unwanted in body.find_all(['script', 'style', 'nav', 'footer', 'header', 'noscript']):
-                    unwanted.decompose()
-                container = body
-                strategy_used = "<body> limpio"
-
-        if not container:
-            raise ValueError(
-                "No se pudo encontrar contenido válido en el HTML con ninguna estrategia")
-
+        text, strategy_used = extract_text(html)
         console.print(f"[dim]  → Estrategia utilizada: {strategy_used}[/dim]")
 
-        # Extracción mejorada de texto: recorrer todos los nodos de texto
-        text_parts = []
-        for element in container.descendants:
-            if isinstance(element, str) and element.strip():
-                text_parts.append(element.strip())
-
-        text = '\n'.join(text_parts)
-
-        # Limpiar múltiples saltos de línea consecutivos
-        text = re.sub(r'\n{3,}', '\n\n', text)
-
-        # Validaciones de calidad
-        if len(text) < 100:
-            raise ValueError(
-                f"Texto extraído demasiado corto ({len(text)} caracteres)")
-
         # Calcular y mostrar métricas
         text_size = len(text)
         ratio = text_size / html_size if html_size > 0 else 0
@@ -797,16 +755,9 @@ HTML: {html[:200000]}"""
         console.print(
             f"[dim]  → HTML recibido: {html_size:,} caracteres[/dim]")
 
-        # Extraer tablas estructuradas
-        text_content, tables = self.table_extractor.extract_tables(html)
-
-        # Validaciones de calidad
-        if len(text_content) < 50:
-            # Fallback al método original si la extracción estructurada falla
-            console.print(
-                f"[yellow]⚠ Extracción estructurada produjo poco texto, usando método tradicional[/yellow]")
-            text_content = self.parse_final_content(html)
-            tables = []
+        # Extraer tablas estructuradas (un solo parseo del HTML, con
+        # fallback al texto plano si la extracción estructurada da poco texto)
+        text_content, tables = extract_content(ParsedDocument(html), self.table_extractor)
 
         # Calcular métricas
         text_size = len(text_content)
@@ -847,89 +798,188 @@ HTML: {html[:200000]}"""
         Returns:
             Dict con norma completa incluyendo contenido, tablas y montos
         """
+        norma_metadata, norm_url, html, error = self._fetch_norm(norma_metadata, base_url)
+        return build_norm((norma_metadata, norm_url, html, error, municipio))
+
+    def _fetch_norm(self, norma_metadata: Dict[str, Any], base_url: str) -> tuple:
+        """
+        Etapa de I/O de una norma: descarga su HTML.
+
+        Returns:
+            (norma_metadata, URL absoluta, HTML o None, error o None)
+        """
         norm_url = norma_metadata['url'] if norma_metadata['url'].startswith(
             'http') else f"{base_url}{norma_metadata['url']}"
-
         try:
-            # Aplicar rate limiting con jitter
-            self._wait_for_rate_limit()
+            # Rate limiting por host en el cliente HTTP
+            return norma_metadata, norm_url, self.fetch_html(norm_url), None
+        except Exception as e:
+            return norma_metadata, norm_url, None, str(e)
 
-            # Fetch HTML de la norma individual
-            norm_html = self.fetch_html(norm_url)
+    def enable_adaptive_parallel(self, initial: int, maximum: int):
+        """
+        Reemplaza el --parallel fijo por un límite AIMD entre 1 y `maximum`
+        que sigue la latencia y los errores de SIBOM.
+        """
+        self.concurrency = AIMDController(initial=initial, maximum=maximum,
+                                          metrics=self.metrics)
+        self.http.concurrency = self.concurrency
+
+    def _parallel_label(self, parallel: int) -> str:
+        if self.concurrency:
+            return (f"adaptativo (inicio {self.concurrency.limit}, "
+                    f"{self.concurrency.minimum}-{self.concurrency.maximum})")
+        return str(parallel)
+
+    def _cpu_executor(self) -> Optional[ProcessPoolExecutor]:
+        """Pool de procesos compartido para parseo/extracción (None si cpu_workers=0)"""
+        if self.cpu_workers < 1:
+            return None
+        with self._cpu_pool_lock:
+            if self._cpu_pool is None:
+                # spawn: hacer fork de un proceso con hilos activos no es seguro
+                self._cpu_pool = ProcessPoolExecutor(
+                    max_workers=self.cpu_workers,
+                    mp_context=multiprocessing.get_context('spawn'))
+            return self._cpu_pool
+
+    def close(self):
+        """Libera el pool de procesos de parseo"""
+        with self._cpu_pool_lock:
+            if self._cpu_pool is not None:
+                self._cpu_pool.shutdown(cancel_futures=True)
+                self._cpu_pool = None
+
+    def _scrape_norms(self, normas_metadata: List[Dict[str, Any]],
+                      completadas: Dict[str, Optional[Dict[str, Any]]],
+                      base_url: str, municipio: str, journal: ProgressJournal,
+                      emit: Callable[[Dict[str, Any]], None]) -> int:
+        """
+        Scrapea las normas pendientes de un boletín con un pipeline por etapas
+        y las entrega a `emit` en el orden original:
 
-            # Extraer contenido estructurado (con tablas)
-            try:
-                structured = self.parse_final_content_structured(norm_html)
-                contenido = structured["text_content"]
-                tablas = structured["tables"]
-            except Exception as e:
-                console.print(
-                    f"[yellow]⚠ Error en extracción estructurada: {e}, usando método tradicional[/yellow]")
-                contenido = self.parse_final_content(norm_html)
-                tablas = []
-
-            # Extraer montos del contenido
-            temp_boletin_data = {
-                'text_content': contenido,
-                'description': municipio,
-                'date': norma_metadata.get('fecha', ''),
-                'link': norm_url
-            }
-            montos = self.monto_extractor.extract_from_boletin(
-                temp_boletin_data)
-            montos_list = [m.to_dict() for m in montos] if montos else []
-
-            # Extraer número de norma del título (ej: "Ordenanza Nº 2319" -> "2319")
-            numero_match = re.search(
-                r'N[º°]\s*(\d+[/-]?\d*)', norma_metadata['titulo'])
-            numero = numero_match.group(
-                1) if numero_match else norma_metadata['id']
-
-            # Construir norma completa
-            norma_completa = {
-                "id": norma_metadata['id'],
-                "tipo": norma_metadata['tipo'],
-                "numero": numero,
-                "titulo": norma_metadata['titulo'],
-                "fecha": norma_metadata['fecha'],
-                "municipio": municipio,
-                "url": norm_url,
-                "contenido": contenido,
-                "tablas": tablas,
-                "montos_extraidos": montos_list,
-                "metadata": {
-                    "longitud_caracteres": len(contenido),
-                    "tiene_tablas": len(tablas) > 0,
-                    "total_tablas": len(tablas),
-                    "total_montos": len(montos_list)
-                }
-            }
+        - fetch: `self.norm_workers` hilos descargan el HTML
+        - process: parseo, tablas y montos (`norm_parser.build_norm_timed`) en el
+          pool de `self.cpu_workers` procesos (en un hilo si es 0)
+        - write: este hilo; registra cada norma en el journal y llama a `emit`
 
-            return norma_completa
+        Las colas entre etapas son acotadas, así que la memoria no depende del
+        tamaño del boletín. Las normas ya completadas en una corrida anterior
+        se toman del journal y se intercalan en su posición.
 
-        except Exception as e:
+        Args:
+            normas_metadata: Normas del boletín en orden de aparición
+            completadas: Normas del journal ({id: norma}, None = sin contenido)
+            journal: Journal de progreso del boletín
+            emit: Recibe cada norma completa, en orden
+
+        Returns:
+            Cantidad de normas emitidas
+        """
+        pendientes = [(i, n) for i, n in enumerate(normas_metadata, 1)
+                      if completadas.get(n['id']) is None]
+        cpu_pool = self._cpu_executor()
+
+        def fetch(item):
+            i, norma_meta = item
             console.print(
-                f"[red]✗ Error scrapeando norma {norma_metadata['id']}: {e}[/red]")
-            # Retornar versión mínima con solo metadatos
-            return {
-                "id": norma_metadata['id'],
-                "tipo": norma_metadata['tipo'],
-                "numero": norma_metadata.get('id', 'unknown'),
-                "titulo": norma_metadata['titulo'],
-                "fecha": norma_metadata['fecha'],
-                "municipio": municipio,
-                "url": norm_url,
-                "contenido": norma_metadata.get('preview', ''),
-                "tablas": [],
-                "montos_extraidos": [],
-                "metadata": {
-                    "error": str(e),
-                    "scraping_failed": True
-                }
-            }
+                f"[dim]  → Norma {i}/{len(normas_metadata)}: {norma_meta['titulo'][:50]}...[/dim]")
+            norma_meta, norm_url, html, error = self._fetch_norm(norma_meta, base_url)
+            return norma_meta, norm_url, html, error, municipio
+
+        pipeline = Pipeline(fetch, build_norm_timed,
+                            fetch_workers=self.norm_workers,
+                            process_pool=cpu_pool,
+                            process_workers=max(1, self.cpu_workers))
+        emitted = 0
+        cached_iter = iter(normas_metadata)
+
+        def emit_cached_until(norma_id: Optional[str]):
+            # Normas del journal anteriores a la próxima norma scrapeada
+            nonlocal emitted
+            for norma_meta in cached_iter:
+                if norma_meta['id'] == norma_id:
+                    return
+                cached = completadas.pop(norma_meta['id'], None)
+                if cached is not None:
+                    console.print(
+                        f"[dim]  ⏭ Norma {norma_meta['id']} ya procesada[/dim]")
+                    emit(cached)
+                    emitted += 1
+
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TaskProgressColumn(),
+            console=console
+        ) as progress:
+            task = progress.add_task(
+                f"[cyan]Procesando {len(pendientes)} normas...",
+                total=len(pendientes)
+            )
+
+            for norma_completa, timings in pipeline.run(pendientes):
+                emit_cached_until(norma_completa['id'])
+                # Etapas medidas en el pool de procesos
+                self.metrics.observe_many(timings)
+                self.metrics.count('norms_processed')
+                if norma_completa['metadata'].get('scraping_failed'):
+                    self.metrics.count('norms_failed')
+                    console.print(
+                        f"[red]✗ Error scrapeando norma {norma_completa['id']}: "
+                        f"{norma_completa['metadata']['error']}[/red]")
+
+                # Checkpoint: una línea por norma en el journal
+                journal.append(norma_completa['id'], norma_completa)
+                progress.update(task, advance=1)
+                with self.metrics.timer('write_norm'):
+                    emit(norma_completa)
+                emitted += 1
+            emit_cached_until(None)
+
+        if pendientes:
+            console.print(f"[dim]    → Pipeline: {pipeline.format_metrics()}[/dim]")
+        return emitted
+
+    def _normativa_from_norma(self, norma: Dict[str, Any], municipio: str,
+                              source_bulletin: str, bulletin_url: str) -> Normativa:
+        """Construye la entrada del índice global de normativas para una norma"""
+        # Extraer año del número o de la fecha
+        year = ''
+        if '/' in norma['numero']:
+            year = norma['numero'].split('/')[-1]
+        elif norma.get('fecha'):
+            parts = norma['fecha'].split('/')
+            if len(parts) == 3:
+                year = parts[2]
+
+        return Normativa(
+            id=norma['id'],
+            municipality=municipio,
+            type=norma['tipo'],
+            number=norma['numero'],
+            year=year,
+            date=norma.get('fecha', ''),
+            title=norma['titulo'],
+            content=norma.get('contenido', ''),
+            source_bulletin=source_bulletin,
+            source_bulletin_url=bulletin_url,
+            norma_url=norma['url'],
+            doc_index=0,  # En V2 no usamos doc_index
+            status='vigente',
+            extracted_at=datetime.now().isoformat()
+        )
 
     def process_bulletin(self, bulletin: Dict, base_url: str, output_dir: Path, skip_existing: bool = False) -> Dict:
         """Procesa un boletín completo (niveles 2 y 3) y guarda archivo individual"""
+        with self.metrics.timer('bulletin'):
+            result = self._process_bulletin(bulletin, base_url, output_dir, skip_existing)
+        self.metrics.count(f"bulletins_{result.get('status', 'unknown')}")
+        return result
+
+    def _process_bulletin(self, bulletin: Dict, base_url: str, output_dir: Path,
+                          skip_existing: bool) -> Dict:
         try:
             # Verificar si el archivo ya existe
             filename = self._sanitize_filename(
@@ -938,7 +988,7 @@ HTML: {html[:200000]}"""
             )
             filepath = output_dir / f"{filename}.json"
 
-            if filepath.exists():
+            if filepath.exists() and not self.replaying:
                 if skip_existing:
                     # Mostrar información del archivo existente
                     stat = filepath.stat()
@@ -1062,132 +1112,59 @@ HTML: {html[:200000]}"""
             # Verificar si hay progreso previo (modo resume)
             bulletin_id = bulletin_url.split(
                 '/bulletins/')[-1].split('?')[0] if '/bulletins/' in bulletin_url else filename
-            progress_data = self._load_progress(bulletin_id, output_dir)
+            journal = ProgressJournal(output_dir, bulletin_id)
+            # En replay se re-extrae todo: el journal puede venir de otros extractores
+            completadas = {} if self.replaying else journal.load()
 
-            if progress_data:
-                normas_procesadas_ids = set(
-                    progress_data.get('normas_procesadas', []))
+            if completadas:
                 console.print(
-                    f"[cyan]🔄 Resumiendo scraping: {len(normas_procesadas_ids)} normas ya procesadas[/cyan]")
-            else:
-                normas_procesadas_ids = set()
-
-            # Nivel 3: Scrapear cada norma individual
-            normas_completas = []
-            normas_pendientes = [
-                n['id'] for n in normas_metadata if n['id'] not in normas_procesadas_ids]
-
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                BarColumn(),
-                TaskProgressColumn(),
-                console=console
-            ) as progress:
-                task = progress.add_task(
-                    f"[cyan]Procesando {len(normas_pendientes)} normas...",
-                    total=len(normas_pendientes)
-                )
-
-                for i, norma_meta in enumerate(normas_metadata, 1):
-                    # Si ya fue procesada, saltarla
-                    if norma_meta['id'] in normas_procesadas_ids:
-                        console.print(
-                            f"[dim]  ⏭ Norma {norma_meta['id']} ya procesada[/dim]")
-                        continue
+                    f"[cyan]🔄 Resumiendo scraping: {len(completadas)} normas ya procesadas[/cyan]")
 
-                    console.print(
-                        f"[dim]  → Norma {i}/{len(normas_metadata)}: {norma_meta['titulo'][:50]}...[/dim]")
-
-                    # Scrapear norma individual
-                    norma_completa = self._scrape_individual_norm(
-                        norma_meta, base_url, municipio)
-                    normas_completas.append(norma_completa)
-
-                    # Actualizar progreso
-                    normas_procesadas_ids.add(norma_meta['id'])
-                    normas_pendientes.remove(norma_meta['id'])
-                    self._save_progress(
-                        bulletin_id,
-                        output_dir,
-                        list(normas_procesadas_ids),
-                        normas_pendientes
-                    )
-
-                    progress.update(task, advance=1)
-
-            # Construir resultado con nuevo formato de normas individuales
-            result = {
+            # Archivo individual, escrito en streaming a medida que llegan las normas
+            filename = self._sanitize_filename(
+                bulletin.get('description', bulletin['number']))
+            filepath = output_dir / f"{filename}.json"
+            writer = BulletinWriter(filepath, {
                 "municipio": municipio,
                 "numero_boletin": bulletin.get('number', 'N/A'),
                 "fecha_boletin": bulletin.get('date', 'N/A'),
                 "boletin_url": bulletin_url,
                 "status": "completed",
-                "total_normas": len(normas_completas),
-                "normas": normas_completas,
-                "metadata_boletin": {
-                    "total_caracteres": sum(n['metadata'].get('longitud_caracteres', 0) for n in normas_completas),
-                    "total_tablas": sum(n['metadata'].get('total_tablas', 0) for n in normas_completas),
-                    "total_montos": sum(n['metadata'].get('total_montos', 0) for n in normas_completas),
-                    "fecha_scraping": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
-                    "version_scraper": "2.0"
-                }
-            }
-
-            # Guardar archivo individual
-            filename = self._sanitize_filename(
-                bulletin.get('description', bulletin['number']))
-            filepath = output_dir / f"{filename}.json"
-
-            with filepath.open('w', encoding='utf-8') as f:
-                json.dump(result, f, indent=2, ensure_ascii=False)
+            })
+            total_montos_agregados = 0
 
-            # Limpiar archivo de progreso (boletín completado)
-            self._clean_progress(bulletin_id, output_dir)
+            def emit(norma: Dict[str, Any]):
+                nonlocal total_montos_agregados
+                writer.write(norma)
 
-            # Agregar montos al índice global (ya fueron extraídos por norma individual)
-            total_montos_agregados = 0
-            for norma in normas_completas:
+                # Agregar montos y normativa a los índices globales
                 montos_norma = norma.get('montos_extraidos', [])
-                if montos_norma:
-                    self.montos_acumulados.extend(montos_norma)
-                    total_montos_agregados += len(montos_norma)
+                for monto in montos_norma:
+                    self.index_spool.montos.append(monto)
+                total_montos_agregados += len(montos_norma)
+                self.index_spool.normativas.append(self._normativa_from_norma(
+                    norma, municipio, filename, bulletin_url).to_dict())
+
+            # Nivel 3: Scrapear normas individuales (en paralelo, orden original)
+            try:
+                self._scrape_norms(normas_metadata, completadas, base_url,
+                                   municipio, journal, emit)
+                result = writer.finalize()
+            except BaseException:
+                writer.abort()
+                raise
+            finally:
+                journal.close()
+
+            # Limpiar journal de progreso (boletín completado)
+            journal.remove()
 
             if total_montos_agregados > 0:
                 console.print(
                     f"[dim]    → {total_montos_agregados} montos agregados al índice global[/dim]")
 
-            # Agregar normativas al índice global
-            for norma in normas_completas:
-                # Extraer año del número o de la fecha
-                year = ''
-                if '/' in norma['numero']:
-                    year = norma['numero'].split('/')[-1]
-                elif norma.get('fecha'):
-                    parts = norma['fecha'].split('/')
-                    if len(parts) == 3:
-                        year = parts[2]
-
-                normativa_obj = Normativa(
-                    id=norma['id'],
-                    municipality=municipio,
-                    type=norma['tipo'],
-                    number=norma['numero'],
-                    year=year,
-                    date=norma.get('fecha', ''),
-                    title=norma['titulo'],
-                    content=norma.get('contenido', ''),
-                    source_bulletin=filename,
-                    source_bulletin_url=bulletin_url,
-                    norma_url=norma['url'],
-                    doc_index=0,  # En V2 no usamos doc_index
-                    status='vigente',
-                    extracted_at=datetime.now().isoformat()
-                )
-                self.normativas_acumuladas.append(normativa_obj)
-
             console.print(
-                f"[dim]    → {len(normas_completas)} normativas agregadas al índice global[/dim]")
+                f"[dim]    → {result['total_normas']} normativas agregadas al índice global[/dim]")
 
             # Actualizar índice markdown (adaptar para nuevo formato)
             index_data = {
@@ -1199,15 +1176,9 @@ HTML: {html[:200000]}"""
             }
             self._update_index_md(index_data, output_dir, base_url)
 
-            # Contar tipos de normas
-            tipos_count = {}
-            for norma in normas_completas:
-                tipo = norma.get('tipo', 'desconocido')
-                tipos_count[tipo] = tipos_count.get(tipo, 0) + 1
-
             # Construir string de tipos de normas
             tipos_str = "\n".join(
-                [f"  • {tipo.capitalize()}: {count}" for tipo, count in sorted(tipos_count.items())])
+                [f"  • {tipo.capitalize()}: {count}" for tipo, count in sorted(writer.tipos_count.items())])
 
             # Panel de resumen del boletín procesado
             console.print("\n")
@@ -1219,7 +1190,7 @@ HTML: {html[:200000]}"""
                 f"URL: {bulletin_url}\n"
                 f"\n"
                 f"[cyan]📊 Estadísticas:[/cyan]\n"
-                f"  • Total normas: {len(normas_completas)}\n"
+                f"  • Total normas: {result['total_normas']}\n"
                 f"{tipos_str}\n"
                 f"  • Tablas: {result['metadata_boletin']['total_tablas']}\n"
                 f"  • Montos: {result['metadata_boletin']['total_montos']}\n"
@@ -1244,7 +1215,8 @@ HTML: {html[:200000]}"""
 
             return error_result
 
-    def scrape(self, target_url: str, limit: Optional[int] = None, parallel: int = 1, skip_existing: bool = False) -> List[Dict]:
+    def scrape(self, target_url: str, limit: Optional[int] = None, parallel: int = 1,
+               skip_existing: bool = False, listing_workers: int = 4) -> List[Dict]:
         """
         Scraping principal
 
@@ -1252,6 +1224,7 @@ HTML: {html[:200000]}"""
             target_url: URL de la página de listado O de un boletín individual
             limit: Número máximo de boletines a procesar (None = todos)
             parallel: Número de boletines a procesar en paralelo
+            listing_workers: Páginas de listado descargadas en paralelo
         """
         # Detectar si es URL de boletín individual o listado de ciudad
         is_bulletin_url = '/bulletins/' in target_url
@@ -1262,7 +1235,7 @@ HTML: {html[:200000]}"""
             f"URL: {target_url}\n"
             f"Modelo: {self.model}\n"
             f"Límite: {limit or 'sin límite'}\n"
-            f"Paralelismo: {parallel}",
+            f"Paralelismo: {self._parallel_label(parallel)}",
             title="🚀 Iniciando"
         ))
 
@@ -1279,28 +1252,7 @@ HTML: {html[:200000]}"""
 
             # Obtener metadatos reales del boletín
             try:
-                bulletin_html = self.fetch_html(target_url)
-
-                # Extraer metadatos del HTML usando LLM
-                metadata_prompt = f"""Extrae los metadatos de este boletín oficial.
-Busca el número del boletín (ej: "105º", "Boletín 98º"), la fecha de publicación, y una descripción breve.
-Devuelve SOLO un JSON válido con el formato: {{"number": string, "date": string, "description": string}}
-
-HTML: {bulletin_html[:50000]}"""
-
-                response = self._make_llm_call(
-                    metadata_prompt, use_json_mode=True)
-                cleaned = self._extract_json(response)
-                metadata = json.loads(cleaned)
-
-                # Crear objeto bulletin con metadatos reales
-                bulletins = [{
-                    "number": metadata.get("number", f"#{bulletin_id}"),
-                    "date": metadata.get("date", "N/A"),
-                    "description": metadata.get("description", f"Boletín {bulletin_id}"),
-                    "link": f"/bulletins/{bulletin_id}"
-                }]
-
+                bulletins = [self.fetch_bulletin_metadata(target_url, bulletin_id)]
                 console.print(
                     f"[green]✓ Boletín: {bulletins[0]['number']} - {bulletins[0]['description']}[/green]")
 
@@ -1317,6 +1269,8 @@ HTML: {bulletin_html[:50000]}"""
                     "description": f"Boletín {bulletin_id}",
                     "link": f"/bulletins/{bulletin_id}"
                 }]
+            listing_pages = iter([(1, target_url, bulletins)])
+            total_pages = 1
         else:
             # Modo listado con detección automática de paginación
             console.print("\n[bold]═══ NIVEL 1: LISTADO ═══[/bold]")
@@ -1330,6 +1284,8 @@ HTML: {bulletin_html[:50000]}"""
                     "[cyan]🎯 Modo: Página única (parámetro ?page= detectado)[/cyan]")
                 list_html = self.fetch_html(target_url)
                 bulletins = self.parse_listing_page(list_html, target_url)
+                listing_pages = iter([(1, target_url, bulletins)])
+                total_pages = 1
             else:
                 # Modo automático: detectar y procesar todas las páginas
                 console.print(
@@ -1339,91 +1295,230 @@ HTML: {bulletin_html[:50000]}"""
                 list_html = self.fetch_html(target_url)
                 total_pages = self.detect_total_pages(list_html)
 
-                # Extraer boletines de la primera página
+                # Extraer boletines de la primera página; las páginas 2..N se
+                # descargan en segundo plano mientras se procesan los boletines
                 bulletins = self.parse_listing_page(list_html, target_url)
-                console.print(
-                    f"[dim]  Página 1/{total_pages}: {len(bulletins)} boletines[/dim]")
+                base_url_parsed = target_url.split('?')[0]
+                listing_pages = self._iter_listing_pages(
+                    base_url_parsed, range(2, total_pages + 1), listing_workers,
+                    first_page=(1, target_url, bulletins))
 
-                # Procesar páginas restantes
-                if total_pages > 1:
-                    # Construir URL base (remover cualquier parámetro existente)
-                    base_url_parsed = target_url.split('?')[0]
+        # Crear carpeta de salida
+        output_dir = Path("boletines")
+        output_dir.mkdir(exist_ok=True)
+        console.print(
+            f"[cyan]📁 Carpeta de salida: {output_dir.absolute()}[/cyan]")
 
-                    for page_num in range(2, total_pages + 1):
-                        try:
-                            page_url = f"{base_url_parsed}?page={page_num}"
-                            console.print(
-                                f"[cyan]📄 Página {page_num}/{total_pages}...[/cyan]")
+        # Procesar boletines a medida que llegan las páginas del listado
+        console.print(
+            f"\n[bold]═══ NIVELES 2 y 3: PROCESANDO BOLETINES ═══[/bold]")
 
-                            page_html = self.fetch_html(page_url)
-                            page_bulletins = self.parse_listing_page(
-                                page_html, page_url)
+        base_url = "https://sibom.slyt.gba.gob.ar"
+        futures = []
 
-                            bulletins.extend(page_bulletins)
-                            console.print(
-                                f"[dim]  Página {page_num}/{total_pages}: {len(page_bulletins)} boletines (total acumulado: {len(bulletins)})[/dim]")
-                        except Exception as e:
-                            console.print(
-                                f"[red]✗ Error en página {page_num}: {e}[/red]")
-                            console.print(
-                                f"[yellow]⚠ Continuando con las páginas restantes...[/yellow]")
-                            continue
+        def process(bulletin: Dict) -> Dict:
+            if self.concurrency:
+                with self.concurrency.slot():
+                    return self.process_bulletin(bulletin, base_url, output_dir, skip_existing)
+            return self.process_bulletin(bulletin, base_url, output_dir, skip_existing)
+
+        workers = self.concurrency.maximum if self.concurrency else max(1, parallel)
+        with ThreadPoolExecutor(max_workers=workers) as executor, Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TaskProgressColumn(),
+            console=console
+        ) as progress:
+            task = progress.add_task(f"[cyan]Procesando...", total=None)
+
+            try:
+                for page_num, page_url, page_bulletins in listing_pages:
+                    if isinstance(page_bulletins, Exception):
+                        console.print(
+                            f"[red]✗ Error en página {page_num}: {page_bulletins}[/red]")
+                        console.print(
+                            f"[yellow]⚠ Continuando con las páginas restantes...[/yellow]")
+                        continue
+
+                    if self.bulletin_shard:
+                        page_bulletins = filter_shard(
+                            page_bulletins, self.bulletin_shard, key=lambda b: b['link'])
+
+                    if limit:
+                        page_bulletins = page_bulletins[:limit - len(futures)]
+
+                    for bulletin in page_bulletins:
+                        future = executor.submit(process, bulletin)
+                        future.add_done_callback(
+                            lambda _: progress.update(task, advance=1))
+                        futures.append(future)
+                    progress.update(task, total=len(futures))
 
                     console.print(
-                        f"\n[bold green]✓ Total: {len(bulletins)} boletines de {total_pages} páginas[/bold green]")
+                        f"[dim]  Página {page_num}/{total_pages}: {len(page_bulletins)} boletines (total acumulado: {len(futures)})[/dim]")
+
+                    if limit and len(futures) >= limit:
+                        console.print(
+                            f"[yellow]⚙ Límite alcanzado: {limit} boletines (no se leen más páginas)[/yellow]")
+                        break
+            finally:
+                # Cancelar descargas de listado pendientes si se cortó antes
+                close = getattr(listing_pages, 'close', None)
+                if close:
+                    close()
+
+            if total_pages > 1:
+                console.print(
+                    f"\n[bold green]✓ Total: {len(futures)} boletines encolados[/bold green]")
+
+            # Resultados en el orden del listado
+            results = [future.result() for future in futures]
+
+        # Generar boletines.md una sola vez, al final de la corrida
+        self.render_status_indexes()
 
-        # Aplicar límite DESPUÉS de recolectar todos los boletines
+        return results
+
+    def replay(self, archive: HTMLArchive, city_ids: Optional[List[int]] = None,
+               limit: Optional[int] = None, parallel: int = 1) -> List[Dict]:
+        """
+        Re-ejecuta los niveles 2 y 3 sobre el archivo de HTML, sin red.
+
+        Los boletines salen de las páginas de listado archivadas (nivel 1 sin
+        LLM); boletines y normas se leen del archivo y las normas se parsean
+        en el pool de procesos (`cpu_workers`). Los JSON existentes se
+        sobreescriben con el resultado de los extractores actuales.
+
+        Args:
+            archive: Archivo de HTML crudo
+            city_ids: Solo boletines de estas ciudades (None = todas)
+            limit: Número máximo de boletines a procesar
+            parallel: Boletines procesados en paralelo
+        """
+        self.http = ReplayClient(archive)
+        self.replaying = True
+
+        bulletins = self._archived_bulletins(archive, city_ids)
         if limit:
-            original_count = len(bulletins)
             bulletins = bulletins[:limit]
-            console.print(
-                f"[yellow]⚙ Limitando de {original_count} a {limit} boletines[/yellow]")
 
-        # Crear carpeta de salida
+        stats = archive.summary()
+        console.print(Panel.fit(
+            f"[bold cyan]SIBOM Scraper[/bold cyan]\n"
+            f"Modo: ♻️ Replay (sin red)\n"
+            f"Archivo: {archive.root} ({stats['pages']:,} páginas, "
+            f"{stats['stored_bytes'] / (1024 * 1024):.1f} MB)\n"
+            f"Boletines: {len(bulletins)}\n"
+            f"Paralelismo: {parallel} boletines, {self.cpu_workers} procesos de parseo",
+            title="🚀 Iniciando"
+        ))
+
         output_dir = Path("boletines")
         output_dir.mkdir(exist_ok=True)
-        console.print(
-            f"[cyan]📁 Carpeta de salida: {output_dir.absolute()}[/cyan]")
 
-        # Procesar boletines
-        console.print(
-            f"\n[bold]═══ NIVELES 2 y 3: PROCESANDO {len(bulletins)} BOLETINES ═══[/bold]")
+        with ThreadPoolExecutor(max_workers=max(1, parallel)) as executor, Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TaskProgressColumn(),
+            console=console
+        ) as progress:
+            task = progress.add_task("[cyan]Re-extrayendo...", total=len(bulletins))
+            futures = []
+            for bulletin, base_url in bulletins:
+                future = executor.submit(self.process_bulletin, bulletin, base_url, output_dir)
+                future.add_done_callback(lambda _: progress.update(task, advance=1))
+                futures.append(future)
+            results = [future.result() for future in futures]
+
+        self.render_status_indexes()
+        return results
 
-        base_url = "https://sibom.slyt.gba.gob.ar"
-        results = []
-
-        if parallel > 1:
-            # Procesamiento paralelo
-            with ThreadPoolExecutor(max_workers=parallel) as executor:
-                futures = {executor.submit(
-                    self.process_bulletin, b, base_url, output_dir, skip_existing): b for b in bulletins}
-
-                with Progress(
-                    SpinnerColumn(),
-                    TextColumn("[progress.description]{task.description}"),
-                    BarColumn(),
-                    TaskProgressColumn(),
-                    console=console
-                ) as progress:
-                    task = progress.add_task(
-                        f"[cyan]Procesando...", total=len(bulletins))
-
-                    for future in as_completed(futures):
-                        result = future.result()
-                        results.append(result)
-                        progress.update(task, advance=1)
-        else:
-            # Procesamiento secuencial
-            for i, bulletin in enumerate(bulletins, 1):
-                console.print(
-                    f"\n[dim]→ Procesando {i}/{len(bulletins)}: {bulletin['number']}[/dim]")
-                result = self.process_bulletin(
-                    bulletin, base_url, output_dir, skip_existing)
-                results.append(result)
-                console.print(
-                    f"[dim]→ Resultado agregado. Total acumulado: {len(results)}[/dim]")
+    def _archived_bulletins(self, archive: HTMLArchive,
+                            city_ids: Optional[List[int]] = None) -> List[tuple]:
+        """
+        Boletines de los listados archivados cuya página también está archivada.
 
-        return results
+        Returns:
+            Lista de (boletín, base_url) sin duplicados, en orden de archivo
+        """
+        wanted = set(city_ids) if city_ids else None
+        seen = set()
+        found = []
+        for listing_url in archive.urls('listing'):
+            match = re.search(r'/cities/(\d+)', listing_url)
+            if wanted is not None and (not match or int(match.group(1)) not in wanted):
+                continue
+            parts = urlsplit(listing_url)
+            base_url = f"{parts.scheme}://{parts.netloc}"
+
+            bulletins, _ = self._parse_fast(
+                parse_listing_lxml, parse_listing_soup, archive.get(listing_url) or '',
+                'parse_listing')
+            if self.bulletin_shard:
+                bulletins = filter_shard(bulletins, self.bulletin_shard, key=lambda b: b['link'])
+            for bulletin in bulletins:
+                link = bulletin['link']
+                url = link if link.startswith('http') else f"{base_url}{link}"
+                if url not in seen and url in archive:
+                    seen.add(url)
+                    found.append((bulletin, base_url))
+        return found
+
+    def _fetch_listing_page(self, page_url: str) -> List[Dict]:
+        """Descarga y parsea una página de listado"""
+        page_html = self.fetch_html(page_url)
+        return self.parse_listing_page(page_html, page_url)
+
+    def _iter_listing_pages(self, list_url: str, page_nums: Iterable[int],
+                            workers: int = 4, first_page: Optional[tuple] = None) -> Iterator[tuple]:
+        """
+        Descarga y parsea páginas de listado concurrentemente con una ventana
+        acotada de `workers` páginas en vuelo, entregándolas en orden de página.
+
+        Si el consumidor deja de iterar, las páginas aún no iniciadas se cancelan.
+
+        Args:
+            list_url: URL del listado sin parámetros
+            page_nums: Números de página a descargar
+            workers: Páginas en vuelo simultáneamente
+            first_page: Página ya parseada a entregar primero (la prefetch arranca antes)
+
+        Yields:
+            (page_num, page_url, boletines) - boletines es la excepción si la página falló
+        """
+        page_iter = iter(page_nums)
+        pending = deque()
+
+        with ThreadPoolExecutor(max_workers=max(1, workers),
+                                thread_name_prefix='listing') as executor:
+
+            def submit_next():
+                page_num = next(page_iter, None)
+                if page_num is not None:
+                    page_url = f"{list_url}?page={page_num}"
+                    pending.append((page_num, page_url,
+                                    executor.submit(self._fetch_listing_page, page_url)))
+
+            try:
+                for _ in range(max(1, workers)):
+                    submit_next()
+
+                if first_page is not None:
+                    yield first_page
+
+                while pending:
+                    page_num, page_url, future = pending.popleft()
+                    submit_next()
+                    try:
+                        page_bulletins = future.result()
+                    except Exception as e:
+                        page_bulletins = e
+                    yield page_num, page_url, page_bulletins
+            finally:
+                for _, _, future in pending:
+                    future.cancel()
 
     # ========================================================================
     # MÉTODOS PARA PROCESAMIENTO MÚLTIPLE DE CIUDADES
@@ -1433,6 +1528,10 @@ HTML: {bulletin_html[:50000]}"""
         """
         Genera CITY_MAP.json consultando SIBOM para cada ciudad en el rango.
 
+        Las ciudades se consultan en paralelo sobre el pool de conexiones; el
+        registro guarda además la fecha del último boletín y la cantidad de
+        boletines de cada ciudad (boletines/.city_registry.json).
+
         Args:
             start_id: ID inicial de ciudad
             end_id: ID final de ciudad
@@ -1440,8 +1539,6 @@ HTML: {bulletin_html[:50000]}"""
         Returns:
             Dict con el mapeo de IDs a nombres
         """
-        city_map = {}
-
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -1452,58 +1549,80 @@ HTML: {bulletin_html[:50000]}"""
                 total=end_id - start_id + 1
             )
 
-            base_url = "https://sibom.slyt.gba.gob.ar"
-
-            for city_id in range(start_id, end_id + 1):
-                try:
-                    # Consultar la página de la ciudad
-                    url = f"{base_url}/cities/{city_id}"
-                    response = requests.get(url, headers=self.headers, timeout=10)
-
-                    if response.status_code == 200:
-                        html = response.text
-
-                        # Buscar nombre en el primer boletín
-                        # Formato: <p class="bulletin-title">XXº de [Ciudad]</p>
-                        match = re.search(
-                            r'<p[^>]*class="[^"]*bulletin-title[^"]*"[^>]*>([^<]+)</p>',
-                            html,
-                            re.IGNORECASE
-                        )
-                        if match:
-                            title = match.group(1).strip()
-                            # Formato típico: "105º de Carlos Tejedor"
-                            name_match = re.search(
-                                r'º?\s+de\s+([A-ZÁÉÍÓÚÑ][A-Za-záéíóúñÑ\s]+)',
-                                title
-                            )
-                            if name_match:
-                                name = name_match.group(1).strip()
-                                city_map[str(city_id)] = name
-                                console.print(f"[dim]  {city_id}: {name}[/dim]")
-
-                except Exception:
-                    # Silenciosamente continuar si una ciudad falla
-                    pass
-
+            def on_city(city_id: str, entry: Optional[Dict[str, Any]]):
+                if entry:
+                    console.print(
+                        f"[dim]  {city_id}: {entry['name']} "
+                        f"({entry['bulletin_count']} boletines, último {entry['last_seen']})[/dim]")
                 progress.update(task, advance=1)
 
-        # Guardar el mapa
+            entries = self.city_registry.discover(
+                self.http, range(start_id, end_id + 1), on_city=on_city)
+
+        city_map = {city_id: entry['name'] for city_id, entry in entries.items()}
         if city_map:
-            self.CITY_MAP_FILE.parent.mkdir(parents=True, exist_ok=True)
-            with self.CITY_MAP_FILE.open('w', encoding='utf-8') as f:
-                json.dump(city_map, f, indent=2, ensure_ascii=False)
             console.print(f"[green]✓ CITY_MAP guardado: {len(city_map)} ciudades[/green]")
         else:
             console.print("[yellow]⚠ No se pudo generar CITY_MAP[/yellow]")
 
         return city_map
 
+    def _collect_city_bulletins(self, city_id: int, city_url: str,
+                                incremental: bool = True) -> tuple[List[Dict], int, int]:
+        """
+        Recolecta los boletines del listado de una ciudad.
+
+        En modo incremental descarta los boletines en o por debajo de la
+        watermark de la ciudad y corta la paginación en cuanto una página
+        termina en territorio conocido (el listado va del más nuevo al más viejo).
+
+        Returns:
+            (boletines nuevos, páginas descargadas, páginas totales)
+        """
+        list_html = self.fetch_html(city_url)
+        total_pages = self.detect_total_pages(list_html)
+        watermark = self.watermarks.get(city_id) if incremental else None
+
+        if watermark is None:
+            # Crawl completo: páginas 2..N descargadas concurrentemente, en orden
+            all_bulletins = []
+            first_page = (1, city_url, self.parse_listing_page(list_html, city_url))
+            for page_num, _, bulletins in self._iter_listing_pages(
+                    city_url, range(2, total_pages + 1), self.listing_workers,
+                    first_page=first_page):
+                if isinstance(bulletins, Exception):
+                    raise bulletins
+                all_bulletins.extend(bulletins)
+                console.print(f"[dim]    Página {page_num}/{total_pages}: {len(bulletins)} boletines[/dim]")
+            return all_bulletins, total_pages, total_pages
+
+        console.print(f"[dim]    Watermark: boletín {watermark}[/dim]")
+        new_bulletins = []
+        page_html, page_url = list_html, city_url
+        for page_num in range(1, total_pages + 1):
+            if page_num > 1:
+                page_url = f"{city_url}?page={page_num}"
+                page_html = self.fetch_html(page_url)
+            bulletins = self.parse_listing_page(page_html, page_url)
+            new = [b for b in bulletins if not self.watermarks.is_known(city_id, b)]
+            new_bulletins.extend(new)
+            console.print(
+                f"[dim]    Página {page_num}/{total_pages}: {len(new)}/{len(bulletins)} boletines nuevos[/dim]")
+
+            if not bulletins or not new or self.watermarks.is_known(city_id, bulletins[-1]):
+                if page_num < total_pages:
+                    console.print(
+                        f"[dim]    ⏹ Territorio conocido: se omiten {total_pages - page_num} páginas[/dim]")
+                return new_bulletins, page_num, total_pages
+
+        return new_bulletins, total_pages, total_pages
+
     def scrape_multiple_cities(
         self,
         city_ids: List[int],
         skip_existing: bool = False,
-        parallel: int = 1
+        parallel: int = 1,
+        incremental: bool = True
     ) -> Dict[int, Dict[str, Any]]:
         """
         Scraping masivo de múltiples ciudades con TODAS las páginas.
@@ -1511,7 +1630,8 @@ HTML: {bulletin_html[:50000]}"""
         Args:
             city_ids: Lista de IDs de ciudades a procesar
             skip_existing: Saltar boletines ya procesados
-            parallel: Procesamiento paralelo de boletines dentro de cada ciudad
+            parallel: Boletines procesados en paralelo (pool compartido entre ciudades)
+            incremental: Usar la watermark de cada ciudad para cortar la paginación
 
         Returns:
             Dict con city_id -> {total_boletines, completados, errores, tiempo, nombre}
@@ -1530,7 +1650,7 @@ HTML: {bulletin_html[:50000]}"""
             f"Total ciudades: {len(city_ids)}\n"
             f"Rango: {min(city_ids)} - {max(city_ids)}\n"
             f"Skip existing: {skip_existing}\n"
-            f"Paralelismo: {parallel}",
+            f"Paralelismo: {self._parallel_label(parallel)}",
             title="🚀 Iniciando"
         ))
 
@@ -1538,155 +1658,162 @@ HTML: {bulletin_html[:50000]}"""
         city_map = self._load_city_map()
 
         total_start_time = time.time()
+        stats_lock = threading.Lock()
+        city_meta: Dict[int, Dict[str, Any]] = {}
 
-        for idx, city_id in enumerate(city_ids, 1):
-            city_name = city_map.get(str(city_id), f"Ciudad {city_id}")
-            city_start_time = time.time()
+        def city_done(city_id: int, processed_pairs: List[tuple]):
+            """Cierra una ciudad: watermark, estadísticas y resumen"""
+            meta = city_meta[city_id]
+            city_name = meta["nombre"]
+            city_results = [result for _, result in processed_pairs]
 
-            console.print(f"\n[bold cyan]═══ CIUDAD {idx}/{len(city_ids)}: {city_name} (ID: {city_id}) ═══[/bold cyan]")
-
-            try:
-                # Construir URL de la ciudad
-                city_url = f"{base_url}/cities/{city_id}"
-
-                # Obtener primera página para detectar total de páginas
-                list_html = self.fetch_html(city_url)
-                total_pages = self.detect_total_pages(list_html)
+            # Avanzar watermark de la ciudad (sin superar boletines con error)
+            self.watermarks.advance(city_id, processed_pairs)
 
-                # Recolectar boletines de todas las páginas
-                all_bulletins = []
+            # Contar completados y errores
+            statuses = [r.get('status') for r in city_results]
+            city_elapsed = time.time() - meta["inicio"]
 
-                if total_pages == 1:
-                    # Solo una página
-                    bulletins = self.parse_listing_page(list_html, city_url)
-                    all_bulletins.extend(bulletins)
-                else:
-                    # Múltiples páginas
-                    for page_num in range(1, total_pages + 1):
-                        if page_num == 1:
-                            bulletins = self.parse_listing_page(list_html, city_url)
-                        else:
-                            page_url = f"{city_url}?page={page_num}"
-                            page_html = self.fetch_html(page_url)
-                            bulletins = self.parse_listing_page(page_html, page_url)
-                        all_bulletins.extend(bulletins)
-                        console.print(f"[dim]    Página {page_num}/{total_pages}: {len(bulletins)} boletines[/dim]")
-
-                if not all_bulletins:
-                    console.print(f"[yellow]⚠ No se encontraron boletines para {city_name} (ID: {city_id})[/yellow]")
-                    console.print(f"[dim]🔗 Verificar: {city_url}[/dim]")
-                    city_stats[city_id] = {
-                        "nombre": city_name,
-                        "total_boletines": 0,
-                        "completados": 0,
-                        "errores": 0,
-                        "tiempo": 0
-                    }
-                    continue
-
-                console.print(f"[green]✓ Total boletines a procesar: {len(all_bulletins)}[/green]")
-
-                # Procesar boletines de esta ciudad
-                city_results = []
-                city_errors = 0
-
-                if parallel > 1:
-                    # Procesamiento paralelo
-                    with ThreadPoolExecutor(max_workers=parallel) as executor:
-                        futures = {
-                            executor.submit(
-                                self.process_bulletin,
-                                b,
-                                base_url,
-                                output_dir,
-                                skip_existing
-                            ): b for b in all_bulletins
-                        }
-
-                        with Progress(
-                            SpinnerColumn(),
-                            TextColumn("[progress.description]{task.description}"),
-                            BarColumn(),
-                            TaskProgressColumn(),
-                            console=console
-                        ) as progress:
-                            task = progress.add_task(
-                                f"[cyan]Procesando {city_name}...",
-                                total=len(all_bulletins)
-                            )
-
-                            for future in as_completed(futures):
-                                result = future.result()
-                                city_results.append(result)
-                                if result.get('status') == 'error':
-                                    city_errors += 1
-                                progress.update(task, advance=1)
-                else:
-                    # Procesamiento secuencial
-                    for bulletin in all_bulletins:
-                        result = self.process_bulletin(
-                            bulletin, base_url, output_dir, skip_existing
-                        )
-                        city_results.append(result)
-                        if result.get('status') == 'error':
-                            city_errors += 1
-
-                # Contar completados y errores
-                city_completed = sum(
-                    1 for r in city_results if r.get('status') == 'completed'
-                )
-                city_error_count = sum(
-                    1 for r in city_results if r.get('status') == 'error'
-                )
-                city_no_content = sum(
-                    1 for r in city_results if r.get('status') == 'no_content'
-                )
-                city_skipped = sum(
-                    1 for r in city_results if r.get('status') == 'skipped'
-                )
-
-                city_elapsed = time.time() - city_start_time
-
-                # Guardar estadísticas
+            with stats_lock:
                 city_stats[city_id] = {
                     "nombre": city_name,
-                    "total_boletines": len(all_bulletins),
-                    "completados": city_completed,
-                    "omitidos": city_skipped,
-                    "sin_contenido": city_no_content,
-                    "errores": city_error_count,
+                    "total_boletines": len(city_results),
+                    "completados": statuses.count('completed'),
+                    "omitidos": statuses.count('skipped'),
+                    "sin_contenido": statuses.count('no_content'),
+                    "errores": statuses.count('error'),
+                    "paginas_listado": meta["paginas"],
                     "tiempo": city_elapsed
                 }
+                stats = city_stats[city_id]
 
-                # Resumen de ciudad
-                console.print(Panel.fit(
-                    f"[bold green]✓ {city_name} completada[/bold green]\n"
-                    f"Boletines: {len(all_bulletins)}\n"
-                    f"  Completados: {city_completed}\n"
-                    f"  Omítidos: {city_skipped}\n"
-                    f"  Sin contenido: {city_no_content}\n"
-                    f"  Errores: {city_error_count}\n"
-                    f"Tiempo: {city_elapsed:.1f}s",
-                    title=f"🏙️ {city_name}"
-                ))
+            # Resumen de ciudad
+            console.print(Panel.fit(
+                f"[bold green]✓ {city_name} completada[/bold green]\n"
+                f"Boletines: {stats['total_boletines']}\n"
+                f"  Completados: {stats['completados']}\n"
+                f"  Omítidos: {stats['omitidos']}\n"
+                f"  Sin contenido: {stats['sin_contenido']}\n"
+                f"  Errores: {stats['errores']}\n"
+                f"Páginas de listado: {meta['paginas']}/{meta['paginas_totales']}\n"
+                f"Tiempo: {city_elapsed:.1f}s",
+                title=f"🏙️ {city_name}"
+            ))
 
-            except Exception as e:
-                city_elapsed = time.time() - city_start_time
-                error_msg = str(e)
-                console.print(f"[red]✗ Error procesando {city_name}: {error_msg}[/red]")
+        def city_error(city_id: int, error_msg: str):
+            """Falló el cierre o el progreso de una ciudad: cuenta como ciudad con error"""
+            meta = city_meta.get(city_id, {})
+            city_name = meta.get("nombre", f"Ciudad {city_id}")
+            console.print(f"[red]✗ Error cerrando {city_name}: {error_msg}[/red]")
+            with stats_lock:
                 cities_with_errors.append((city_id, city_name, error_msg))
-                city_stats[city_id] = {
+                # Si city_done no llegó a registrar la ciudad
+                city_stats.setdefault(city_id, {
                     "nombre": city_name,
                     "total_boletines": 0,
                     "completados": 0,
                     "omitidos": 0,
                     "sin_contenido": 0,
                     "errores": 1,
-                    "tiempo": city_elapsed
-                }
+                    "tiempo": time.time() - meta.get("inicio", total_start_time)
+                })
+
+        # Los boletines de todas las ciudades comparten un único pool de workers:
+        # mientras se recolecta el listado de una ciudad se procesan las anteriores
+        scheduler = BulletinScheduler(
+            parallel,
+            lambda city_id, bulletin: self.process_bulletin(
+                bulletin, base_url, output_dir, skip_existing),
+            city_done,
+            concurrency=self.concurrency,
+            on_error=city_error
+        )
+
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TaskProgressColumn(),
+            console=console
+        ) as progress:
+            task = progress.add_task("[cyan]Procesando boletines...", total=0)
+            queued = 0
+            scheduler.on_result = lambda city_id, result: progress.update(task, advance=1)
+            scheduler.start()
+
+            try:
+                for idx, city_id in enumerate(city_ids, 1):
+                    city_name = city_map.get(str(city_id), f"Ciudad {city_id}")
+                    city_start_time = time.time()
+
+                    console.print(f"\n[bold cyan]═══ CIUDAD {idx}/{len(city_ids)}: {city_name} (ID: {city_id}) ═══[/bold cyan]")
+
+                    try:
+                        # Construir URL de la ciudad
+                        city_url = f"{base_url}/cities/{city_id}"
+
+                        # Recolectar boletines (incremental: solo los nuevos)
+                        all_bulletins, pages_fetched, total_pages = self._collect_city_bulletins(
+                            city_id, city_url, incremental)
+                        if self.bulletin_shard:
+                            all_bulletins = filter_shard(
+                                all_bulletins, self.bulletin_shard, key=lambda b: b['link'])
+                    except Exception as e:
+                        city_elapsed = time.time() - city_start_time
+                        error_msg = str(e)
+                        console.print(f"[red]✗ Error procesando {city_name}: {error_msg}[/red]")
+                        with stats_lock:
+                            cities_with_errors.append((city_id, city_name, error_msg))
+                            city_stats[city_id] = {
+                                "nombre": city_name,
+                                "total_boletines": 0,
+                                "completados": 0,
+                                "omitidos": 0,
+                                "sin_contenido": 0,
+                                "errores": 1,
+                                "tiempo": city_elapsed
+                            }
+                        continue
+
+                    if not all_bulletins:
+                        if self.watermarks.get(city_id) is not None and incremental:
+                            console.print(f"[green]✓ {city_name} al día (sin boletines nuevos)[/green]")
+                        else:
+                            console.print(f"[yellow]⚠ No se encontraron boletines para {city_name} (ID: {city_id})[/yellow]")
+                            console.print(f"[dim]🔗 Verificar: {city_url}[/dim]")
+                        with stats_lock:
+                            city_stats[city_id] = {
+                                "nombre": city_name,
+                                "total_boletines": 0,
+                                "completados": 0,
+                                "errores": 0,
+                                "tiempo": 0
+                            }
+                        continue
+
+                    console.print(f"[green]✓ {len(all_bulletins)} boletines de {city_name} encolados[/green]")
+                    city_meta[city_id] = {
+                        "nombre": city_name,
+                        "inicio": city_start_time,
+                        "paginas": pages_fetched,
+                        "paginas_totales": total_pages,
+                    }
+                    queued += len(all_bulletins)
+                    progress.update(task, total=queued)
+                    scheduler.submit_city(city_id, all_bulletins)
+            except KeyboardInterrupt:
+                # No arrancar boletines nuevos; los que están en curso terminan
+                scheduler.cancel()
+                raise
+            finally:
+                # Drenar la cola: termina los boletines ya encolados
+                scheduler.join()
 
         total_elapsed = time.time() - total_start_time
 
+        # Generar boletines.md una sola vez, al final de la corrida
+        self.render_status_indexes()
+
         # Mostrar resumen final
         self.print_multi_city_summary(city_stats, cities_with_errors, total_elapsed)
 
@@ -1763,6 +1890,9 @@ HTML: {bulletin_html[:50000]}"""
             avg_time = total_time / total_completados
             summary_table.add_row("Promedio por boletín", f"{avg_time:.1f}s")
 
+        for label, value in self.cache_summary_rows() + self.metrics_summary_rows():
+            summary_table.add_row(label, value)
+
         console.print("\n")
         console.print(summary_table)
 
@@ -1807,6 +1937,34 @@ def parse_city_ranges(ranges_str: str) -> List[int]:
     return sorted(city_ids)
 
 
+def write_global_indexes(spool: IndexSpool, monto_extractor: MontoExtractor):
+    """
+    Genera montos_index.json y normativas_index*.json leyendo el spool JSONL
+    de la corrida en una sola pasada, y elimina el spool si todo salió bien.
+    """
+    spool.close()
+    montos_file = spool.run_dir / 'montos.jsonl'
+    normativas_file = spool.run_dir / 'normativas.jsonl'
+
+    if montos_file.exists():
+        total = monto_extractor.save_index_from_jsonl(
+            iter_jsonl(montos_file), Path("montos_index.json"))
+        if total:
+            console.print(
+                f"[bold green]✓ Índice de montos guardado: {total:,} registros[/bold green]")
+
+    if normativas_file.exists():
+        total = save_indexes_from_jsonl(
+            iter_jsonl(normativas_file),
+            Path("normativas_index.json"),
+            Path("normativas_index_compact.json"),
+            Path("normativas_index_minimal.json"))
+        console.print(
+            f"[bold green]✓ Índices de normativas (completo, compacto y minimal): {total:,} registros[/bold green]")
+
+    spool.remove()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="SIBOM Scraper - Extrae boletines oficiales",
@@ -1839,6 +1997,77 @@ Ejemplos de uso:
         help='Número de boletines a procesar en paralelo (default: 1)'
     )
 
+    parser.add_argument(
+        '--adaptive-parallel',
+        action='store_true',
+        help='Ajustar los boletines en paralelo según la latencia y los errores de SIBOM (AIMD), empezando en --parallel'
+    )
+
+    parser.add_argument(
+        '--max-parallel',
+        type=int,
+        default=8,
+        help='Tope de boletines en paralelo con --adaptive-parallel (default: 8)'
+    )
+
+    parser.add_argument(
+        '--shard',
+        type=str,
+        default=None,
+        metavar='i/N',
+        help='Procesa solo la parte i de N (partición determinística por CRC32, ej: 2/4)'
+    )
+
+    parser.add_argument(
+        '--shard-by',
+        choices=SHARD_MODES,
+        default='cities',
+        help='Qué se reparte entre shards: ciudades (solo con --cities) o boletines (default: cities)'
+    )
+
+    parser.add_argument(
+        '--merge-shards',
+        nargs='+',
+        default=None,
+        metavar='DIR',
+        help='Solo combina las salidas (índices, status y watermarks) de los directorios de cada shard en el directorio actual'
+    )
+
+    parser.add_argument(
+        '--render-status',
+        action='store_true',
+        help='Solo regenera boletines/boletines.md desde el store de status (boletines/.status.db)'
+    )
+
+    parser.add_argument(
+        '--consolidate-spool',
+        type=str,
+        default=None,
+        metavar='DIR',
+        help='Solo regenera montos_index.json y normativas_index*.json desde el spool de una corrida interrumpida (boletines/.index_spool/<run>)'
+    )
+
+    parser.add_argument(
+        '--norm-workers',
+        type=int,
+        default=4,
+        help='Normas a scrapear en paralelo dentro de cada boletín (default: 4)'
+    )
+
+    parser.add_argument(
+        '--cpu-workers',
+        type=int,
+        default=DEFAULT_CPU_WORKERS,
+        help=f'Procesos para parseo y extracción de normas; 0 = sin pool de procesos (default: {DEFAULT_CPU_WORKERS})'
+    )
+
+    parser.add_argument(
+        '--listing-workers',
+        type=int,
+        default=4,
+        help='Páginas de listado a descargar en paralelo (default: 4)'
+    )
+
     parser.add_argument(
         '--cities',
         type=str,
@@ -1880,10 +2109,147 @@ Ejemplos de uso:
         help='Modelo de OpenRouter a usar (default: google/gemini-3-flash-preview)'
     )
 
+    parser.add_argument(
+        '--sibom-rate',
+        type=float,
+        default=1.0,
+        help='Peticiones por segundo hacia SIBOM (default: 1.0)'
+    )
+
+    parser.add_argument(
+        '--sibom-burst',
+        type=int,
+        default=5,
+        help='Ráfaga máxima de peticiones hacia SIBOM (default: 5)'
+    )
+
+    parser.add_argument(
+        '--llm-rate',
+        type=float,
+        default=0.5,
+        help='Llamadas por segundo al LLM (default: 0.5)'
+    )
+
+    parser.add_argument(
+        '--llm-burst',
+        type=int,
+        default=2,
+        help='Ráfaga máxima de llamadas al LLM (default: 2)'
+    )
+
+    parser.add_argument(
+        '--llm-concurrency',
+        type=int,
+        default=LLMClient.DEFAULT_MAX_CONCURRENCY,
+        help=f'Llamadas al LLM en vuelo como máximo, compartidas por todos los workers (default: {LLMClient.DEFAULT_MAX_CONCURRENCY})'
+    )
+
+    parser.add_argument(
+        '--llm-timeout',
+        type=float,
+        default=LLMClient.DEFAULT_TIMEOUT,
+        help=f'Timeout en segundos de cada llamada al LLM; se reintenta con backoff (default: {LLMClient.DEFAULT_TIMEOUT})'
+    )
+
+    parser.add_argument(
+        '--full-crawl',
+        action='store_true',
+        help='Ignorar las watermarks por ciudad y recorrer todas las páginas de listado'
+    )
+
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Desactivar el caché HTTP en disco (boletines/.http_cache)'
+    )
+
+    parser.add_argument(
+        '--metrics-out',
+        type=str,
+        default='boletines/run_metrics.json',
+        help='Reporte de métricas por etapa; .prom = textfile de Prometheus, otro = JSON (default: boletines/run_metrics.json)'
+    )
+
+    parser.add_argument(
+        '--metrics-interval',
+        type=float,
+        default=0,
+        help='Reescribir el reporte de métricas cada N segundos durante la corrida (default: 0 = solo al final)'
+    )
+
+    parser.add_argument(
+        '--no-llm-cache',
+        action='store_true',
+        help='Desactivar el caché de respuestas del LLM (boletines/.llm_cache.db)'
+    )
+
+    parser.add_argument(
+        '--llm-cache-ttl',
+        type=float,
+        default=LLMCache.DEFAULT_TTL / 86400,
+        help=f'Días de vida de una respuesta cacheada del LLM (default: {LLMCache.DEFAULT_TTL // 86400})'
+    )
+
+    parser.add_argument(
+        '--llm-cache-max-mb',
+        type=int,
+        default=LLMCache.DEFAULT_MAX_BYTES // (1024 * 1024),
+        help=f'Tamaño máximo del caché del LLM; se descartan las menos usadas (default: {LLMCache.DEFAULT_MAX_BYTES // (1024 * 1024)})'
+    )
+
+    parser.add_argument(
+        '--no-archive',
+        action='store_true',
+        help='No guardar el HTML descargado en el archivo (boletines/.html_archive)'
+    )
+
+    parser.add_argument(
+        '--replay',
+        action='store_true',
+        help='Re-extraer boletines y normas desde el archivo de HTML, sin red ni LLM (usa --cities, --limit y --parallel)'
+    )
+
+    parser.add_argument(
+        '--max-connections',
+        type=int,
+        default=HTTPClient.DEFAULT_MAX_CONNECTIONS,
+        help=f'Conexiones HTTP simultáneas hacia SIBOM (default: {HTTPClient.DEFAULT_MAX_CONNECTIONS})'
+    )
+
     args = parser.parse_args()
 
+    # Combinar las salidas de varios shards (no requiere API key)
+    if args.merge_shards:
+        counts = merge_shards([Path(d) for d in args.merge_shards])
+        console.print(
+            f"[bold green]✓ Shards combinados: {counts['montos']:,} montos, "
+            f"{counts['normativas']:,} normativas, {counts['boletines']:,} boletines, "
+            f"{counts['ciudades']} watermarks[/bold green]")
+        return
+
+    try:
+        shard = parse_shard(args.shard) if args.shard else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Regenerar boletines.md a pedido (no requiere API key)
+    if args.render_status:
+        output_dir = Path("boletines")
+        path = BulletinStatusStore(output_dir / ".status.db",
+                                   markdown_path=output_dir / "boletines.md").render_markdown()
+        console.print(f"[bold green]✓ Índice generado: {path}[/bold green]")
+        return
+
+    # Recuperar índices de una corrida que se cortó (no requiere API key)
+    if args.consolidate_spool:
+        write_global_indexes(IndexSpool(Path(args.consolidate_spool)), MontoExtractor())
+        return
+
     # Obtener API key
     api_key = args.api_key or os.getenv('OPENROUTER_API_KEY')
+    if not api_key and args.replay:
+        # El replay no llama al LLM, pero el cliente no acepta una key vacía
+        api_key = 'replay'
     if not api_key:
         console.print(
             "[bold red]Error: No se encontró OPENROUTER_API_KEY[/bold red]")
@@ -1891,13 +2257,64 @@ Ejemplos de uso:
         sys.exit(1)
 
     # Crear scraper y ejecutar
-    scraper = SIBOMScraper(api_key, model=args.model)
+    scraper = SIBOMScraper(api_key, model=args.model,
+                           max_connections=args.max_connections,
+                           sibom_rate=args.sibom_rate,
+                           sibom_burst=args.sibom_burst,
+                           llm_rate=args.llm_rate,
+                           llm_burst=args.llm_burst,
+                           use_cache=not args.no_cache,
+                           norm_workers=args.norm_workers,
+                           cpu_workers=args.cpu_workers,
+                           use_archive=not args.no_archive,
+                           use_llm_cache=not args.no_llm_cache,
+                           llm_concurrency=args.llm_concurrency,
+                           llm_timeout=args.llm_timeout)
+    scraper.listing_workers = args.listing_workers
+    if shard and (args.shard_by == 'bulletins' or not args.cities):
+        scraper.bulletin_shard = shard
+    if scraper.llm_cache:
+        scraper.llm_cache.ttl = args.llm_cache_ttl * 86400
+        scraper.llm_cache.max_bytes = args.llm_cache_max_mb * 1024 * 1024
+    if args.adaptive_parallel and not args.replay:
+        scraper.enable_adaptive_parallel(args.parallel, args.max_parallel)
+    metrics_path = Path(args.metrics_out)
+    scraper.metrics.start_reporting(metrics_path, args.metrics_interval)
 
     try:
         start_time = time.time()
 
+        # Modo replay: re-extraer desde el archivo de HTML
+        if args.replay:
+            archive = scraper.html_archive or HTMLArchive()
+            results = scraper.replay(
+                archive,
+                city_ids=parse_city_ranges(args.cities) if args.cities else None,
+                limit=args.limit, parallel=args.parallel)
+            elapsed = time.time() - start_time
+
+            completed = sum(1 for r in results if r.get('status') == 'completed')
+            errors = sum(1 for r in results if r.get('status') == 'error')
+            stats = archive.summary()
+
+            table = Table(title="♻️ Resumen de Replay")
+            table.add_column("Métrica", style="cyan")
+            table.add_column("Valor", style="green")
+            table.add_row("Boletines re-extraídos", str(len(results)))
+            table.add_row("Completados", str(completed))
+            table.add_row("Errores", str(errors))
+            table.add_row("Tiempo total", f"{elapsed:.1f}s")
+            table.add_row("Páginas archivadas", f"{stats['pages']:,} ({stats['blobs']:,} únicas)")
+            table.add_row("Archivo en disco",
+                          f"{stats['stored_bytes'] / (1024 * 1024):.1f} MB "
+                          f"({stats['raw_bytes'] / (1024 * 1024):.1f} MB sin comprimir)")
+            for label, value in scraper.metrics_summary_rows():
+                table.add_row(label, value)
+            console.print("\n")
+            console.print(table)
+
         # Modo múltiples ciudades vs modo single URL
-        if args.cities:
+        elif args.cities:
             # Parsear rangos de ciudades
             city_ids = parse_city_ranges(args.cities)
 
@@ -1917,18 +2334,29 @@ Ejemplos de uso:
                     f"[dim]    Ciudades después del filtro: {filtered_count}[/dim]")
                 city_ids = [c for c in city_ids if c >= args.start_from]
 
+            # Quedarse con las ciudades de este shard
+            if shard and args.shard_by == 'cities':
+                city_ids = filter_shard(city_ids, shard)
+                console.print(
+                    f"[cyan]🧩 Shard {shard[0]}/{shard[1]}: {len(city_ids)} ciudades[/cyan]")
+                if not city_ids:
+                    console.print("[yellow]⚠ Este shard no tiene ciudades asignadas[/yellow]")
+                    return
+
             # Usar scrape_multiple_cities
             city_stats = scraper.scrape_multiple_cities(
                 city_ids=city_ids,
                 skip_existing=args.skip_existing,
-                parallel=args.parallel
+                parallel=args.parallel,
+                incremental=not args.full_crawl
             )
             # No es necesario guardar resumen consolidado en modo múltiple
             # Los archivos individuales ya se guardaron en process_bulletin
         else:
             # Modo existente con --url (backward compatible)
             results = scraper.scrape(
-                args.url, limit=args.limit, parallel=args.parallel, skip_existing=args.skip_existing)
+                args.url, limit=args.limit, parallel=args.parallel, skip_existing=args.skip_existing,
+                listing_workers=args.listing_workers)
             elapsed = time.time() - start_time
 
             # Guardar resumen consolidado (opcional)
@@ -1952,6 +2380,8 @@ Ejemplos de uso:
             table.add_row("Tiempo total", f"{elapsed:.1f}s")
             table.add_row("Tiempo por boletín",
                           f"{elapsed/len(results):.1f}s" if len(results) > 0 else "N/A")
+            for label, value in scraper.cache_summary_rows() + scraper.metrics_summary_rows():
+                table.add_row(label, value)
             table.add_row("Carpeta boletines", "boletines/")
             table.add_row("Resumen consolidado", str(output_path))
 
@@ -1965,44 +2395,22 @@ Ejemplos de uso:
             # Reproducir sonido de tarea completa
             scraper._play_sound('complete')
 
-        # Guardar índice de montos extraídos (común a ambos modos)
-        if scraper.montos_acumulados:
-            montos_path = Path("montos_index.json")
-            scraper.monto_extractor._save_index(
-                scraper.montos_acumulados, montos_path)
-            console.print(
-                f"[bold green]✓ Índice de montos guardado: {len(scraper.montos_acumulados):,} registros[/bold green]")
-
-        # Guardar índice de normativas extraídas (común a ambos modos)
-        if scraper.normativas_acumuladas:
-            normativas_path = Path("normativas_index.json")
-            normativas_compact_path = Path("normativas_index_compact.json")
-            normativas_minimal_path = Path("normativas_index_minimal.json")
-
-            # Guardar índice completo
-            save_index(scraper.normativas_acumuladas,
-                       normativas_path, compact=False)
-            console.print(
-                f"[bold green]✓ Índice de normativas (completo): {len(scraper.normativas_acumuladas):,} registros[/bold green]")
-
-            # Guardar índice compacto (sin contenido)
-            save_index(scraper.normativas_acumuladas,
-                       normativas_compact_path, compact=True)
-            console.print(
-                f"[bold green]✓ Índice de normativas (compacto): {normativas_compact_path}[/bold green]")
-
-            # Guardar índice minimalista (para frontend)
-            save_minimal_index(scraper.normativas_acumuladas,
-                               normativas_minimal_path)
-            console.print(
-                f"[bold green]✓ Índice de normativas (minimal): {normativas_minimal_path}[/bold green]")
+        # Consolidar índices globales de montos y normativas (común a ambos modos)
+        write_global_indexes(scraper.index_spool, scraper.monto_extractor)
 
     except KeyboardInterrupt:
         console.print("\n[yellow]Proceso interrumpido por el usuario[/yellow]")
+        # Lo extraído hasta acá ya está en disco: consolidarlo igual
+        scraper.render_status_indexes()
+        write_global_indexes(scraper.index_spool, scraper.monto_extractor)
         sys.exit(0)
     except Exception as e:
         console.print(f"\n[bold red]Error fatal: {e}[/bold red]")
         sys.exit(1)
+    finally:
+        scraper.metrics.stop_reporting()
+        console.print(f"[dim]📈 Métricas: {scraper.metrics.write(metrics_path)}[/dim]")
+        scraper.close()
 
 
 if __name__ == '__main__':
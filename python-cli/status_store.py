@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+status_store.py
+
+Estado de los boletines procesados en SQLite (modo WAL).
+Reemplaza la reescritura de boletines.md por cada boletín: los workers hacen
+upserts O(1) indexados por URL y la tabla Markdown se genera una sola vez al
+final de la corrida (o a pedido con --render-status).
+
+Si la base no existe todavía, se importa el boletines.md existente para no
+perder el historial.
+
+@created 2026-10-17
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Formato de status con emoji (mismo que usaba boletines.md)
+STATUS_DISPLAY = {
+    'completed': '✅ Completado',
+    'skipped': '🤖 Creado',
+    'error': '❌ Error',
+    'no_content': '⚠️ Sin contenido',
+    'unknown': '❓ Desconocido'
+}
+_STATUS_FROM_DISPLAY = {v: k for k, v in STATUS_DISPLAY.items()}
+
+MD_HEADER = (
+    "# Boletines Procesados\n\n"
+    "JSON2Markdown Converter = https://memochou1993.github.io/json2markdown-converter/\n\n\n"
+    "| Number | Date | Description | Link | Status |\n"
+    "|--------|------|-------------|------|--------|\n"
+)
+
+# | 105º | 23/12/2025 | 105º de Carlos Tejedor | [url](url) | ✅ Completado |
+MD_ROW_PATTERN = re.compile(
+    r'^\| (.*?) \| (.*?) \| (.*?) \| \[(.*?)\]\(.*?\) \| (.*?) \|\s*$')
+
+
+class BulletinStatusStore:
+    """
+    Tabla de status por boletín, segura entre hilos.
+
+    Cada hilo usa su propia conexión; WAL permite lecturas concurrentes con
+    un escritor y `busy_timeout` serializa los upserts sin errores de lock.
+    """
+
+    def __init__(self, db_path: Path, markdown_path: Optional[Path] = None):
+        """
+        Args:
+            db_path: Archivo SQLite
+            markdown_path: boletines.md a importar si la base es nueva
+        """
+        self.db_path = Path(db_path)
+        self.markdown_path = Path(markdown_path) if markdown_path else None
+        self._local = threading.local()
+
+        is_new = not self.db_path.exists()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS bulletins (
+                key TEXT PRIMARY KEY,
+                number TEXT,
+                date TEXT,
+                description TEXT,
+                url TEXT,
+                status TEXT,
+                updated_at REAL
+            )
+        """)
+        if is_new and self.markdown_path and self.markdown_path.exists():
+            self.import_markdown(self.markdown_path)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _key(number: str, description: str, url: str) -> str:
+        # La URL identifica al boletín; sin URL se usa número + descripción
+        return url if url and url != 'N/A' else f"{number}|{description}"
+
+    def upsert(self, number: str, date: str, description: str, url: str, status: str):
+        """Inserta o actualiza el status de un boletín (conserva su posición)"""
+        self._conn().execute("""
+            INSERT INTO bulletins (key, number, date, description, url, status, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                number = excluded.number,
+                date = excluded.date,
+                description = excluded.description,
+                status = excluded.status,
+                updated_at = excluded.updated_at
+        """, (self._key(number, description, url), number, date, description,
+              url, status, time.time()))
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Status guardado de un boletín por URL"""
+        row = self._conn().execute(
+            "SELECT number, date, description, url, status FROM bulletins WHERE key = ?",
+            (url,)).fetchone()
+        if row is None:
+            return None
+        return dict(zip(('number', 'date', 'description', 'url', 'status'), row))
+
+    def rows(self) -> List[tuple]:
+        """Filas (number, date, description, url, status) en orden de alta"""
+        return self._conn().execute(
+            "SELECT number, date, description, url, status FROM bulletins ORDER BY rowid"
+        ).fetchall()
+
+    def import_markdown(self, markdown_path: Path) -> int:
+        """Importa las filas de un boletines.md existente"""
+        imported = 0
+        conn = self._conn()
+        conn.execute("BEGIN")
+        with Path(markdown_path).open('r', encoding='utf-8') as f:
+            for line in f:
+                match = MD_ROW_PATTERN.match(line)
+                if not match or match.group(1) == 'Number':
+                    continue
+                number, date, description, url, display = match.groups()
+                self.upsert(number, date, description, url,
+                            _STATUS_FROM_DISPLAY.get(display, display))
+                imported += 1
+        conn.execute("COMMIT")
+        return imported
+
+    def render_markdown(self, markdown_path: Optional[Path] = None) -> Path:
+        """Escribe la tabla Markdown completa (atómicamente)"""
+        path = Path(markdown_path or self.markdown_path)
+        tmp_path = path.with_suffix('.md.tmp')
+        with tmp_path.open('w', encoding='utf-8') as f:
+            f.write(MD_HEADER)
+            for number, date, description, url, status in self.rows():
+                display = STATUS_DISPLAY.get(status, status)
+                f.write(f"| {number} | {date} | {description} | [{url}]({url}) | {display} |\n")
+        os.replace(tmp_path, path)
+        return path
@@ -106,12 +106,15 @@ class TableExtractor:
     # MÉTODO PRINCIPAL
     # ========================================================================
     
-    def extract_tables(self, html: str) -> Tuple[str, List[StructuredTable]]:
+    def extract_tables(self, html: str,
+                       soup: Optional[BeautifulSoup] = None) -> Tuple[str, List[StructuredTable]]:
         """
         Extrae tablas del HTML y retorna texto con placeholders + tablas estructuradas.
         
         Args:
             html: Contenido HTML a procesar
+            soup: Árbol ya parseado de `html` (evita volver a parsearlo);
+                  se modifica: las tablas quedan reemplazadas por placeholders
             
         Returns:
             Tuple[str, List[StructuredTable]]: 
@@ -124,7 +127,8 @@ class TableExtractor:
         tables: List[StructuredTable] = []
         
         try:
-            soup = BeautifulSoup(html, 'lxml')
+            if soup is None:
+                soup = BeautifulSoup(html, 'lxml')
             table_elements = self._detect_tables(soup)
             
             if not table_elements:
@@ -151,7 +155,8 @@ class TableExtractor:
             return text_content, tables
             
         except Exception as e:
-            # Fallback: retornar texto plano sin tablas
+            # Fallback: retornar texto plano sin tablas. Se vuelve a parsear:
+            # el árbol recibido puede tener tablas ya reemplazadas por placeholders
             try:
                 soup = BeautifulSoup(html, 'lxml')
                 text_content = self._extract_text_content(soup)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Corpus de benchmark armado con boletines reales de SIBOM.
+
+Los JSON de `boletines/city_23` (Carmen de Areco, 262 normas) son la fuente.
+Para cada norma se usa el HTML grabado en el archivo de HTML
+(`boletines/.html_archive`, ver html_archive.py) si está; si no, se
+reconstruye la página con el layout de SIBOM a partir del texto guardado:
+encabezado, `#frontend-container` con un párrafo por línea y pie.
+
+Las normas de ese corpus no tienen tablas, así que a las que tienen montos
+se les agrega una tabla concepto/importe con esos montos: es el camino que
+recorren TableExtractor y el parseo estructurado.
+"""
+
+import html
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+CORPUS_DIR = Path(__file__).resolve().parents[2] / 'boletines' / 'city_23'
+
+# Primera línea del pie de página de SIBOM en el texto extraído
+FOOTER_START = 'Redes Sociales'
+
+
+@dataclass
+class Corpus:
+    """Boletines y páginas de normas del benchmark"""
+    directory: Path
+    bulletins: List[Dict[str, Any]] = field(default_factory=list)
+    norms: List[Dict[str, Any]] = field(default_factory=list)
+    pages: List[str] = field(default_factory=list)
+    recorded_pages: int = 0
+
+    @property
+    def table_pages(self) -> List[str]:
+        return [page for page in self.pages if '<table' in page]
+
+    def largest_norms(self, count: int = 20) -> List[Dict[str, Any]]:
+        """Las `count` normas con más texto (el peor caso de la extracción)"""
+        return sorted(self.norms, key=lambda norma: len(norma['contenido']), reverse=True)[:count]
+
+
+def _format_amount(value: float) -> str:
+    # 793617.0 -> "$ 793.617,00" (formato de los boletines)
+    integer, decimals = f"{value:,.2f}".split('.')
+    return f"$ {integer.replace(',', '.')},{decimals}"
+
+
+def _amount_table(montos: List[Dict[str, Any]]) -> str:
+    rows = ''.join(
+        f"<tr><td>{html.escape(m.get('concepto', '')[:120])}</td>"
+        f"<td>{_format_amount(m.get('monto', 0.0))}</td></tr>"
+        for m in montos)
+    return (f"<table><tr><th>Concepto</th><th>Importe</th></tr>{rows}"
+            f"<tr><td>Total</td><td>{_format_amount(sum(m.get('monto', 0.0) for m in montos))}"
+            f"</td></tr></table>")
+
+
+def norm_page(norma: Dict[str, Any], municipio: str) -> str:
+    """Página de la norma con el layout de SIBOM, a partir de su texto"""
+    lines = norma.get('contenido', '').split('\n')
+    marker = f"Boletines/{municipio}"
+    start = lines.index(marker) + 1 if marker in lines else 0
+    end = lines.index(FOOTER_START) if FOOTER_START in lines else len(lines)
+
+    header = ''.join(f"<li><a href='#'>{html.escape(line)}</a></li>" for line in lines[:start])
+    body = ''.join(f"<p>{html.escape(line)}</p>" for line in lines[start:end])
+    footer = ''.join(f"<li>{html.escape(line)}</li>" for line in lines[end:])
+    if norma.get('montos_extraidos'):
+        body += _amount_table(norma['montos_extraidos'])
+
+    return (f"<html><head><title>{html.escape(norma.get('titulo', ''))}</title>"
+            f"<script src='/assets/application.js'></script></head><body>"
+            f"<nav class='navbar'><ul>{header}</ul></nav>"
+            f"<div class='container'><div id='frontend-container'>{body}</div></div>"
+            f"<footer><ul>{footer}</ul></footer></body></html>")
+
+
+def load_corpus(directory: Path = CORPUS_DIR, archive=None) -> Corpus:
+    """
+    Carga los boletines de `directory` y una página HTML por norma.
+
+    Args:
+        archive: HTMLArchive con páginas grabadas (se prefieren a las reconstruidas)
+    """
+    corpus = Corpus(Path(directory))
+    for path in sorted(corpus.directory.glob('*.json')):
+        bulletin = json.loads(path.read_text(encoding='utf-8'))
+        if not isinstance(bulletin, dict) or 'normas' not in bulletin:
+            continue
+        corpus.bulletins.append(bulletin)
+        for norma in bulletin['normas']:
+            recorded: Optional[str] = archive.get(norma['url']) if archive else None
+            corpus.recorded_pages += recorded is not None
+            corpus.norms.append(norma)
+            corpus.pages.append(recorded or norm_page(norma, bulletin.get('municipio', '')))
+    return corpus
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+run_benchmarks.py
+
+Benchmarks de los caminos calientes de extracción sobre el corpus de
+boletines reales (ver corpus.py): normas/segundo y memoria pico de cada
+etapa, comparados contra una baseline guardada en baseline.json.
+
+Casos:
+- parse_final_content / parse_final_content_structured (SIBOMScraper)
+- TableExtractor.extract_tables (solo normas con tabla)
+- MontoExtractor.extract_from_boletin (todas las normas y las más largas)
+- detect_normativa_type
+- build_database (scripts/build_database.py, SQLite temporal)
+
+Una etapa es una regresión si su throughput cae más que el umbral o su
+memoria pico crece más que el umbral (y más de MEMORY_FLOOR_KB).
+
+Además se mide el escalado de MontoExtractor: el costo por KB con
+documentos de 1x a 16x (las normas más largas concatenadas, un texto con
+muchos "PESOS" sin monto válido, el peor caso del patrón con prefijo lazy, y
+una norma con un monto por artículo) no puede crecer más de
+SCALING_TOLERANCE veces.
+
+Uso:
+    python tests/benchmarks/run_benchmarks.py
+    python tests/benchmarks/run_benchmarks.py --threshold 0.2
+    python tests/benchmarks/run_benchmarks.py --update-baseline
+    python tests/benchmarks/run_benchmarks.py --archive boletines/.html_archive
+    python tests/benchmarks/run_benchmarks.py --skip-scaling
+
+Sale con código 1 si hay regresiones (para correrlo antes de un crawl).
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+BENCH_DIR = Path(__file__).resolve().parent
+CLI_DIR = BENCH_DIR.parents[1]
+sys.path.insert(0, str(CLI_DIR))
+sys.path.insert(0, str(CLI_DIR / 'scripts'))
+sys.path.insert(0, str(BENCH_DIR))
+
+from rich.console import Console
+from rich.table import Table
+
+from corpus import Corpus, load_corpus
+
+console = Console()
+
+BASELINE_PATH = BENCH_DIR / 'baseline.json'
+DEFAULT_THRESHOLD = 0.30
+# Diferencias de memoria menores a esto son ruido del intérprete
+MEMORY_FLOOR_KB = 256
+# Tamaños (múltiplos del documento base) del chequeo de escalado lineal
+SCALING_FACTORS = (1, 2, 4, 8, 16)
+# Crecimiento máximo del costo por KB entre el tamaño menor y el mayor
+SCALING_TOLERANCE = 2.0
+
+
+@dataclass
+class BenchmarkCase:
+    """Función medida y los documentos que procesa en cada ronda"""
+    name: str
+    run: Callable[[], Any]
+    docs: int
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    docs: int
+    seconds: float
+    docs_per_sec: float
+    peak_kb: float
+
+
+@dataclass
+class ScalingPoint:
+    """Tiempo de un documento de `factor` veces el tamaño base"""
+    name: str
+    factor: int
+    kb: float
+    seconds: float
+
+    @property
+    def us_per_kb(self) -> float:
+        return self.seconds * 1e6 / self.kb if self.kb else 0.0
+
+
+def monto_inputs_for(norms: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Normas del corpus con la forma que espera MontoExtractor.extract_from_boletin"""
+    return [{
+        'text_content': norma['contenido'],
+        'description': norma.get('municipio', ''),
+        'date': norma.get('fecha', ''),
+        'link': norma.get('url', ''),
+    } for norma in norms]
+
+
+def build_cases(corpus: Corpus, workdir: Path) -> List[BenchmarkCase]:
+    """Casos del benchmark sobre el corpus (salida de consola silenciada)"""
+    import build_database as build_database_module
+    import sibom_scraper
+    from monto_extractor import MontoExtractor
+    from normativas_extractor import detect_normativa_type
+    from table_extractor import TableExtractor
+
+    # Los métodos del scraper y build_database imprimen progreso por documento
+    sibom_scraper.console = Console(quiet=True)
+    build_database_module.console = Console(quiet=True)
+
+    scraper = sibom_scraper.SIBOMScraper('benchmark', use_cache=False, use_archive=False,
+                                         use_llm_cache=False)
+    scraper.http.close()
+    table_extractor = TableExtractor()
+    monto_extractor = MontoExtractor()
+    table_pages = corpus.table_pages
+    monto_inputs = monto_inputs_for(corpus.norms)
+    largest_inputs = monto_inputs_for(corpus.largest_norms())
+    contents = [norma['contenido'] for norma in corpus.norms]
+
+    # build_database lee una carpeta de JSON: copia del corpus en workdir
+    db_dir = workdir / 'boletines'
+    db_dir.mkdir(parents=True, exist_ok=True)
+    for i, bulletin in enumerate(corpus.bulletins):
+        (db_dir / f"bulletin_{i}.json").write_text(
+            json.dumps(bulletin, ensure_ascii=False), encoding='utf-8')
+
+    return [
+        BenchmarkCase('parse_final_content',
+                      lambda: [scraper.parse_final_content(p) for p in corpus.pages],
+                      len(corpus.pages)),
+        BenchmarkCase('parse_final_content_structured',
+                      lambda: [scraper.parse_final_content_structured(p) for p in corpus.pages],
+                      len(corpus.pages)),
+        BenchmarkCase('TableExtractor.extract_tables',
+                      lambda: [table_extractor.extract_tables(p) for p in table_pages],
+                      len(table_pages)),
+        BenchmarkCase('MontoExtractor.extract_from_boletin',
+                      lambda: [monto_extractor.extract_from_boletin(b) for b in monto_inputs],
+                      len(monto_inputs)),
+        BenchmarkCase('MontoExtractor.largest_norms',
+                      lambda: [monto_extractor.extract_from_boletin(b) for b in largest_inputs],
+                      len(largest_inputs)),
+        BenchmarkCase('detect_normativa_type',
+                      lambda: [detect_normativa_type(c) for c in contents],
+                      len(contents)),
+        BenchmarkCase('build_database',
+                      lambda: build_database_module.build_database(db_dir, workdir / 'normativas.db'),
+                      len(corpus.norms)),
+    ]
+
+
+def measure(case: BenchmarkCase, rounds: int) -> BenchmarkResult:
+    """
+    Mejor tiempo de `rounds` rondas (sin tracemalloc) y memoria pico de
+    Python en una ronda aparte (tracemalloc enlentece la ejecución).
+    """
+    case.run()  # calentamiento: imports, regex y cachés
+    best = float('inf')
+    for _ in range(rounds):
+        started = time.perf_counter()
+        case.run()
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        case.run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(case.name, case.docs, round(best, 6),
+                           round(case.docs / best, 1) if best > 0 else 0.0,
+                           round(peak / 1024, 1))
+
+
+def run_suite(corpus: Corpus, rounds: int = 5,
+              only: Optional[List[str]] = None) -> List[BenchmarkResult]:
+    import build_database as build_database_module
+    import sibom_scraper
+
+    consoles = sibom_scraper.console, build_database_module.console
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            cases = build_cases(corpus, Path(tmp))
+            return [measure(case, rounds) for case in cases
+                    if not only or case.name in only]
+    finally:
+        sibom_scraper.console, build_database_module.console = consoles
+
+
+def scaling_documents(corpus: Corpus) -> Dict[str, Callable[[int], str]]:
+    """Generadores de los documentos del chequeo de escalado (factor -> texto)"""
+    largest = '\n'.join(norma['contenido'] for norma in corpus.largest_norms())
+    return {
+        'largest_norms': lambda factor: largest * factor,
+        # Muchos "PESOS" antes de un "$" sin número: el prefijo lazy de
+        # AMOUNT_PATTERN re-escaneaba el tramo entero desde cada "PESOS"
+        # (costo cuadrático en el largo del tramo)
+        'pesos_sin_monto': lambda factor: ('PESOS con cargo a la partida ' * (400 * factor)
+                                           + '$ s/n, PESOS MIL ($ 1.000,00)'),
+        # Un monto por artículo: atribución de norma/artículo a cada monto
+        'montos_por_articulo': lambda factor: 'ORDENANZA Nº 1\n' + ''.join(
+            f"ARTÍCULO {i}º: Fíjase la tasa en $ 1.{i % 1000:03d},00.\n"
+            for i in range(1, 200 * factor + 1)),
+    }
+
+
+def scaling_profile(corpus: Corpus, factors=SCALING_FACTORS,
+                    rounds: int = 3) -> List[ScalingPoint]:
+    """Mejor tiempo de MontoExtractor.extract_from_boletin por documento y tamaño"""
+    from monto_extractor import MontoExtractor
+
+    extractor = MontoExtractor()
+    points = []
+    for name, document in scaling_documents(corpus).items():
+        for factor in factors:
+            boletin = {'text_content': document(factor), 'description': '1º de Benchmark'}
+            extractor.extract_from_boletin(boletin)
+            best = float('inf')
+            for _ in range(rounds):
+                started = time.perf_counter()
+                extractor.extract_from_boletin(boletin)
+                best = min(best, time.perf_counter() - started)
+            points.append(ScalingPoint(name, factor,
+                                       round(len(boletin['text_content']) / 1024, 1), best))
+    return points
+
+
+def check_scaling(points: List[ScalingPoint],
+                  tolerance: float = SCALING_TOLERANCE) -> List[str]:
+    """
+    Documentos cuyo costo por KB crece con el tamaño (escalado no lineal).
+
+    Returns:
+        Una descripción por documento que no escala lineal
+    """
+    problems = []
+    for name in dict.fromkeys(p.name for p in points):
+        series = sorted((p for p in points if p.name == name), key=lambda p: p.factor)
+        smallest, largest = series[0], series[-1]
+        if smallest.us_per_kb and largest.us_per_kb > smallest.us_per_kb * tolerance:
+            problems.append(
+                f"{name}: {largest.us_per_kb:.1f} µs/KB con {largest.factor}x "
+                f"vs {smallest.us_per_kb:.1f} µs/KB con {smallest.factor}x")
+    return problems
+
+
+def compare(results: List[BenchmarkResult], baseline: Dict[str, Dict[str, float]],
+            threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """
+    Regresiones respecto de la baseline.
+
+    Returns:
+        Una descripción por regresión (lista vacía = todo dentro del umbral)
+    """
+    regressions = []
+    for result in results:
+        base = baseline.get(result.name)
+        if not base:
+            continue
+        if result.docs_per_sec < base['docs_per_sec'] * (1 - threshold):
+            regressions.append(
+                f"{result.name}: {result.docs_per_sec:.1f} docs/s "
+                f"(baseline {base['docs_per_sec']:.1f}, -{1 - result.docs_per_sec / base['docs_per_sec']:.0%})")
+        if (result.peak_kb > base['peak_kb'] * (1 + threshold)
+                and result.peak_kb - base['peak_kb'] > MEMORY_FLOOR_KB):
+            regressions.append(
+                f"{result.name}: {result.peak_kb:,.0f} KB pico "
+                f"(baseline {base['peak_kb']:,.0f} KB)")
+    return regressions
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Dict[str, Dict[str, float]]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding='utf-8'))['results']
+
+
+def save_baseline(results: List[BenchmarkResult], corpus: Corpus, path: Path = BASELINE_PATH):
+    path.write_text(json.dumps({
+        'corpus': {
+            'directory': str(corpus.directory.relative_to(CLI_DIR)),
+            'norms': len(corpus.norms),
+            'recorded_pages': corpus.recorded_pages,
+        },
+        'python': sys.version.split()[0],
+        'results': {r.name: {k: v for k, v in asdict(r).items() if k != 'name'}
+                    for r in results},
+    }, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de extracción sobre el corpus de SIBOM")
+    parser.add_argument('--rounds', type=int, default=5, help='Rondas medidas por caso (default: 5)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Caída de throughput / aumento de memoria tolerado (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Guardar los resultados como nueva baseline')
+    parser.add_argument('--archive', help='Archivo de HTML grabado (boletines/.html_archive)')
+    parser.add_argument('--only', action='append', help='Correr solo este caso (repetible)')
+    parser.add_argument('--skip-scaling', action='store_true',
+                        help='No correr el chequeo de escalado lineal de MontoExtractor')
+    args = parser.parse_args()
+
+    archive = None
+    if args.archive:
+        from html_archive import HTMLArchive
+        archive = HTMLArchive(Path(args.archive))
+    corpus = load_corpus(archive=archive)
+    console.print(f"[cyan]📚 Corpus: {len(corpus.norms)} normas de {len(corpus.bulletins)} boletines "
+                  f"({corpus.recorded_pages} páginas grabadas, {len(corpus.table_pages)} con tabla)[/cyan]")
+
+    results = run_suite(corpus, rounds=args.rounds, only=args.only)
+    baseline = load_baseline()
+
+    table = Table(title=f"⏱ Benchmarks ({args.rounds} rondas, mejor tiempo)")
+    table.add_column("Caso", style="cyan")
+    table.add_column("Docs", justify="right")
+    table.add_column("Docs/s", justify="right", style="green")
+    table.add_column("Baseline", justify="right", style="dim")
+    table.add_column("Memoria pico", justify="right", style="yellow")
+    for r in results:
+        base = baseline.get(r.name)
+        table.add_row(r.name, str(r.docs), f"{r.docs_per_sec:,.1f}",
+                      f"{base['docs_per_sec']:,.1f}" if base else "-",
+                      f"{r.peak_kb:,.0f} KB")
+    console.print(table)
+
+    scaling_problems = []
+    if not args.skip_scaling:
+        points = scaling_profile(corpus)
+        table = Table(title="📈 Escalado de MontoExtractor (costo por KB)")
+        table.add_column("Documento", style="cyan")
+        table.add_column("Tamaño", justify="right")
+        table.add_column("KB", justify="right")
+        table.add_column("Tiempo", justify="right", style="green")
+        table.add_column("µs/KB", justify="right", style="yellow")
+        for p in points:
+            table.add_row(p.name, f"{p.factor}x", f"{p.kb:,.0f}",
+                          f"{p.seconds * 1000:.2f} ms", f"{p.us_per_kb:.1f}")
+        console.print(table)
+        scaling_problems = check_scaling(points)
+        for line in scaling_problems:
+            console.print(f"[red]  • Escalado no lineal: {line}[/red]")
+
+    if args.update_baseline:
+        save_baseline(results, corpus)
+        console.print(f"[bold green]✓ Baseline guardada en {BASELINE_PATH}[/bold green]")
+        return
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        console.print(f"[bold red]✗ {len(regressions)} regresiones (umbral {args.threshold:.0%}):[/bold red]")
+        for line in regressions:
+            console.print(f"[red]  • {line}[/red]")
+        sys.exit(1)
+    if scaling_problems:
+        sys.exit(1)
+    console.print(f"[bold green]✓ Sin regresiones (umbral {args.threshold:.0%})[/bold green]")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Fixtures compartidas para los tests del scraper.
+
+Incluye un servidor HTTP local (HTTP/1.1 keep-alive) que simula respuestas
+de SIBOM, para probar el cliente HTTP sin acceso a red.
+"""
+
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+class FakeSibomServer:
+    """
+    Servidor HTTP local configurable por ruta.
+
+    Cada ruta se asocia a una función `handler(request_headers) -> (status, headers, body)`.
+    Registra peticiones y conexiones para verificar reutilización keep-alive.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self.connections = set()
+        self.lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                with server.lock:
+                    server.requests.append((self.path, dict(self.headers)))
+                    server.connections.add(self.client_address)
+                route = server.routes.get(self.path)
+                if route is None:
+                    status, headers, body = 404, {}, 'not found'
+                else:
+                    status, headers, body = route(dict(self.headers))
+                payload = body.encode('utf-8')
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(
+            target=self.httpd.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+
+    def add_page(self, path, body, status=200, headers=None):
+        """Registra una respuesta fija para una ruta"""
+        self.routes[path] = lambda _req: (status, headers or {}, body)
+
+    def requests_for(self, path):
+        """Cantidad de peticiones recibidas para una ruta"""
+        return sum(1 for p, _ in self.requests if p == path)
+
+
+def listing_html(bulletin_ids, total_pages=1, city_id=22, city_name="Merlo"):
+    """
+    Genera una página de listado con el layout de SIBOM.
+
+    Args:
+        bulletin_ids: IDs de boletines en orden de aparición (más nuevo primero)
+        total_pages: Páginas totales anunciadas en la paginación
+    """
+    rows = []
+    for bulletin_id in bulletin_ids:
+        number = bulletin_id % 1000
+        rows.append(f"""
+        <div class="row bulletin">
+          <div class="col-md-8">
+            <p class="bulletin-title">{number}º de {city_name}</p>
+            <p class="bulletin-date">Publicado el 02/01/2026</p>
+          </div>
+          <div class="col-md-4">
+            <form class="button_to" method="get" action="/bulletins/{bulletin_id}">
+              <input type="submit" value="Ver">
+            </form>
+          </div>
+        </div>""")
+    pagination = ''
+    if total_pages > 1:
+        pagination = f"""
+        <ul class="pagination">
+          <li><a href="/cities/{city_id}?page=2">2</a></li>
+          <li><a href="/cities/{city_id}?page={total_pages}">Última &raquo;</a></li>
+        </ul>"""
+    return f"<html><body><div class=\"container\">{''.join(rows)}{pagination}</div></body></html>"
+
+
+def bulletin_html(norm_ids, bulletin_id=1636, tipos=('ordinance', 'decree', 'resolution'),
+                  number=None, city_name="Merlo"):
+    """
+    Genera la página de un boletín con sus enlaces a normas (layout de SIBOM).
+
+    Args:
+        norm_ids: IDs de normas en orden de aparición
+        number: Si se indica, agrega el encabezado "<number>º de <city_name>"
+            con la fecha de publicación
+    """
+    links = []
+    for i, norm_id in enumerate(norm_ids):
+        tipo = tipos[i % len(tipos)]
+        links.append(f"""
+        <a class="content-link" href="/bulletins/{bulletin_id}/contents/{norm_id}">
+          <div class="white-box {tipo}">
+            <p><strong>Ordenanza Nº {1000 + i}</strong></p>
+            <p class="city-and-date">Merlo, 02/01/2026</p>
+            <p>Visto el expediente {norm_id} y considerando</p>
+            <p>Que es necesario fijar <em>tasas</em> y derechos</p>
+            <p>Por ello se ordena</p>
+          </div>
+        </a>""")
+    header = ''
+    if number is not None:
+        header = f"""
+        <div class="row bulletin-header">
+          <p class="bulletin-title">{number}º de {city_name}</p>
+          <p class="bulletin-date">Publicado el 02/01/2026</p>
+        </div>"""
+    return f"<html><body><div class=\"container\">{header}{''.join(links)}</div></body></html>"
+
+
+@pytest.fixture
+def scraper(tmp_path):
+    """SIBOMScraper sin caché ni esperas, con estado en directorio temporal"""
+    from crawl_state import CityWatermarks
+    from index_spool import IndexSpool
+    from sibom_scraper import SIBOMScraper
+
+    instance = SIBOMScraper('test-key', use_cache=False, use_archive=False,
+                            use_llm_cache=False)
+    instance.rate_limiter.default_rate = 1000.0
+    instance.rate_limiter.default_burst = 100
+    instance.watermarks = CityWatermarks(tmp_path / '.watermarks.json')
+    instance.index_spool = IndexSpool(tmp_path / '.index_spool')
+    yield instance
+    instance.http.close()
+
+
+@pytest.fixture
+def sibom_server():
+    """Servidor HTTP local que simula SIBOM"""
+    server = FakeSibomServer()
+    server.thread.start()
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests del benchmark de extracción (corpus y chequeo de regresiones).
+
+No miden tiempos: verifican que el corpus sea representativo y que la
+comparación contra la baseline detecte regresiones.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / 'benchmarks'))
+
+from corpus import load_corpus
+from norm_parser import extract_text
+from run_benchmarks import (BenchmarkResult, ScalingPoint, check_scaling, compare,
+                            load_baseline, run_suite, scaling_profile)
+
+
+def result(name='detect_normativa_type', docs_per_sec=1000.0, peak_kb=100.0):
+    return BenchmarkResult(name, 10, 0.01, docs_per_sec, peak_kb)
+
+
+class TestCorpus:
+    """Tests del corpus de city_23."""
+
+    def test_pages_keep_norm_text(self):
+        """Las páginas reconstruidas devuelven el cuerpo de la norma."""
+        corpus = load_corpus()
+        assert len(corpus.pages) == len(corpus.norms) > 0
+
+        text, strategy = extract_text(corpus.pages[0])
+        assert strategy == "ID #frontend-container"
+        assert corpus.norms[0]['titulo'].split()[0] in text
+        assert 'Redes Sociales' not in text
+
+    def test_table_pages_have_amounts(self):
+        """Las normas con montos traen una tabla para TableExtractor."""
+        corpus = load_corpus()
+        with_montos = sum(1 for n in corpus.norms if n['montos_extraidos'])
+        assert len(corpus.table_pages) == with_montos > 0
+
+
+class TestRegressionCheck:
+    """Tests de la comparación contra la baseline."""
+
+    def test_within_threshold(self):
+        baseline = {'detect_normativa_type': {'docs_per_sec': 1000.0, 'peak_kb': 100.0}}
+        assert compare([result(docs_per_sec=800.0)], baseline, threshold=0.3) == []
+
+    def test_slower_is_regression(self):
+        baseline = {'detect_normativa_type': {'docs_per_sec': 1000.0, 'peak_kb': 100.0}}
+        regressions = compare([result(docs_per_sec=500.0)], baseline, threshold=0.3)
+        assert len(regressions) == 1
+        assert 'docs/s' in regressions[0]
+
+    def test_memory_growth_is_regression(self):
+        """La memoria cuenta si supera el umbral y el piso absoluto."""
+        baseline = {'detect_normativa_type': {'docs_per_sec': 1000.0, 'peak_kb': 100.0}}
+        assert compare([result(peak_kb=300.0)], baseline) == []
+        assert len(compare([result(peak_kb=2000.0)], baseline)) == 1
+
+    def test_cases_without_baseline_are_skipped(self):
+        assert compare([result(name='nuevo')], {}) == []
+
+
+def test_suite_covers_baseline():
+    """Cada caso de la suite tiene entrada en la baseline versionada."""
+    corpus = load_corpus()
+    corpus.norms, corpus.pages = corpus.norms[:20], corpus.pages[:20]
+    corpus.bulletins = corpus.bulletins[:1]
+
+    results = run_suite(corpus, rounds=1)
+
+    assert {r.name for r in results} == set(load_baseline())
+    assert all(r.docs_per_sec > 0 for r in results)
+
+
+class TestScalingCheck:
+    """Tests del chequeo de escalado lineal de MontoExtractor."""
+
+    def test_linear_series_passes(self):
+        points = [ScalingPoint('doc', f, 10.0 * f, 0.001 * f) for f in (1, 2, 4, 8)]
+        assert check_scaling(points) == []
+
+    def test_quadratic_series_fails(self):
+        points = [ScalingPoint('doc', f, 10.0 * f, 0.001 * f * f) for f in (1, 2, 4, 8)]
+        problems = check_scaling(points)
+        assert len(problems) == 1
+        assert problems[0].startswith('doc:')
+
+    def test_profile_covers_every_document(self):
+        points = scaling_profile(load_corpus(), factors=(1, 2), rounds=1)
+        assert {(p.name, p.factor) for p in points} == {
+            ('largest_norms', 1), ('largest_norms', 2),
+            ('pesos_sin_monto', 1), ('pesos_sin_monto', 2),
+            ('montos_por_articulo', 1), ('montos_por_articulo', 2)}
+        assert all(p.kb > 0 for p in points)
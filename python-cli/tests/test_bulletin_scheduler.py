@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Tests para el planificador de boletines entre ciudades.
+"""
+
+import threading
+import time
+
+from bulletin_scheduler import BulletinScheduler
+from conftest import listing_html
+
+
+def bulletins(*ids):
+    return [{'number': f'{i}º', 'link': f'/bulletins/{i}'} for i in ids]
+
+
+class TestBulletinScheduler:
+    """Tests de BulletinScheduler."""
+
+    def test_round_robin_newest_first(self):
+        """Con un worker los boletines se intercalan entre ciudades por posición."""
+        order = []
+        gate = threading.Event()
+
+        def handler(city_id, bulletin):
+            gate.wait()
+            order.append(bulletin['link'])
+            return {'status': 'completed'}
+
+        scheduler = BulletinScheduler(1, handler, lambda city_id, pairs: None)
+        scheduler.start()
+        scheduler.submit_city(1, bulletins(10))
+        time.sleep(0.05)  # El worker toma el primero y queda esperando
+        scheduler.submit_city(2, bulletins(22, 21))
+        scheduler.submit_city(3, bulletins(33, 32))
+        gate.set()
+        scheduler.join()
+
+        assert order == ['/bulletins/10', '/bulletins/22', '/bulletins/33',
+                         '/bulletins/21', '/bulletins/32']
+
+    def test_city_done_with_listing_order(self):
+        """Cada ciudad se cierra una vez, con sus resultados en orden del listado."""
+        done = {}
+
+        def handler(city_id, bulletin):
+            time.sleep(0.02 if bulletin['link'].endswith('3') else 0)
+            return {'status': 'completed', 'link': bulletin['link']}
+
+        scheduler = BulletinScheduler(
+            4, handler, lambda city_id, pairs: done.setdefault(city_id, pairs))
+        scheduler.start()
+        scheduler.submit_city(1, bulletins(13, 12, 11))
+        scheduler.submit_city(2, bulletins(23, 22))
+        scheduler.submit_city(3, [])
+        scheduler.join()
+
+        assert [r['link'] for _, r in done[1]] == ['/bulletins/13', '/bulletins/12', '/bulletins/11']
+        assert len(done[2]) == 2
+        assert done[3] == []
+
+    def test_handler_exception_becomes_error(self):
+        """Una excepción del handler no mata al worker."""
+        done = {}
+
+        def handler(city_id, bulletin):
+            if bulletin['link'] == '/bulletins/2':
+                raise RuntimeError('boom')
+            return {'status': 'completed'}
+
+        scheduler = BulletinScheduler(1, handler, lambda city_id, pairs: done.setdefault(city_id, pairs))
+        scheduler.start()
+        scheduler.submit_city(7, bulletins(1, 2, 3))
+        scheduler.join()
+
+        assert [r['status'] for _, r in done[7]] == ['completed', 'error', 'completed']
+
+    def test_callback_exception_keeps_worker_alive(self):
+        """Si on_city_done falla, el worker sigue y la ciudad queda como error."""
+        done, errors = {}, []
+
+        def on_city_done(city_id, pairs):
+            if city_id == 1:
+                raise OSError('disco lleno')
+            done[city_id] = pairs
+
+        scheduler = BulletinScheduler(
+            1, lambda city_id, bulletin: {'status': 'completed'}, on_city_done,
+            on_error=lambda city_id, message: errors.append((city_id, message)))
+        scheduler.start()
+        scheduler.submit_city(1, bulletins(11))
+        scheduler.submit_city(2, bulletins(22, 21))
+        scheduler.join()
+
+        assert len(done[2]) == 2
+        assert scheduler.city_errors == {1: 'OSError: disco lleno'}
+        assert errors == [(1, 'OSError: disco lleno')]
+
+
+class TestMultiCityScheduling:
+    """scrape_multiple_cities sobre el pool compartido."""
+
+    def test_stats_and_watermarks_per_city(self, scraper, sibom_server, monkeypatch, tmp_path):
+        """Las estadísticas y watermarks siguen siendo por ciudad."""
+        monkeypatch.chdir(tmp_path)
+        sibom_server.add_page('/cities/1', listing_html([12, 11], city_id=1, city_name='Lobos'))
+        sibom_server.add_page('/cities/2', listing_html([25, 24, 23], city_id=2, city_name='Merlo'))
+
+        def fake_process(bulletin, base_url, output_dir, skip_existing=False):
+            status = 'error' if bulletin['link'] == '/bulletins/24' else 'completed'
+            return {'status': status}
+
+        monkeypatch.setattr(scraper, 'process_bulletin', fake_process)
+        monkeypatch.setattr(scraper, 'print_multi_city_summary', lambda *args: None)
+        real_collect = scraper._collect_city_bulletins
+        monkeypatch.setattr(scraper, '_collect_city_bulletins', lambda city_id, url, inc: real_collect(
+            city_id, url.replace('https://sibom.slyt.gba.gob.ar', sibom_server.base_url), inc))
+
+        stats = scraper.scrape_multiple_cities([1, 2], parallel=3)
+
+        assert stats[1]['completados'] == 2
+        assert stats[2]['completados'] == 2 and stats[2]['errores'] == 1
+        assert scraper.watermarks.get(1) == 12
+        assert scraper.watermarks.get(2) == 23
+
+    def test_failing_city_close_is_an_error(self, scraper, sibom_server, monkeypatch, tmp_path):
+        """Un error al cerrar una ciudad no frena a las demás y queda en las estadísticas."""
+        monkeypatch.chdir(tmp_path)
+        sibom_server.add_page('/cities/1', listing_html([12, 11], city_id=1, city_name='Lobos'))
+        sibom_server.add_page('/cities/2', listing_html([25, 24], city_id=2, city_name='Merlo'))
+
+        monkeypatch.setattr(scraper, 'process_bulletin',
+                            lambda bulletin, *args, **kwargs: {'status': 'completed'})
+        summary = {}
+        monkeypatch.setattr(scraper, 'print_multi_city_summary',
+                            lambda stats, errors, elapsed: summary.setdefault('errors', errors))
+        real_collect = scraper._collect_city_bulletins
+        monkeypatch.setattr(scraper, '_collect_city_bulletins', lambda city_id, url, inc: real_collect(
+            city_id, url.replace('https://sibom.slyt.gba.gob.ar', sibom_server.base_url), inc))
+        real_advance = scraper.watermarks.advance
+
+        def advance(city_id, pairs):
+            if city_id == 1:
+                raise OSError('no se pudo escribir la watermark')
+            real_advance(city_id, pairs)
+
+        monkeypatch.setattr(scraper.watermarks, 'advance', advance)
+
+        stats = scraper.scrape_multiple_cities([1, 2], parallel=1)
+
+        assert stats[1]['errores'] == 1
+        assert stats[2]['completados'] == 2
+        assert [city_id for city_id, _, _ in summary['errors']] == [1]
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests para el escritor en streaming de boletines.
+"""
+
+import json
+
+from bulletin_writer import BulletinWriter
+
+HEADER = {
+    "municipio": "Carlos Tejedor",
+    "numero_boletin": "105º",
+    "fecha_boletin": "10/11/2025",
+    "boletin_url": "https://sibom.slyt.gba.gob.ar/bulletins/1636",
+    "status": "completed",
+}
+
+
+def make_norma(norma_id, tipo='decreto', montos=0):
+    return {
+        "id": norma_id,
+        "tipo": tipo,
+        "contenido": "Artículo 1º: Apruébase el presupuesto…",
+        "tablas": [{"headers": ["A"], "rows": [["$ 1.000"]]}],
+        "metadata": {"longitud_caracteres": 40, "total_tablas": 1, "total_montos": montos},
+    }
+
+
+class TestBulletinWriter:
+    """Tests de BulletinWriter."""
+
+    def test_output_matches_json_dump(self, tmp_path):
+        """El archivo final equivale al json.dump del resultado completo."""
+        filepath = tmp_path / 'boletin.json'
+        normas = [make_norma('1', montos=2), make_norma('2', 'ordenanza')]
+
+        writer = BulletinWriter(filepath, HEADER)
+        for norma in normas:
+            writer.write(norma)
+        summary = writer.finalize()
+
+        data = json.loads(filepath.read_text(encoding='utf-8'))
+        assert data['normas'] == normas
+        assert data['total_normas'] == 2
+        assert data['metadata_boletin']['total_tablas'] == 2
+        assert data['metadata_boletin']['total_montos'] == 2
+        assert {k: data[k] for k in HEADER} == HEADER
+        assert summary['metadata_boletin'] == data['metadata_boletin']
+        assert 'normas' not in summary
+        assert writer.tipos_count == {'decreto': 1, 'ordenanza': 1}
+
+    def test_keeps_indent_2_layout(self, tmp_path):
+        """Mantiene el formato indentado de los boletines existentes."""
+        filepath = tmp_path / 'boletin.json'
+        writer = BulletinWriter(filepath, HEADER)
+        writer.write(make_norma('1'))
+        writer.finalize()
+
+        text = filepath.read_text(encoding='utf-8')
+        norma_text = json.dumps(make_norma('1'), indent=2, ensure_ascii=False)
+        assert '    ' + norma_text.replace('\n', '\n    ') in text
+
+    def test_empty_bulletin_is_valid_json(self, tmp_path):
+        """Un boletín sin normas produce JSON válido."""
+        filepath = tmp_path / 'boletin.json'
+        BulletinWriter(filepath, HEADER).finalize()
+
+        assert json.loads(filepath.read_text(encoding='utf-8'))['normas'] == []
+
+    def test_partial_until_finalized(self, tmp_path):
+        """Mientras se escribe solo existe el .partial; abortar no publica nada."""
+        filepath = tmp_path / 'boletin.json'
+        writer = BulletinWriter(filepath, HEADER)
+        writer.write(make_norma('1'))
+
+        assert writer.partial_path.exists()
+        assert not filepath.exists()
+
+        writer.abort()
+        assert not filepath.exists()
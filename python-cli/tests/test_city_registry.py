@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests para el registro de ciudades (descubrimiento concurrente y mapa memoizado).
+"""
+
+import json
+
+from city_registry import CityRegistry, parse_city_listing
+from conftest import listing_html
+
+
+class TestCityRegistry:
+    """Tests de CityRegistry."""
+
+    def test_parse_city_listing(self):
+        """Extrae nombre, fecha, boletines por página y páginas totales."""
+        parsed = parse_city_listing(listing_html([30, 29, 28], total_pages=7, city_name='Carlos Tejedor'))
+
+        assert parsed == {'name': 'Carlos Tejedor', 'last_seen': '02/01/2026',
+                          'page_count': 3, 'total_pages': 7}
+
+    def test_names_loaded_once_per_process(self, tmp_path):
+        """Las consultas no vuelven a leer CITY_MAP.json."""
+        map_path = tmp_path / 'CITY_MAP.json'
+        map_path.write_text(json.dumps({'22': 'Merlo'}))
+        registry = CityRegistry(map_path)
+
+        assert registry.name(22) == 'Merlo'
+        map_path.write_text(json.dumps({'22': 'Otro'}))
+        assert CityRegistry(map_path).name('22') == 'Merlo'
+
+        registry.reload()
+        assert registry.name('22') == 'Otro'
+
+    def test_fallback_without_file(self, tmp_path):
+        """Sin CITY_MAP.json se usa el mapa de respaldo."""
+        registry = CityRegistry(tmp_path / 'CITY_MAP.json', fallback={'23': 'Carlos Tejedor'})
+
+        assert registry.name(23) == 'Carlos Tejedor'
+        assert registry.name(99) is None
+
+    def test_discover_concurrently(self, scraper, sibom_server, tmp_path):
+        """Descubre ciudades en paralelo y persiste nombre, fecha y cantidad."""
+        sibom_server.add_page('/cities/1', listing_html([10, 9], total_pages=3, city_id=1, city_name='Lobos'))
+        sibom_server.add_page('/cities/1?page=3', listing_html([1], total_pages=3, city_id=1, city_name='Lobos'))
+        sibom_server.add_page('/cities/2', listing_html([5], city_id=2, city_name='Merlo'))
+        sibom_server.add_page('/cities/3', '<html><body>Sin boletines</body></html>')
+        registry = CityRegistry(tmp_path / 'CITY_MAP.json')
+        seen = []
+
+        entries = registry.discover(scraper.http, range(1, 5), base_url=sibom_server.base_url,
+                                    on_city=lambda cid, entry: seen.append(cid))
+
+        assert {cid: e['bulletin_count'] for cid, e in entries.items()} == {'1': 5, '2': 1}
+        assert entries['1']['last_seen'] == '02/01/2026'
+        assert sorted(seen) == ['1', '2', '3', '4']
+        assert json.loads((tmp_path / 'CITY_MAP.json').read_text()) == {'1': 'Lobos', '2': 'Merlo'}
+        assert registry.details()['2']['name'] == 'Merlo'
+        assert registry.name(1) == 'Lobos'
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Tests para el control adaptativo (AIMD) de boletines en paralelo.
+"""
+
+import threading
+import time
+
+import pytest
+import requests
+
+from bulletin_scheduler import BulletinScheduler
+from concurrency import AIMDController
+from http_client import HTTPClient
+from run_metrics import RunMetrics
+
+
+def healthy(controller, responses, latency=0.1):
+    for _ in range(responses):
+        controller.record(latency, 200)
+
+
+# ============================================================================
+# TESTS DEL CONTROLADOR
+# ============================================================================
+
+class TestAIMD:
+    """Tests de aumento aditivo y disminución multiplicativa."""
+
+    def test_additive_increase_per_window(self):
+        """Cada ventana de `limit` respuestas sanas suma 1."""
+        controller = AIMDController(initial=2, maximum=8)
+        healthy(controller, 2)
+        assert controller.limit == 3
+        healthy(controller, 2)
+        assert controller.limit == 3
+        healthy(controller, 1)
+        assert controller.limit == 4
+
+    def test_capped_at_maximum(self):
+        controller = AIMDController(initial=2, maximum=3)
+        healthy(controller, 50)
+        assert controller.limit == 3
+
+    @pytest.mark.parametrize('status', [429, 500, 503, None])
+    def test_congestion_halves_limit(self, status):
+        """Timeouts, 5xx y 429 reducen el límite a la mitad."""
+        controller = AIMDController(initial=8, maximum=8)
+        controller.record(0.1, status)
+        assert controller.limit == 4
+
+    def test_client_errors_are_not_congestion(self):
+        """Un 404 es una respuesta normal del sitio."""
+        controller = AIMDController(initial=2, maximum=8)
+        healthy(controller, 1)
+        controller.record(0.1, 404)
+        assert controller.limit == 3
+
+    def test_one_decrease_per_window(self):
+        """Los errores de peticiones ya en vuelo no vuelven a castigar."""
+        controller = AIMDController(initial=8, maximum=8)
+        for _ in range(4):
+            controller.record(1.0, 503)
+        assert controller.limit == 4
+
+        healthy(controller, 4)
+        controller.record(1.0, 503)
+        assert controller.limit == 2
+
+    def test_never_below_minimum(self):
+        controller = AIMDController(initial=3, minimum=2, maximum=8)
+        controller.record(1.0, None)
+        assert controller.limit == 2
+
+    def test_latency_spike_backs_off(self):
+        """Latencia muy por encima de la mejor ventana también reduce."""
+        controller = AIMDController(initial=2, maximum=8)
+        healthy(controller, 2, latency=0.1)
+        assert controller.limit == 3
+        healthy(controller, 3, latency=0.5)
+        assert controller.limit == 1
+
+    def test_slow_site_at_minimum_becomes_baseline(self):
+        """En el mínimo, la latencia alta pasa a ser la referencia y se vuelve a subir."""
+        controller = AIMDController(initial=1, maximum=4)
+        healthy(controller, 1, latency=0.1)
+        healthy(controller, 2, latency=0.1)
+        healthy(controller, 3, latency=1.0)
+        assert controller.limit == 1
+        healthy(controller, 1, latency=1.0)
+        healthy(controller, 1, latency=1.0)
+        assert controller.limit == 2
+
+    def test_reports_gauges(self):
+        """El límite elegido queda en las métricas de la corrida."""
+        metrics = RunMetrics()
+        controller = AIMDController(initial=2, maximum=8, metrics=metrics)
+        healthy(controller, 2)
+        controller.record(0.1, 503)
+
+        gauges = metrics.snapshot()['gauges']
+        assert gauges['concurrency_limit'] == 1
+        assert gauges['concurrency_limit_peak'] == 3
+        assert gauges['concurrency_increases'] == 1
+        assert gauges['concurrency_decreases'] == 1
+
+
+# ============================================================================
+# TESTS DE LUGARES Y SCHEDULER
+# ============================================================================
+
+class TestSlots:
+    """Tests de la concurrencia efectiva."""
+
+    def test_scheduler_respects_limit(self):
+        """Con pool de `maximum` workers, solo `limit` procesan a la vez."""
+        controller = AIMDController(initial=2, maximum=6)
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def handler(city_id, bulletin):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return {'status': 'completed'}
+
+        scheduler = BulletinScheduler(1, handler, lambda city_id, pairs: None,
+                                      concurrency=controller)
+        scheduler.start()
+        scheduler.submit_city(1, [{'link': f'/bulletins/{i}'} for i in range(12)])
+        scheduler.join()
+
+        assert scheduler.workers == 6
+        assert peak[0] == 2
+
+    def test_increase_wakes_waiting_workers(self):
+        """Al subir el límite, los workers en espera arrancan."""
+        controller = AIMDController(initial=1, maximum=2)
+        started = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with controller.slot():
+                release.wait()
+
+        def second():
+            with controller.slot():
+                started.set()
+
+        threading.Thread(target=hold, daemon=True).start()
+        time.sleep(0.02)
+        waiter = threading.Thread(target=second, daemon=True)
+        waiter.start()
+        assert not started.wait(0.05)
+
+        healthy(controller, 1)
+        assert started.wait(1)
+        release.set()
+
+
+class TestHTTPSignals:
+    """Tests de las señales que envía el cliente HTTP."""
+
+    def test_server_errors_reach_controller(self, sibom_server):
+        controller = AIMDController(initial=4, maximum=8)
+        sibom_server.add_page('/bulletins/1', 'caído', status=503)
+        client = HTTPClient({}, concurrency=controller)
+        try:
+            client.get(f'{sibom_server.base_url}/bulletins/1')
+        finally:
+            client.close()
+
+        assert controller.limit == 2
+
+    def test_connection_errors_reach_controller(self):
+        controller = AIMDController(initial=4, maximum=8)
+        client = HTTPClient({}, timeout=0.5, concurrency=controller)
+        try:
+            with pytest.raises(requests.RequestException):
+                client.get('http://127.0.0.1:9/bulletins/1')
+        finally:
+            client.close()
+
+        assert controller.limit == 2
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests para el crawl incremental (watermarks por ciudad y corte de paginación).
+"""
+
+from conftest import listing_html
+from crawl_state import CityWatermarks, bulletin_id_from_link
+
+
+def serve_city(server, pages, city_id=22):
+    """Registra las páginas de listado de una ciudad (lista de listas de IDs)"""
+    for page_num, ids in enumerate(pages, 1):
+        html = listing_html(ids, total_pages=len(pages), city_id=city_id)
+        server.add_page(f'/cities/{city_id}?page={page_num}', html)
+        if page_num == 1:
+            server.add_page(f'/cities/{city_id}', html)
+
+
+# ============================================================================
+# TESTS DE WATERMARKS
+# ============================================================================
+
+class TestCityWatermarks:
+    """Tests del estado persistente."""
+
+    def test_bulletin_id_from_link(self):
+        """Extrae el ID de enlaces relativos y absolutos."""
+        assert bulletin_id_from_link('/bulletins/14250') == 14250
+        assert bulletin_id_from_link('https://sibom.slyt.gba.gob.ar/bulletins/9?x=1') == 9
+        assert bulletin_id_from_link('') is None
+
+    def test_update_never_moves_back(self, tmp_path):
+        """La watermark solo avanza."""
+        marks = CityWatermarks(tmp_path / 'w.json')
+        marks.update(22, 100, '10º')
+        marks.update(22, 90, '9º')
+
+        assert marks.get(22) == 100
+
+    def test_persists_to_disk(self, tmp_path):
+        """Una nueva instancia lee la watermark guardada."""
+        CityWatermarks(tmp_path / 'w.json').update(5, 300)
+
+        assert CityWatermarks(tmp_path / 'w.json').get(5) == 300
+
+    def test_advance_stops_below_errors(self, tmp_path):
+        """Un boletín con error impide avanzar por encima de él."""
+        marks = CityWatermarks(tmp_path / 'w.json')
+        marks.advance(22, [
+            ({'link': '/bulletins/10'}, {'status': 'completed'}),
+            ({'link': '/bulletins/11'}, {'status': 'error'}),
+            ({'link': '/bulletins/12'}, {'status': 'completed'}),
+        ])
+
+        assert marks.get(22) == 10
+
+
+# ============================================================================
+# TESTS DE CORTE DE PAGINACIÓN
+# ============================================================================
+
+class TestIncrementalListing:
+    """Tests de _collect_city_bulletins."""
+
+    def test_full_crawl_without_watermark(self, scraper, sibom_server):
+        """Sin watermark recorre todas las páginas."""
+        serve_city(sibom_server, [[30, 29], [28, 27], [26, 25]])
+
+        bulletins, fetched, total = scraper._collect_city_bulletins(
+            22, f"{sibom_server.base_url}/cities/22")
+
+        assert [b['link'] for b in bulletins] == [f'/bulletins/{n}' for n in range(30, 24, -1)]
+        assert fetched == total == 3
+
+    def test_stops_at_known_territory(self, scraper, sibom_server):
+        """Con watermark solo descarga la primera página y devuelve lo nuevo."""
+        serve_city(sibom_server, [[30, 29, 28], [27, 26, 25], [24, 23, 22]])
+        scraper.watermarks.update(22, 28)
+
+        bulletins, fetched, total = scraper._collect_city_bulletins(
+            22, f"{sibom_server.base_url}/cities/22")
+
+        assert [b['link'] for b in bulletins] == ['/bulletins/30', '/bulletins/29']
+        assert (fetched, total) == (1, 3)
+        assert sibom_server.requests_for('/cities/22?page=2') == 0
+
+    def test_continues_while_pages_are_new(self, scraper, sibom_server):
+        """Sigue paginando mientras la página termina en boletines nuevos."""
+        serve_city(sibom_server, [[30, 29], [28, 27], [26, 25]])
+        scraper.watermarks.update(22, 27)
+
+        bulletins, fetched, _ = scraper._collect_city_bulletins(
+            22, f"{sibom_server.base_url}/cities/22")
+
+        assert [b['link'] for b in bulletins] == ['/bulletins/30', '/bulletins/29', '/bulletins/28']
+        assert fetched == 2
+
+    def test_full_crawl_flag_ignores_watermark(self, scraper, sibom_server):
+        """incremental=False recorre todo aunque haya watermark."""
+        serve_city(sibom_server, [[30, 29], [28, 27]])
+        scraper.watermarks.update(22, 30)
+
+        bulletins, fetched, _ = scraper._collect_city_bulletins(
+            22, f"{sibom_server.base_url}/cities/22", incremental=False)
+
+        assert len(bulletins) == 4
+        assert fetched == 2
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Tests para el archivo de HTML crudo y el modo replay.
+"""
+
+import json
+
+import pytest
+
+from conftest import bulletin_html, listing_html
+from html_archive import ArchiveMissError, HTMLArchive, ReplayClient
+from http_cache import HTTPCache
+from http_client import HTTPClient
+
+BASE = 'https://sibom.slyt.gba.gob.ar'
+
+NORM_HTML = ('<html><body><div id="frontend-container"><p>Ordenanza</p>'
+             '<p>' + 'Visto el expediente y considerando lo dispuesto. ' * 5 + '</p>'
+             '<p>Artículo 1: Fíjase la tasa en $ 2.500,00.</p></div></body></html>')
+
+
+@pytest.fixture
+def archive(tmp_path):
+    """Archivo en directorio temporal"""
+    return HTMLArchive(tmp_path / 'html_archive')
+
+
+# ============================================================================
+# TESTS DEL ARCHIVO
+# ============================================================================
+
+class TestHTMLArchive:
+    """Tests de almacenamiento direccionado por contenido."""
+
+    def test_roundtrip(self, archive):
+        """Lo archivado se recupera igual, aunque tenga caracteres no ASCII."""
+        url = f'{BASE}/bulletins/1636/contents/1'
+        archive.put(url, NORM_HTML)
+
+        assert url in archive
+        assert archive.get(url) == NORM_HTML
+        assert archive.get(f'{BASE}/bulletins/1636/contents/2') is None
+
+    def test_same_content_shares_blob(self, archive):
+        """Dos URLs con el mismo HTML ocupan un solo blob."""
+        first = archive.put(f'{BASE}/bulletins/1', NORM_HTML)
+        second = archive.put(f'{BASE}/bulletins/2', NORM_HTML)
+
+        assert first == second
+        assert len(list(archive.blobs_dir.rglob('*.html.gz'))) == 1
+        stats = archive.summary()
+        assert stats['pages'] == 2
+        assert stats['blobs'] == 1
+        assert stats['stored_bytes'] < stats['raw_bytes']
+
+    def test_refetch_updates_url(self, archive):
+        """Una URL vuelta a descargar apunta al contenido nuevo."""
+        url = f'{BASE}/cities/22'
+        archive.put(url, '<html>v1</html>')
+        archive.put(url, '<html>v2</html>')
+
+        assert archive.get(url) == '<html>v2</html>'
+        assert archive.summary()['pages'] == 1
+
+    def test_urls_by_kind(self, archive):
+        """Las URLs se listan por clase, en orden de alta."""
+        archive.put(f'{BASE}/cities/22?page=2', 'a')
+        archive.put(f'{BASE}/bulletins/1636', 'b')
+        archive.put(f'{BASE}/cities/22', 'c')
+
+        assert archive.urls('listing') == [f'{BASE}/cities/22?page=2', f'{BASE}/cities/22']
+        assert archive.urls('bulletin') == [f'{BASE}/bulletins/1636']
+        assert len(archive.urls()) == 3
+
+
+# ============================================================================
+# TESTS DE INTEGRACIÓN
+# ============================================================================
+
+class TestArchiveIntegration:
+    """Tests del archivo con el cliente HTTP y del replay."""
+
+    def test_client_archives_downloads(self, archive, sibom_server):
+        """Cada página descargada queda en el archivo."""
+        sibom_server.add_page('/bulletins/1636', '<html>boletín</html>')
+        client = HTTPClient({}, archive=archive)
+        url = f'{sibom_server.base_url}/bulletins/1636'
+        try:
+            client.fetch_text(url)
+        finally:
+            client.close()
+
+        assert archive.get(url) == '<html>boletín</html>'
+
+    def test_cache_hits_are_not_rearchived(self, archive, tmp_path, sibom_server):
+        """Un hit del caché no vuelve a archivar ni cambia fetched_at."""
+        sibom_server.add_page('/bulletins/1636', '<html>boletín</html>')
+        client = HTTPClient({}, cache=HTTPCache(tmp_path / 'http_cache'), archive=archive)
+        url = f'{sibom_server.base_url}/bulletins/1636'
+        try:
+            client.fetch_text(url)
+            fetched_at = archive._conn().execute(
+                "SELECT fetched_at FROM pages WHERE url = ?", (url,)).fetchone()
+            archive.put = None  # Cualquier llamada fallaría
+            assert client.fetch_text(url) == '<html>boletín</html>'
+        finally:
+            client.close()
+
+        assert sibom_server.requests_for('/bulletins/1636') == 1
+        assert archive._conn().execute(
+            "SELECT fetched_at FROM pages WHERE url = ?", (url,)).fetchone() == fetched_at
+
+    def test_cache_hits_backfill_missing_pages(self, archive, tmp_path, sibom_server):
+        """Una página cacheada antes de existir el archivo se archiva al servirla."""
+        sibom_server.add_page('/bulletins/1636', '<html>boletín</html>')
+        cache = HTTPCache(tmp_path / 'http_cache')
+        url = f'{sibom_server.base_url}/bulletins/1636'
+        HTTPClient({}, cache=cache).fetch_text(url)
+
+        client = HTTPClient({}, cache=cache, archive=archive)
+        try:
+            client.fetch_text(url)
+        finally:
+            client.close()
+
+        assert sibom_server.requests_for('/bulletins/1636') == 1
+        assert archive.get(url) == '<html>boletín</html>'
+
+    def test_replay_client_never_hits_network(self, archive):
+        """El cliente de replay falla si la URL no está archivada."""
+        client = ReplayClient(archive)
+        archive.put(f'{BASE}/bulletins/1', 'x')
+
+        results = client.fetch_many([f'{BASE}/bulletins/1', f'{BASE}/bulletins/2'])
+
+        assert results[0] == 'x'
+        assert isinstance(results[1], ArchiveMissError)
+        with pytest.raises(ArchiveMissError):
+            client.fetch_text(f'{BASE}/bulletins/2')
+
+    def test_replay_rebuilds_bulletins(self, scraper, archive, tmp_path, monkeypatch):
+        """El replay regenera el JSON del boletín solo con el archivo."""
+        monkeypatch.chdir(tmp_path)
+        archive.put(f'{BASE}/cities/22', listing_html([1636, 1637]))
+        archive.put(f'{BASE}/cities/99', listing_html([1700], city_id=99))
+        archive.put(f'{BASE}/bulletins/1636', bulletin_html([10, 11]))
+        archive.put(f'{BASE}/bulletins/1636/contents/10', NORM_HTML)
+        archive.put(f'{BASE}/bulletins/1636/contents/11', NORM_HTML)
+
+        results = scraper.replay(archive, city_ids=[22])
+
+        # 1637 no tiene página archivada y la ciudad 99 no se pidió
+        assert [r['status'] for r in results] == ['completed']
+        assert results[0]['total_normas'] == 2
+        written = json.loads(next((tmp_path / 'boletines').glob('*.json')).read_text())
+        assert written['normas'][0]['montos_extraidos']
+        assert 'Fíjase la tasa' in written['normas'][1]['contenido']
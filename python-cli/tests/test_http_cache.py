@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Tests para el caché HTTP condicional en disco.
+"""
+
+import pytest
+import requests
+
+from html_archive import HTMLArchive
+from http_cache import HTTPCache, classify_url
+from http_client import HTTPClient
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Caché en directorio temporal"""
+    return HTTPCache(tmp_path / 'http_cache')
+
+
+def etag_route(body, etag='"v1"'):
+    """Ruta que responde 304 si recibe el ETag vigente"""
+    def handler(headers):
+        if headers.get('If-None-Match') == etag:
+            return 304, {'ETag': etag}, ''
+        return 200, {'ETag': etag}, body
+    return handler
+
+
+# ============================================================================
+# TESTS DE CLASIFICACIÓN Y TTL
+# ============================================================================
+
+class TestClassification:
+    """Tests de clases de URL."""
+
+    def test_classify_urls(self):
+        """Distingue listados, boletines y normas."""
+        base = 'https://sibom.slyt.gba.gob.ar'
+        assert classify_url(f'{base}/cities/22?page=3') == 'listing'
+        assert classify_url(f'{base}/bulletins/1636') == 'bulletin'
+        assert classify_url(f'{base}/bulletins/1636/contents/1270278') == 'norm'
+        assert classify_url(f'{base}/about') == 'other'
+
+    def test_norms_never_expire(self, cache):
+        """Las normas no vencen; los listados sí."""
+        norm = {'url': 'https://x/bulletins/1/contents/2', 'stored_at': 0}
+        listing = {'url': 'https://x/cities/1', 'stored_at': 0}
+
+        assert cache.is_fresh(norm)
+        assert not cache.is_fresh(listing)
+
+
+# ============================================================================
+# TESTS DE INTEGRACIÓN CON EL CLIENTE HTTP
+# ============================================================================
+
+class TestConditionalGet:
+    """Tests de revalidación condicional."""
+
+    def test_fresh_entry_served_without_network(self, cache, sibom_server):
+        """Una norma cacheada no vuelve a descargarse."""
+        path = '/bulletins/1/contents/2'
+        sibom_server.add_page(path, 'norma')
+        client = HTTPClient(cache=cache)
+
+        first = client.fetch_text(f"{sibom_server.base_url}{path}")
+        second = client.fetch_text(f"{sibom_server.base_url}{path}")
+        client.close()
+
+        assert first == second == 'norma'
+        assert sibom_server.requests_for(path) == 1
+        assert cache.summary()['hits'] == 1
+        assert cache.summary()['misses'] == 1
+
+    def test_expired_entry_revalidated_with_304(self, tmp_path, sibom_server):
+        """Un listado vencido se revalida con If-None-Match y se sirve del caché."""
+        cache = HTTPCache(tmp_path / 'http_cache', ttls={'listing': 0})
+        sibom_server.routes['/cities/22'] = etag_route('listado')
+        client = HTTPClient(cache=cache)
+
+        first = client.fetch_text(f"{sibom_server.base_url}/cities/22")
+        second = client.fetch_text(f"{sibom_server.base_url}/cities/22")
+        client.close()
+
+        assert first == second == 'listado'
+        _, headers = sibom_server.requests[-1]
+        assert headers['If-None-Match'] == '"v1"'
+        stats = cache.summary()
+        assert stats['revalidated'] == 1
+        assert stats['hit_rate'] == 0.5
+
+    def test_cache_persists_across_instances(self, tmp_path, sibom_server):
+        """El caché sobrevive entre ejecuciones (está en disco)."""
+        path = '/bulletins/9/contents/10'
+        sibom_server.add_page(path, 'persistente')
+
+        HTTPClient(cache=HTTPCache(tmp_path / 'c')).fetch_text(f"{sibom_server.base_url}{path}")
+        html = HTTPClient(cache=HTTPCache(tmp_path / 'c')).fetch_text(f"{sibom_server.base_url}{path}")
+
+        assert html == 'persistente'
+        assert sibom_server.requests_for(path) == 1
+
+    def test_errors_are_not_cached(self, cache, sibom_server):
+        """Las respuestas de error no se guardan."""
+        client = HTTPClient(cache=cache)
+        with pytest.raises(Exception):
+            client.fetch_text(f"{sibom_server.base_url}/cities/404", max_retries=1)
+        client.close()
+
+        assert cache.lookup(f"{sibom_server.base_url}/cities/404") is None
+
+    def test_unsolicited_304_is_an_error(self, cache, sibom_server):
+        """Un 304 sin entrada cacheada falla en vez de guardarse como cuerpo vacío."""
+        sibom_server.routes['/cities/7'] = lambda headers: (304, {}, '')
+        client = HTTPClient(cache=cache)
+        with pytest.raises(requests.HTTPError):
+            client.fetch_text(f"{sibom_server.base_url}/cities/7", max_retries=1)
+        client.close()
+
+        assert cache.lookup(f"{sibom_server.base_url}/cities/7") is None
+
+
+class TestArchivedBodies:
+    """Las normas con archivo de HTML no duplican el cuerpo en el caché."""
+
+    NORM = '/bulletins/1/contents/2'
+
+    def test_norm_body_lives_in_archive(self, cache, tmp_path, sibom_server):
+        """La entrada guarda solo validadores y el hit se sirve del archivo."""
+        sibom_server.add_page(self.NORM, 'norma')
+        url = f"{sibom_server.base_url}{self.NORM}"
+        client = HTTPClient(cache=cache, archive=HTMLArchive(tmp_path / 'archive'))
+
+        first = client.fetch_text(url)
+        second = client.fetch_text(url)
+        client.close()
+
+        assert first == second == 'norma'
+        assert sibom_server.requests_for(self.NORM) == 1
+        entry = cache.lookup(url)
+        assert entry['archived'] and entry['body'] is None
+
+    def test_listings_keep_their_body(self, cache, tmp_path, sibom_server):
+        """Las páginas que vencen siguen con el cuerpo en el caché."""
+        sibom_server.add_page('/cities/22', 'listado')
+        url = f"{sibom_server.base_url}/cities/22"
+        client = HTTPClient(cache=cache, archive=HTMLArchive(tmp_path / 'archive'))
+
+        client.fetch_text(url)
+        client.close()
+
+        assert cache.lookup(url)['body'] == 'listado'
+
+    def test_archived_entry_without_archive_is_a_miss(self, cache, tmp_path, sibom_server):
+        """Sin el archivo (ej. --no-archive) la norma se vuelve a descargar."""
+        sibom_server.add_page(self.NORM, 'norma')
+        url = f"{sibom_server.base_url}{self.NORM}"
+        HTTPClient(cache=cache, archive=HTMLArchive(tmp_path / 'archive')).fetch_text(url)
+
+        html = HTTPClient(cache=cache).fetch_text(url)
+
+        assert html == 'norma'
+        assert sibom_server.requests_for(self.NORM) == 2
+        assert cache.lookup(url)['body'] == 'norma'
+
+    def test_old_entry_moves_to_archive(self, cache, tmp_path, sibom_server):
+        """Una norma cacheada con cuerpo pasa al archivo al servirla."""
+        sibom_server.add_page(self.NORM, 'norma')
+        url = f"{sibom_server.base_url}{self.NORM}"
+        HTTPClient(cache=cache).fetch_text(url)
+        archive = HTMLArchive(tmp_path / 'archive')
+
+        html = HTTPClient(cache=cache, archive=archive).fetch_text(url)
+
+        assert html == 'norma'
+        assert sibom_server.requests_for(self.NORM) == 1
+        assert archive.get(url) == 'norma'
+        assert cache.lookup(url)['body'] is None
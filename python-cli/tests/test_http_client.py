@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests para el motor de descarga HTTP (pool de conexiones + modo asyncio).
+"""
+
+import pytest
+import requests
+
+from http_client import HTTPClient
+
+
+@pytest.fixture
+def client():
+    """Cliente HTTP con pool pequeño"""
+    http = HTTPClient({'User-Agent': 'test'}, max_connections=4, timeout=5)
+    yield http
+    http.close()
+
+
+# ============================================================================
+# TESTS DE MODO SINCRÓNICO
+# ============================================================================
+
+class TestFetchText:
+    """Tests de descarga sincrónica."""
+
+    def test_fetch_text_returns_body(self, client, sibom_server):
+        """Devuelve el HTML de la página."""
+        sibom_server.add_page('/cities/22', '<html>Merlo</html>')
+
+        html = client.fetch_text(f"{sibom_server.base_url}/cities/22")
+
+        assert html == '<html>Merlo</html>'
+
+    def test_connections_are_reused(self, client, sibom_server):
+        """Peticiones sucesivas reutilizan la misma conexión keep-alive."""
+        sibom_server.add_page('/bulletins/1', 'uno')
+        sibom_server.add_page('/bulletins/2', 'dos')
+
+        for _ in range(3):
+            client.fetch_text(f"{sibom_server.base_url}/bulletins/1")
+            client.fetch_text(f"{sibom_server.base_url}/bulletins/2")
+
+        assert len(sibom_server.requests) == 6
+        assert len(sibom_server.connections) == 1
+
+    def test_headers_are_sent(self, client, sibom_server):
+        """Envía los headers configurados en la sesión."""
+        sibom_server.add_page('/cities/1', 'ok')
+
+        client.fetch_text(f"{sibom_server.base_url}/cities/1")
+
+        _, headers = sibom_server.requests[0]
+        assert headers['User-Agent'] == 'test'
+
+    def test_http_error_raises_after_retries(self, client, sibom_server):
+        """Propaga el error HTTP cuando se agotan los reintentos."""
+        with pytest.raises(requests.HTTPError):
+            client.fetch_text(f"{sibom_server.base_url}/missing", max_retries=1)
+
+
+# ============================================================================
+# TESTS DE MODO ASYNCIO
+# ============================================================================
+
+class TestFetchMany:
+    """Tests de descarga concurrente."""
+
+    def test_results_keep_input_order(self, client, sibom_server):
+        """Los resultados se alinean con el orden de las URLs."""
+        urls = []
+        for n in range(1, 11):
+            sibom_server.add_page(f'/cities/22?page={n}', f'pagina {n}')
+            urls.append(f"{sibom_server.base_url}/cities/22?page={n}")
+
+        results = client.fetch_many(urls)
+
+        assert results == [f'pagina {n}' for n in range(1, 11)]
+
+    def test_errors_are_returned_in_place(self, client, sibom_server):
+        """Un error en una URL no cancela las demás."""
+        sibom_server.add_page('/ok', 'ok')
+
+        results = client.fetch_many([
+            f"{sibom_server.base_url}/ok",
+            f"{sibom_server.base_url}/missing",
+        ], max_retries=1)
+
+        assert results[0] == 'ok'
+        assert isinstance(results[1], requests.HTTPError)
+
+    def test_connections_bounded_by_pool(self, client, sibom_server):
+        """Nunca abre más conexiones que el tamaño del pool."""
+        urls = []
+        for n in range(20):
+            sibom_server.add_page(f'/contents/{n}', 'x')
+            urls.append(f"{sibom_server.base_url}/contents/{n}")
+
+        client.fetch_many(urls)
+
+        assert len(sibom_server.connections) <= client.max_connections
+
+    def test_empty_list(self, client):
+        """Lista vacía no lanza el event loop."""
+        assert client.fetch_many([]) == []
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests para los sinks JSONL de índices globales y su consolidación en streaming.
+"""
+
+import json
+
+from index_spool import IndexSpool, iter_jsonl
+from monto_extractor import MontoExtractor
+from normativas_extractor import Normativa, save_index, save_indexes_from_jsonl, save_minimal_index
+
+
+def make_normativa(i, title='Ordenanza Fiscal e Impositiva'):
+    return Normativa(
+        id=str(i), municipality='Merlo', type='ordenanza', number=f'{i}/2025',
+        year='2025', date='01/02/2025', title=title, content=f'Artículo 1º: tasa «{i}»',
+        source_bulletin='Merlo_33', source_bulletin_url='https://sibom.slyt.gba.gob.ar/bulletins/1',
+        norma_url=f'https://sibom.slyt.gba.gob.ar/bulletins/1/contents/{i}',
+        doc_index=0, status='vigente', extracted_at='2025-02-01T00:00:00')
+
+
+def make_monto(i, municipio='Merlo'):
+    return {'municipio': municipio, 'boletin': '33', 'fecha': '01/02/2025',
+            'norma_tipo': 'Ordenanza', 'norma_numero': str(i), 'articulo': '1',
+            'concepto': 'tasa', 'monto': 1000.5 * i, 'moneda': 'ARS',
+            'texto_completo': f'Boletín 33º | {municipio}', 'fuente_url': ''}
+
+
+class TestJsonlSinks:
+    """Tests de IndexSpool / JsonlSink."""
+
+    def test_records_are_on_disk_before_close(self, tmp_path):
+        """Cada registro queda en disco apenas se agrega (sobrevive a una caída)."""
+        spool = IndexSpool(tmp_path / 'run')
+        spool.montos.append(make_monto(1))
+        spool.montos.append(make_monto(2))
+
+        assert list(iter_jsonl(spool.montos.path)) == [make_monto(1), make_monto(2)]
+        assert spool.montos.count == 2
+
+    def test_remove_deletes_run_dir(self, tmp_path):
+        """Tras consolidar, el spool de la corrida se elimina."""
+        spool = IndexSpool(tmp_path / 'run')
+        spool.normativas.append(make_normativa(1).to_dict())
+
+        spool.remove()
+
+        assert not spool.run_dir.exists()
+
+
+class TestStreamingConsolidation:
+    """La consolidación en una pasada produce los mismos índices que antes."""
+
+    def test_normativas_indexes_match_in_memory_writers(self, tmp_path):
+        """Completo, compacto y minimal son idénticos byte a byte."""
+        normativas = [make_normativa(1), make_normativa(2, 'x' * 150), make_normativa(3)]
+        save_index(normativas, tmp_path / 'full.json')
+        save_index(normativas, tmp_path / 'compact.json', compact=True)
+        save_minimal_index(normativas, tmp_path / 'minimal.json')
+
+        total = save_indexes_from_jsonl(
+            (n.to_dict() for n in normativas),
+            tmp_path / 's_full.json', tmp_path / 's_compact.json', tmp_path / 's_minimal.json')
+
+        assert total == 3
+        for name in ('full', 'compact', 'minimal'):
+            assert (tmp_path / f's_{name}.json').read_bytes() == (tmp_path / f'{name}.json').read_bytes()
+
+    def test_empty_normativas(self, tmp_path):
+        """Sin registros se generan listas vacías válidas."""
+        save_indexes_from_jsonl([], tmp_path / 'a.json', tmp_path / 'b.json', tmp_path / 'c.json')
+
+        assert [json.loads((tmp_path / n).read_text()) for n in ('a.json', 'b.json', 'c.json')] == [[], [], []]
+
+    def test_montos_index_matches(self, tmp_path):
+        """El índice de montos tiene los mismos registros y metadata."""
+        extractor = MontoExtractor()
+        records = [make_monto(1), make_monto(2, 'Lobos'), make_monto(3)]
+        extractor._save_index(records, tmp_path / 'montos.json')
+
+        total = extractor.save_index_from_jsonl(iter(records), tmp_path / 's_montos.json')
+
+        assert total == 3
+        assert json.loads((tmp_path / 's_montos.json').read_text(encoding='utf-8')) == \
+            json.loads((tmp_path / 'montos.json').read_text(encoding='utf-8'))
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests para la descarga concurrente de páginas de listado en scrape().
+"""
+
+import threading
+
+import pytest
+
+from conftest import listing_html
+
+
+def serve_pages(server, pages, city_id=22):
+    """Registra las páginas de listado (lista de listas de IDs)"""
+    for page_num, ids in enumerate(pages, 1):
+        html = listing_html(ids, total_pages=len(pages), city_id=city_id)
+        server.add_page(f'/cities/{city_id}?page={page_num}', html)
+        if page_num == 1:
+            server.add_page(f'/cities/{city_id}', html)
+
+
+@pytest.fixture
+def processed(scraper, monkeypatch, tmp_path):
+    """Reemplaza process_bulletin por un registro de los boletines recibidos"""
+    monkeypatch.chdir(tmp_path)
+    seen = []
+    lock = threading.Lock()
+
+    def fake_process(bulletin, base_url, output_dir, skip_existing=False):
+        with lock:
+            seen.append(bulletin['link'])
+        return {'number': bulletin['number'], 'status': 'completed'}
+
+    monkeypatch.setattr(scraper, 'process_bulletin', fake_process)
+    return seen
+
+
+class TestListingPrefetch:
+    """Tests de _iter_listing_pages y su uso desde scrape()."""
+
+    def test_results_keep_listing_order(self, scraper, sibom_server, processed):
+        """Los resultados respetan el orden página a página del listado."""
+        serve_pages(sibom_server, [[30, 29], [28, 27], [26, 25], [24]])
+
+        results = scraper.scrape(f"{sibom_server.base_url}/cities/22",
+                                 parallel=3, listing_workers=3)
+
+        assert [r['number'] for r in results] == [f'{n}º' for n in range(30, 23, -1)]
+        assert sorted(processed) == sorted(f'/bulletins/{n}' for n in range(24, 31))
+
+    def test_iter_yields_pages_in_order(self, scraper, sibom_server):
+        """Las páginas se entregan en orden aunque se descarguen en paralelo."""
+        serve_pages(sibom_server, [[10], [9], [8], [7], [6]])
+        list_url = f"{sibom_server.base_url}/cities/22"
+
+        pages = list(scraper._iter_listing_pages(list_url, range(2, 6), workers=4))
+
+        assert [p[0] for p in pages] == [2, 3, 4, 5]
+        assert [p[2][0]['link'] for p in pages] == ['/bulletins/9', '/bulletins/8',
+                                                    '/bulletins/7', '/bulletins/6']
+
+    def test_limit_stops_page_downloads(self, scraper, sibom_server, processed):
+        """Al alcanzar el límite no se piden más páginas que la ventana en vuelo."""
+        serve_pages(sibom_server, [[n] for n in range(40, 20, -1)])
+
+        results = scraper.scrape(f"{sibom_server.base_url}/cities/22",
+                                 limit=2, listing_workers=2)
+
+        assert len(results) == 2
+        fetched = [p for p, _ in sibom_server.requests if 'page=' in p]
+        assert len(fetched) <= 4
+
+    def test_failed_page_is_skipped(self, scraper, sibom_server, processed):
+        """Una página que falla no aborta el resto del listado."""
+        serve_pages(sibom_server, [[30], [29], [28]])
+        sibom_server.routes['/cities/22?page=2'] = lambda headers: (500, {}, b'error')
+
+        results = scraper.scrape(f"{sibom_server.base_url}/cities/22", listing_workers=2)
+
+        assert [r['number'] for r in results] == ['30º', '28º']
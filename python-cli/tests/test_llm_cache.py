@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests para el caché persistente de respuestas del LLM.
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from llm_cache import LLMCache, cache_key, normalize_prompt
+
+JSON_MODE = {"type": "json_object"}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Caché en directorio temporal"""
+    return LLMCache(tmp_path / 'llm_cache.db')
+
+
+class TestKeys:
+    """Tests de normalización y clave."""
+
+    def test_whitespace_only_differences_share_key(self):
+        a = "Extrae los boletines.\r\nHTML:   <div>\t1</div>  \n"
+        b = "Extrae los boletines.\nHTML: <div> 1</div>"
+        assert normalize_prompt(a) == normalize_prompt(b)
+        assert cache_key('m', a, JSON_MODE) == cache_key('m', b, JSON_MODE)
+
+    def test_model_and_format_are_part_of_key(self):
+        base = cache_key('model-a', 'prompt', JSON_MODE)
+        assert cache_key('model-b', 'prompt', JSON_MODE) != base
+        assert cache_key('model-a', 'prompt', None) != base
+        assert cache_key('model-a', 'otro prompt', JSON_MODE) != base
+
+
+class TestLLMCache:
+    """Tests de lectura, TTL y descarte por tamaño."""
+
+    def test_roundtrip_and_hit_rate(self, cache):
+        assert cache.get('m', 'p', JSON_MODE) is None
+        cache.put('m', 'p', '{"number": "105º"}', JSON_MODE)
+
+        assert cache.get('m', 'p', JSON_MODE) == '{"number": "105º"}'
+        summary = cache.summary()
+        assert summary['hits'] == 1
+        assert summary['misses'] == 1
+        assert summary['hit_rate'] == 0.5
+        assert summary['entries'] == 1
+
+    def test_persists_across_instances(self, tmp_path):
+        LLMCache(tmp_path / 'c.db').put('m', 'p', 'respuesta')
+        assert LLMCache(tmp_path / 'c.db').get('m', 'p') == 'respuesta'
+
+    def test_expired_entries_are_misses(self, tmp_path):
+        cache = LLMCache(tmp_path / 'c.db', ttl=0.05)
+        cache.put('m', 'p', 'respuesta')
+        time.sleep(0.1)
+
+        assert cache.get('m', 'p') is None
+        assert cache.summary()['expired'] == 1
+        assert cache.summary()['entries'] == 0
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = LLMCache(tmp_path / 'c.db', max_bytes=250)
+        cache.put('m', 'viejo', 'x' * 100)
+        cache.put('m', 'usado', 'y' * 100)
+        time.sleep(0.01)
+        assert cache.get('m', 'viejo') is not None  # "viejo" pasa a ser el más reciente
+        cache.put('m', 'nuevo', 'z' * 100)
+
+        assert cache.get('m', 'usado') is None
+        assert cache.get('m', 'viejo') is not None
+        assert cache.get('m', 'nuevo') is not None
+        assert cache.summary()['evictions'] == 1
+
+
+class TestScraperIntegration:
+    """Tests de _make_llm_call con caché."""
+
+    @pytest.fixture
+    def llm_scraper(self, scraper, tmp_path, monkeypatch):
+        calls = []
+
+        def create(**params):
+            calls.append(params)
+            content = '{"bulletins": []}' if len(calls) > 1 else 'no es json'
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+        scraper.llm_cache = scraper.llm.cache = LLMCache(tmp_path / 'llm.db')
+        scraper.rate_limiter.configure(scraper.LLM_HOST, rate=1000.0, burst=100)
+        monkeypatch.setattr(scraper.client.chat.completions, 'create', create)
+        return scraper, calls
+
+    def test_same_prompt_is_paid_once(self, llm_scraper):
+        """Un reintento con respuesta válida ya cacheada no vuelve al LLM."""
+        scraper, calls = llm_scraper
+        scraper._make_llm_call('prompt', use_json_mode=True)  # respuesta inválida: no se cachea
+        first = scraper._make_llm_call('prompt', use_json_mode=True)
+        second = scraper._make_llm_call('prompt  ', use_json_mode=True)
+
+        assert first == second == '{"bulletins": []}'
+        assert len(calls) == 2
+        assert scraper.metrics.snapshot()['counters']['llm_cache_hits'] == 1
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Tests para LLMClient: reintentos con backoff, timeouts, concurrencia
+acotada, coalescing de prompts en vuelo y métricas.
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+import llm_client
+from llm_client import LLMClient
+from rate_limiter import RateLimiter
+from run_metrics import RunMetrics
+
+
+class StatusError(Exception):
+    """Error del SDK con código HTTP (como openai.APIStatusError)"""
+
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(
+            headers={'retry-after': retry_after} if retry_after else {})
+
+
+class FakeCompletions:
+    """chat.completions con respuestas/errores programados"""
+
+    def __init__(self, outcomes=(), delay=0.0, usage=None):
+        self.outcomes = list(outcomes)
+        self.delay = delay
+        self.usage = usage
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+        self.release = None
+
+    def create(self, **params):
+        with self.lock:
+            self.calls.append(params)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            outcome = self.outcomes.pop(0) if self.outcomes else 'ok'
+        try:
+            if self.release is not None:
+                self.release.wait(5)
+            time.sleep(self.delay)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content=outcome))],
+                usage=self.usage)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    # Solo las esperas de backoff de llm_client (no las del rate limiter)
+    sleeps = []
+    monkeypatch.setattr(llm_client, 'time',
+                        SimpleNamespace(sleep=sleeps.append, perf_counter=time.perf_counter))
+    return sleeps
+
+
+def make_client(completions, **kwargs):
+    kwargs.setdefault('metrics', RunMetrics())
+    return LLMClient(SimpleNamespace(chat=SimpleNamespace(completions=completions)),
+                     'modelo', **kwargs)
+
+
+class TestRetries:
+    """Backoff exponencial ante errores transitorios."""
+
+    def test_retries_5xx_with_backoff(self, no_sleep):
+        completions = FakeCompletions([StatusError(502), StatusError(500), 'listo'])
+        llm = make_client(completions, backoff_base=1.0)
+
+        assert llm.complete('prompt') == 'listo'
+        assert len(completions.calls) == 3
+        assert len(no_sleep) == 2
+        assert 0.5 <= no_sleep[0] <= 1.0 and 1.0 <= no_sleep[1] <= 2.0
+        assert llm.metrics.snapshot()['counters']['llm_retries'] == 2
+
+    def test_throttling_waits_in_rate_limiter(self, no_sleep):
+        limiter = RateLimiter()
+        limiter.configure('llm', rate=1000.0, burst=100)
+        completions = FakeCompletions([StatusError(429, retry_after='0'), 'listo'])
+        llm = make_client(completions, rate_limiter=limiter, host='llm')
+
+        assert llm.complete('prompt') == 'listo'
+        # La espera de Retry-After la impone el token bucket, no un sleep extra
+        assert no_sleep == []
+        assert limiter.stats()['llm']['penalties'] == 1
+
+    def test_client_errors_are_not_retried(self, no_sleep):
+        completions = FakeCompletions([StatusError(400)])
+        llm = make_client(completions)
+
+        with pytest.raises(StatusError):
+            llm.complete('prompt')
+        assert len(completions.calls) == 1
+        assert llm.metrics.snapshot()['counters']['llm_errors'] == 1
+
+    def test_gives_up_after_max_retries(self, no_sleep):
+        completions = FakeCompletions([StatusError(503)] * 5)
+        llm = make_client(completions, max_retries=2)
+
+        with pytest.raises(StatusError):
+            llm.complete('prompt')
+        assert len(completions.calls) == 3
+
+    def test_timeouts_are_retryable(self):
+        request = httpx.Request('POST', 'https://openrouter.ai/api/v1/chat/completions')
+
+        assert LLMClient.is_retryable(openai.APITimeoutError(request))
+        assert LLMClient.is_retryable(openai.APIConnectionError(request=request))
+        assert not LLMClient.is_retryable(ValueError('json inválido'))
+
+    def test_per_call_timeout(self):
+        completions = FakeCompletions()
+        make_client(completions, timeout=7.5).complete('prompt', {"type": "json_object"})
+
+        assert completions.calls[0]['timeout'] == 7.5
+        assert completions.calls[0]['response_format'] == {"type": "json_object"}
+
+
+class TestConcurrency:
+    """Concurrencia acotada y coalescing entre workers."""
+
+    def test_bounded_concurrency(self):
+        completions = FakeCompletions(delay=0.05)
+        llm = make_client(completions, max_concurrency=2)
+
+        threads = [threading.Thread(target=llm.complete, args=(f'prompt {i}',))
+                   for i in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(completions.calls) == 6
+        assert completions.peak == 2
+        assert llm.metrics.snapshot()['gauges']['llm_concurrency_peak'] == 2
+
+    def _concurrent(self, llm, completions, prompt, workers=5):
+        completions.release = threading.Event()
+        results, errors = [], []
+
+        def worker():
+            try:
+                results.append(llm.complete(prompt))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while (llm.metrics.snapshot()['counters'].get('llm_coalesced', 0) < workers - 1
+               and time.monotonic() < deadline):
+            time.sleep(0.01)
+        completions.release.set()
+        for thread in threads:
+            thread.join()
+        return results, errors
+
+    def test_identical_prompts_are_coalesced(self):
+        completions = FakeCompletions(['respuesta'])
+        llm = make_client(completions)
+
+        results, errors = self._concurrent(llm, completions, 'mismo prompt')
+
+        assert results == ['respuesta'] * 5 and errors == []
+        assert len(completions.calls) == 1
+        assert llm.metrics.snapshot()['counters']['llm_coalesced'] == 4
+
+    def test_coalesced_failure_reaches_every_waiter(self):
+        completions = FakeCompletions([StatusError(400)])
+        llm = make_client(completions)
+
+        results, errors = self._concurrent(llm, completions, 'mismo prompt')
+
+        assert results == [] and len(errors) == 5
+        assert len(completions.calls) == 1
+        # Terminada la llamada, el prompt deja de estar en vuelo
+        assert llm.complete('mismo prompt') == 'ok'
+
+
+def test_token_usage_metrics():
+    usage = SimpleNamespace(prompt_tokens=1200, completion_tokens=80)
+    llm = make_client(FakeCompletions(usage=usage))
+
+    llm.complete('a')
+    llm.complete('b')
+
+    snap = llm.metrics.snapshot()
+    assert snap['counters']['llm_calls'] == 2
+    assert snap['counters']['llm_prompt_tokens'] == 2400
+    assert snap['counters']['llm_completion_tokens'] == 160
+    assert snap['stages']['llm_call']['count'] == 2
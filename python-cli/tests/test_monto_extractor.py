@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests para el scanner de montos de MontoExtractor: mismos resultados que
+AMOUNT_PATTERN y la búsqueda de conceptos por palabra clave, en una pasada.
+"""
+
+import random
+import re
+
+import pytest
+
+from monto_extractor import MontoExtractor
+
+# Fragmentos que combinan los casos difíciles del patrón: "$" sin número,
+# prefijos PESOS/CIENTO, centavos, mayúsculas y palabras clave superpuestas
+FRAGMENTS = ['$', '$ ', '$$', 'PESOS ', 'pesos\n', 'Pesos', 'CIENTO ', '1', '23', '.', '456',
+             ',', ' , 5', ' con ', '12', ' centavos', 'x', '\n', ' ', 'Tasa ', 'SUELDO',
+             ' subsidio', 'subsidio', 'crédito', 'credito', 'beca', 'beneficio', 'Obra ']
+
+
+def reference_amounts(text):
+    # El prefijo "PESOS ..." no contiene "$": el primero desde el inicio es el del monto
+    return [(m.start(), text.index('$', m.start()), m.group(1), m.group(2))
+            for m in MontoExtractor.AMOUNT_PATTERN.finditer(text)]
+
+
+def reference_concept(context):
+    # Implementación original: una regex por palabra clave
+    for keyword in MontoExtractor.CONTEXT_KEYWORDS:
+        if keyword.lower() in context.lower():
+            match = re.search(rf'.{{0,50}}{re.escape(keyword)}.{{0,100}}', context, re.IGNORECASE)
+            if match:
+                return re.sub(r'\s+', ' ', match.group(0).strip())[:150]
+    return ' '.join(context.split()[:10])
+
+
+def random_texts(count, seed=7):
+    rng = random.Random(seed)
+    return [''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 50)))
+            for _ in range(count)]
+
+
+@pytest.fixture
+def extractor():
+    return MontoExtractor()
+
+
+class TestScanner:
+    """_iter_amounts da lo mismo que AMOUNT_PATTERN.finditer."""
+
+    @pytest.mark.parametrize('text', [
+        'Fíjase en $ 155.162,86 el monto',
+        'la suma de PESOS CIENTO VEINTE MIL ($ 120.000,00)',
+        'PESOS $100',           # Sin texto entre PESOS y "$": el prefijo no aplica
+        'PESOS  $100',          # Dos espacios: sí aplica
+        'PESOS DOS $ s/n y $ 2.000',
+        '$ 1.500 con 50 centavos',
+        '$ 155162,86',
+        '',
+    ])
+    def test_known_cases(self, extractor, text):
+        assert list(extractor._iter_amounts(text)) == reference_amounts(text)
+
+    def test_random_texts(self, extractor):
+        for text in random_texts(3000):
+            assert list(extractor._iter_amounts(text)) == reference_amounts(text), text
+
+    def test_many_pesos_before_invalid_dollar(self, extractor):
+        """El caso cuadrático del patrón con prefijo lazy."""
+        text = 'PESOS con cargo a la partida ' * 2000 + '$ s/n, PESOS MIL ($ 1.000,00)'
+
+        amounts = list(extractor._iter_amounts(text))
+
+        assert amounts == [(text.rindex('PESOS MIL'), text.rindex('$'), '1.000,00', None)]
+
+
+class TestConcept:
+    """Palabras clave en una pasada, con la prioridad de CONTEXT_KEYWORDS."""
+
+    def test_random_contexts(self, extractor):
+        for text in random_texts(3000, seed=11):
+            assert extractor._extract_concept(text, text) == reference_concept(text), text
+
+    def test_list_order_wins_over_position(self, extractor):
+        context = 'Subsidio por única vez y sueldo básico de $ 10.000'
+
+        assert extractor._extract_concept(context, context) == context
+
+    def test_without_keywords(self, extractor):
+        context = 'uno dos tres cuatro cinco seis siete ocho nueve diez once'
+
+        assert extractor._extract_concept(context, context) == ' '.join(context.split()[:10])
+
+
+class TestAttribution:
+    """Norma y artículo de cada monto: los más cercanos antes del monto."""
+
+    def attribution(self, extractor, text):
+        records = extractor.extract_from_boletin({'description': '1º de Merlo', 'text_content': text})
+        return [(r.norma_tipo, r.norma_numero, r.articulo, r.monto) for r in records]
+
+    def test_closest_article(self, extractor):
+        text = ('DECRETO Nº 45/2025\nARTÍCULO 1º: Otórgase un subsidio de $ 1.000. '
+                'ARTÍCULO 2º: Fíjase la tasa en $ 2.000. ARTÍCULO 3º: Comuníquese.')
+
+        assert self.attribution(extractor, text) == [
+            ('Decreto', '45/2025', '1', 1000.0), ('Decreto', '45/2025', '2', 2000.0)]
+
+    def test_norm_header_far_before_amount(self, extractor):
+        text = 'ORDENANZA Nº 7\n' + 'Visto y considerando. ' * 60 + 'ARTÍCULO 4º: $ 300'
+
+        assert self.attribution(extractor, text) == [('Ordenanza', '7', '4', 300.0)]
+
+    def test_article_of_previous_norm_is_not_used(self, extractor):
+        text = ('ORDENANZA Nº 7\nARTÍCULO 9º: Comuníquese.\n'
+                'RESOLUCIÓN Nº 12\nVisto el pedido por $ 500')
+
+        assert self.attribution(extractor, text) == [('Resolución', '12', 'S/N', 500.0)]
+
+    def test_pesos_prefix_spanning_earlier_norms(self, extractor):
+        """El prefijo "PESOS ..." llega hasta la norma anterior: cuenta el "$"."""
+        text = ('ORDENANZA Nº 1\nARTÍCULO 1º: Se abonan PESOS en cuotas.\n'
+                'ORDENANZA Nº 2\nARTÍCULO 5º: Fíjase la tasa en $ 500.')
+
+        assert self.attribution(extractor, text) == [('Ordenanza', '2', '5', 500.0)]
+
+    def test_without_markers(self, extractor):
+        assert self.attribution(extractor, 'Monto total: $ 500') == [('Norma', 'S/N', 'S/N', 500.0)]
+
+    def test_index_offsets(self, extractor):
+        text = 'Decreto Nº 1 artículo 2 ARTICULO Nº 3 Edito N° 4'
+
+        index = extractor._index_markers(text)
+
+        assert index.norma_offsets == [0, text.index('Edito')]
+        assert index.normas == [('Decreto', '1'), ('Edicto', '4')]
+        assert index.articulos == ['2', '3']
+        assert index.norma_at(5) == (0, 'Decreto', '1')
+        assert index.articulo_at(text.index('Edito'), since=0) == '3'
+
+
+def test_extract_from_boletin(extractor):
+    boletin = {
+        'description': '105º de Carlos Tejedor',
+        'date': '02/01/2026',
+        'text_content': ('ORDENANZA Nº 1234\nARTÍCULO 2º: Fíjase la tasa de '
+                         'PESOS MIL QUINIENTOS ($ 1.500,00) por inspección.'),
+    }
+
+    [record] = extractor.extract_from_boletin(boletin)
+
+    assert (record.municipio, record.boletin, record.monto) == ('Carlos Tejedor', '105', 1500.0)
+    assert (record.norma_tipo, record.norma_numero, record.articulo) == ('Ordenanza', '1234', '2')
+    assert record.concepto.startswith('ARTÍCULO 2º: Fíjase la tasa')
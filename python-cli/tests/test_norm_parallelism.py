@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests para el scraping paralelo de normas dentro de un boletín.
+"""
+
+import threading
+import time
+
+from progress_journal import ProgressJournal
+
+
+def make_normas(count):
+    return [{'id': str(100 + i), 'titulo': f'Decreto Nº {i}', 'tipo': 'decreto',
+             'fecha': '01/01/2025', 'url': f'/bulletins/1/contents/{100 + i}'}
+            for i in range(count)]
+
+
+NORM_HTML = ('<html><body><div id="frontend-container"><p>Decreto</p>'
+             '<p>' + 'Visto el expediente y considerando lo dispuesto. ' * 5 + '</p>'
+             '<p>Artículo 1: Fíjase el monto de $ 1.500,00.</p></div></body></html>')
+
+
+def fake_fetch(delays, active, peak):
+    """fetch_html falso: duerme según la norma y mide descargas concurrentes"""
+    lock = threading.Lock()
+
+    def fetch(url, max_retries=3):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(delays.get(url.rsplit('/', 1)[-1], 0.01))
+        with lock:
+            active[0] -= 1
+        return NORM_HTML
+
+    return fetch
+
+
+class TestScrapeNorms:
+    """Tests de _scrape_norms."""
+
+    def test_keeps_original_order(self, scraper, monkeypatch, tmp_path):
+        """Las normas vuelven en el orden del boletín aunque terminen desordenadas."""
+        normas = make_normas(6)
+        delays = {'100': 0.08, '101': 0.01, '102': 0.05}
+        active, peak = [0], [0]
+        monkeypatch.setattr(scraper, 'fetch_html', fake_fetch(delays, active, peak))
+        scraper.norm_workers = 3
+
+        result = []
+        scraper._scrape_norms(normas, {}, 'http://x', 'Merlo',
+                              ProgressJournal(tmp_path, '1'), result.append)
+
+        assert [n['id'] for n in result] == [n['id'] for n in normas]
+        assert 1 < peak[0] <= 3
+        assert result[0]['montos_extraidos'][0]['monto'] == 1500.0
+
+    def test_single_worker_is_sequential(self, scraper, monkeypatch, tmp_path):
+        """Con norm_workers=1 nunca hay dos normas en vuelo."""
+        active, peak = [0], [0]
+        monkeypatch.setattr(scraper, 'fetch_html', fake_fetch({}, active, peak))
+        scraper.norm_workers = 1
+
+        scraper._scrape_norms(make_normas(4), {}, 'http://x', 'Merlo',
+                              ProgressJournal(tmp_path, '1'), lambda norma: None)
+
+        assert peak[0] == 1
+
+    def test_resumes_from_journal(self, scraper, monkeypatch, tmp_path):
+        """Las normas del journal se reutilizan y las nuevas quedan registradas."""
+        normas = make_normas(5)
+        active, peak = [0], [0]
+        monkeypatch.setattr(scraper, 'fetch_html', fake_fetch({}, active, peak))
+        journal = ProgressJournal(tmp_path, '7')
+        completadas = {'100': {'id': '100', 'cached': True}, '101': None}
+
+        result = []
+        scraper._scrape_norms(normas, completadas, 'http://x', 'Merlo', journal, result.append)
+        journal.close()
+
+        assert [n['id'] for n in result] == [n['id'] for n in normas]
+        assert result[0] == {'id': '100', 'cached': True}
+        assert sorted(ProgressJournal(tmp_path, '7').load()) == ['101', '102', '103', '104']
+
+    def test_window_bounds_norms_in_memory(self, scraper, monkeypatch, tmp_path):
+        """Una norma lenta al frente no deja que el resto se acumule sin límite."""
+        normas = make_normas(20)
+        started = []
+        active, peak = [0], [0]
+        slow = fake_fetch({'100': 0.2}, active, peak)
+
+        def fetch(url, max_retries=3):
+            started.append(url)
+            return slow(url)
+
+        monkeypatch.setattr(scraper, 'fetch_html', fetch)
+        scraper.norm_workers = 2
+        seen_at_first_emit = []
+
+        def emit(norma):
+            if not seen_at_first_emit:
+                seen_at_first_emit.append(len(started))
+
+        scraper._scrape_norms(normas, {}, 'http://x', 'Merlo', ProgressJournal(tmp_path, '1'), emit)
+
+        assert seen_at_first_emit[0] <= 4
+        assert len(started) == 20
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests para el parseo de normas sobre un único documento parseado.
+"""
+
+import pytest
+from bs4 import BeautifulSoup
+
+import norm_parser
+from norm_parser import ParsedDocument, build_norm, extract_content, extract_text, page_text
+from table_extractor import TableExtractor
+
+TEXT_HTML = """<!DOCTYPE html><html><head><title>Decreto</title><script>var a = 1;</script></head>
+<body><!-- menú --><nav>Inicio</nav><div id="frontend-container">
+<p>Decreto Nº 12/2024</p><p>Visto el expediente <b>4059-1</b> &amp; considerando:</p>
+<noscript>activar js</noscript><p>Artículo 1: Fíjase la tasa en $ 1.500,00 mensuales.</p>
+<p>Artículo 2: Comuníquese, publíquese y archívese.</p></div></body></html>"""
+
+TABLE_HTML = """<html><body><div id="frontend-container">
+<p>Ordenanza Nº 2319 - Tasas por servicios</p>
+<table><tr><th>Concepto</th><th>Monto</th></tr>
+<tr><td>Alumbrado</td><td>$ 1.200,50</td></tr><tr><td>Barrido</td><td>$ 800,00</td></tr></table>
+<p>Artículo 2: Comuníquese, publíquese y archívese en el registro oficial.</p>
+</div></body></html>"""
+
+META = {'id': '55', 'tipo': 'decreto', 'titulo': 'Decreto Nº 12/2024', 'fecha': '01/01/2024'}
+
+
+@pytest.fixture
+def soup_count(monkeypatch):
+    """Cuenta los árboles BeautifulSoup construidos por norm_parser"""
+    count = [0]
+
+    def counting_soup(*args, **kwargs):
+        count[0] += 1
+        return BeautifulSoup(*args, **kwargs)
+
+    monkeypatch.setattr(norm_parser, 'BeautifulSoup', counting_soup)
+    return count
+
+
+class TestParsedDocument:
+    """Tests del camino rápido lxml y del parseo único."""
+
+    def test_page_text_matches_table_extractor(self):
+        """El texto lxml es idéntico al de TableExtractor sobre BeautifulSoup."""
+        expected = TableExtractor()._extract_text_content(BeautifulSoup(TEXT_HTML, 'lxml'))
+
+        assert page_text(ParsedDocument(TEXT_HTML)) == expected
+
+    def test_no_tables_never_builds_soup(self, soup_count):
+        """Sin <table> no se construye ningún árbol BeautifulSoup."""
+        text, tables = extract_content(ParsedDocument(TEXT_HTML))
+
+        assert soup_count[0] == 0
+        assert tables == [] and 'Fíjase la tasa' in text and 'var a' not in text
+
+    def test_tables_parse_once(self, soup_count):
+        """Con tablas, el árbol se construye una vez y el texto lleva placeholders."""
+        text, tables = extract_content(ParsedDocument(TABLE_HTML))
+
+        assert soup_count[0] == 1
+        assert '[TABLA_1]' in text and len(tables) == 1
+
+    def test_extract_text_strategies(self):
+        text, strategy = extract_text(ParsedDocument(TEXT_HTML))
+        assert strategy == "ID #frontend-container"
+        assert text.startswith('Decreto Nº 12/2024\nVisto el expediente\n4059-1')
+
+        body_html = "<html><body><header>cabecera</header><p>" + "texto del cuerpo " * 10 + "</p></body></html>"
+        text, strategy = extract_text(body_html)
+        assert strategy == "<body> limpio" and 'cabecera' not in text
+
+    def test_short_or_empty_documents(self):
+        with pytest.raises(ValueError, match='demasiado corto'):
+            extract_text('<p>corto</p>')
+        assert page_text(ParsedDocument('<!-- solo un comentario -->' * 3)) == ''
+
+    def test_build_norm(self):
+        norma = build_norm((META, 'http://x/55', TABLE_HTML, None, 'Merlo'))
+        assert norma['numero'] == '12/2024'
+        assert norma['metadata']['total_tablas'] == 1
+
+        failed = build_norm((META, 'http://x/55', None, 'timeout', 'Merlo'))
+        assert failed['metadata'] == {'error': 'timeout', 'scraping_failed': True}
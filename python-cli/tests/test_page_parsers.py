@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Tests para los parsers de listado, paginación y enlaces a normas.
+"""
+
+import pytest
+
+import page_parsers
+from conftest import bulletin_html, listing_html
+
+
+class TestFastPathMatchesSoup:
+    """El camino XPath/lxml da lo mismo que BeautifulSoup."""
+
+    def test_listing(self):
+        html = listing_html([1650, 1649, 1648], total_pages=3, city_name="Carlos Tejedor")
+
+        bulletins = page_parsers.parse_listing_lxml(html)
+
+        assert bulletins == page_parsers.parse_listing_soup(html)
+        assert bulletins[0] == {'number': '650º', 'date': '02/01/2026',
+                                'description': '650º de Carlos Tejedor', 'link': '/bulletins/1650'}
+
+    @pytest.mark.parametrize('total_pages', [1, 2, 14])
+    def test_total_pages(self, total_pages):
+        html = listing_html([1650], total_pages=total_pages)
+
+        assert page_parsers.detect_total_pages_lxml(html) == total_pages
+        assert page_parsers.detect_total_pages_soup(html) == total_pages
+
+    def test_total_pages_without_last_link(self):
+        html = ('<ul class="pagination"><li><a href="/cities/22?page=2">2</a></li>'
+                '<li><a href="/cities/22?page=5">5</a></li></ul>')
+
+        assert page_parsers.detect_total_pages_lxml(html) == 5 == page_parsers.detect_total_pages_soup(html)
+
+    def test_content_links(self):
+        html = bulletin_html([1270278, 1270279, 1270280])
+
+        normas = page_parsers.parse_content_links_lxml(html)
+
+        assert normas == page_parsers.parse_content_links_soup(html)
+        assert [n['tipo'] for n in normas] == ['ordenanza', 'decreto', 'resolución']
+        assert normas[0]['titulo'] == 'Ordenanza Nº 1000'
+        assert normas[0]['fecha'] == 'Merlo, 02/01/2026'
+        assert normas[0]['preview'] == ('Visto el expediente 1270278 y considerando '
+                                        'Que es necesario fijartasasy derechos')
+
+
+class TestScraperFallback:
+    """El scraper usa BeautifulSoup solo si el camino rápido no encuentra nada."""
+
+    def test_fast_path_result_is_used(self, scraper, monkeypatch):
+        monkeypatch.setattr('sibom_scraper.parse_listing_soup',
+                            lambda html: pytest.fail('no debería usar BeautifulSoup'))
+
+        assert len(scraper.parse_listing_page(listing_html([1, 2]), 'u')) == 2
+
+    def test_falls_back_to_soup(self, scraper, monkeypatch):
+        monkeypatch.setattr('sibom_scraper.parse_content_links_lxml', lambda html: [])
+        calls = []
+
+        def soup_parser(html):
+            calls.append(html)
+            return page_parsers.parse_content_links_soup(html)
+
+        monkeypatch.setattr('sibom_scraper.parse_content_links_soup', soup_parser)
+
+        assert len(scraper.parse_bulletin_content_links(bulletin_html([7, 8]))) == 2
+        assert len(calls) == 1
+
+
+class TestBulletinMetadata:
+    """Metadatos de la página de un boletín sin pasar por el LLM."""
+
+    def test_header(self):
+        html = bulletin_html([1270278, 1270279], number=105, city_name="Carlos Tejedor")
+
+        assert page_parsers.parse_bulletin_metadata_lxml(html) == {
+            'number': '105º', 'date': '02/01/2026',
+            'description': '105º de Carlos Tejedor', 'link': ''}
+
+    def test_heading_and_title(self):
+        html = ('<html><head><title>Boletín 98º - Merlo</title></head><body>'
+                '<h2>Boletín Oficial 98º de Merlo</h2><p>Publicado el 3/1/2025</p></body></html>')
+
+        metadata = page_parsers.parse_bulletin_metadata_lxml(html)
+
+        assert metadata['number'] == '98º'
+        assert metadata['description'] == 'Boletín Oficial 98º de Merlo'
+        assert metadata['date'] == '3/1/2025'
+
+    def test_norm_dates_are_not_publication_date(self):
+        html = ('<html><body><h3>98º de Merlo</h3>'
+                + bulletin_html([1])[len('<html><body>'):])
+
+        assert page_parsers.parse_bulletin_metadata_lxml(html)['date'] == 'N/A'
+
+    def test_without_number(self):
+        assert page_parsers.parse_bulletin_metadata_lxml(bulletin_html([1, 2])) is None
+
+
+class TestPruneHtml:
+    """Reducción del HTML antes de mandarlo al LLM."""
+
+    PAGE = ('<html><head><title>SIBOM</title><meta charset="utf-8">'
+            '<script>var tracking = 1;</script><style>.x { color: red }</style></head>'
+            '<body><nav class="navbar"><a href="/">Inicio</a></nav><!-- banner -->'
+            '<div class="container" id="main" style="margin: 0" data-x="1">'
+            '<h3 class="bulletin-title">105º de Merlo</h3><i class="fa fa-calendar"></i>'
+            '<span></span> Publicado el 02/01/2026 </div>'
+            '<footer>Redes Sociales</footer></body></html>')
+
+    def test_keeps_content_and_drops_noise(self):
+        pruned = page_parsers.prune_html(self.PAGE)
+
+        assert '105º de Merlo' in pruned
+        assert 'Publicado el 02/01/2026' in pruned
+        assert '<title>SIBOM</title>' in pruned
+        for noise in ('tracking', 'color: red', 'navbar', 'banner', 'Redes Sociales',
+                      'style=', 'data-x', 'id=', 'fa-calendar', '<span>', '<meta'):
+            assert noise not in pruned
+
+    def test_drop(self):
+        html = bulletin_html([1, 2], number=105)
+
+        pruned = page_parsers.prune_html(html, drop=page_parsers.CONTENT_LINKS_PATH)
+
+        assert 'content-link' not in pruned
+        assert page_parsers.parse_bulletin_metadata_lxml(pruned)['number'] == '105º'
+
+    def test_parsers_still_work_on_pruned_html(self):
+        html = listing_html([1650, 1649], total_pages=14)
+
+        pruned = page_parsers.prune_html(html)
+
+        assert len(pruned) < len(html)
+        assert page_parsers.parse_listing_lxml(pruned) == page_parsers.parse_listing_lxml(html)
+        assert page_parsers.detect_total_pages_lxml(pruned) == 14
+
+    def test_max_chars(self):
+        assert len(page_parsers.prune_html(listing_html(range(1600, 1650)), max_chars=500)) == 500
+
+
+class TestBulletinMetadataInScraper:
+    """Modo boletín individual: el LLM solo si el DOM no alcanza."""
+
+    def test_dom_without_llm(self, scraper, monkeypatch):
+        monkeypatch.setattr(scraper, 'fetch_html', lambda url: bulletin_html([1], number=105))
+        monkeypatch.setattr(scraper, '_make_llm_call',
+                            lambda *args, **kwargs: pytest.fail('no debería llamar al LLM'))
+
+        metadata = scraper.fetch_bulletin_metadata('https://sibom/bulletins/1636', '1636')
+
+        assert metadata == {'number': '105º', 'date': '02/01/2026',
+                            'description': '105º de Merlo', 'link': '/bulletins/1636'}
+        assert scraper.metrics.snapshot()['counters']['bulletin_metadata_dom'] == 1
+
+    def test_llm_gets_pruned_html(self, scraper, monkeypatch):
+        page = bulletin_html(range(1, 40)).replace(
+            '<body>', '<body><script>' + 'x' * 5000 + '</script><p>Edición especial</p>')
+        prompts = []
+
+        def fake_llm(prompt, use_json_mode=True):
+            prompts.append(prompt)
+            return '{"number": "7º", "date": "01/02/2026", "description": "Edición especial"}'
+
+        monkeypatch.setattr(scraper, 'fetch_html', lambda url: page)
+        monkeypatch.setattr(scraper, '_make_llm_call', fake_llm)
+
+        metadata = scraper.fetch_bulletin_metadata('https://sibom/bulletins/9', '9')
+
+        assert metadata['number'] == '7º' and metadata['link'] == '/bulletins/9'
+        assert 'Edición especial' in prompts[0]
+        assert 'content-link' not in prompts[0] and 'xxxx' not in prompts[0]
+        counters = scraper.metrics.snapshot()['counters']
+        assert counters['llm_html_chars_sent'] < counters['llm_html_chars_raw'] / 10
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests para el pipeline por etapas (fetch -> process -> write).
+"""
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from pipeline import Pipeline
+
+
+class TestPipeline:
+    """Tests de Pipeline."""
+
+    def test_results_in_input_order(self):
+        """Los resultados salen en orden aunque las descargas terminen desordenadas."""
+        def fetch(n):
+            time.sleep(0.03 if n % 3 == 0 else 0.001)
+            return n
+
+        pipeline = Pipeline(fetch, lambda n: n * 10, fetch_workers=4, process_workers=2)
+
+        assert list(pipeline.run(range(12))) == [n * 10 for n in range(12)]
+        metrics = pipeline.metrics()
+        assert metrics['fetch']['processed'] == metrics['write']['processed'] == 12
+        assert metrics['fetch']['throughput'] > 0
+
+    def test_backpressure_bounds_items_in_flight(self):
+        """Un escritor lento frena la entrada: nunca hay más de max_in_flight admitidos."""
+        fetched = []
+        pipeline = Pipeline(lambda n: fetched.append(n) or n, lambda n: n,
+                            fetch_workers=2, max_in_flight=3)
+        written = 0
+
+        for _ in pipeline.run(range(20)):
+            time.sleep(0.01)
+            written += 1
+            assert len(fetched) <= written + 3
+
+        assert written == 20
+        assert pipeline.metrics()['fetch']['max_queue_depth'] <= 3
+
+    def test_stage_errors_raise_at_their_position(self):
+        """Una excepción de una etapa se relanza en el escritor, después de lo anterior."""
+        def process(n):
+            if n == 3:
+                raise ValueError('norma rota')
+            return n
+
+        written = []
+        with pytest.raises(ValueError, match='norma rota'):
+            for n in Pipeline(lambda n: n, process, fetch_workers=3).run(range(10)):
+                written.append(n)
+
+        assert written == [0, 1, 2]
+
+    def test_consumer_break_stops_stages(self):
+        """Si el escritor deja de iterar, los hilos de las etapas terminan."""
+        before = threading.active_count()
+        results = Pipeline(lambda n: n, lambda n: n, fetch_workers=3).run(range(1000))
+        next(results)
+        results.close()
+
+        assert threading.active_count() <= before
+
+    def test_process_pool_stage(self):
+        """La etapa de CPU corre en un pool de procesos."""
+        with ProcessPoolExecutor(2, mp_context=multiprocessing.get_context('spawn')) as pool:
+            pipeline = Pipeline(lambda n: 'x' * n, len, fetch_workers=2,
+                                process_pool=pool, process_workers=2)
+            assert list(pipeline.run(range(8))) == list(range(8))
+        assert pipeline.metrics()['process']['processed'] == 8
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests para el journal de progreso append-only.
+"""
+
+import json
+
+from progress_journal import ProgressJournal
+
+
+class TestProgressJournal:
+    """Tests de ProgressJournal."""
+
+    def test_roundtrip_payloads(self, tmp_path):
+        """Las normas agregadas se recuperan con su contenido."""
+        journal = ProgressJournal(tmp_path, '1636')
+        journal.append('10', {'id': '10', 'contenido': 'Artículo 1º'})
+        journal.append('11', {'id': '11', 'contenido': 'Artículo 2º'})
+        journal.close()
+
+        loaded = ProgressJournal(tmp_path, '1636').load()
+
+        assert loaded == {'10': {'id': '10', 'contenido': 'Artículo 1º'},
+                          '11': {'id': '11', 'contenido': 'Artículo 2º'}}
+
+    def test_append_does_not_rewrite(self, tmp_path):
+        """Cada norma agrega exactamente una línea."""
+        journal = ProgressJournal(tmp_path, '1', fsync_every=2)
+        for i in range(5):
+            journal.append(str(i), {'id': str(i)})
+        journal.close()
+
+        assert len(journal.path.read_text(encoding='utf-8').splitlines()) == 5
+
+    def test_ignores_truncated_last_line(self, tmp_path):
+        """Una línea cortada por un crash no impide retomar."""
+        journal = ProgressJournal(tmp_path, '1')
+        journal.append('10', {'id': '10'})
+        journal.close()
+        with journal.path.open('a', encoding='utf-8') as f:
+            f.write('{"id": "11", "norma": {"id"')
+
+        assert list(ProgressJournal(tmp_path, '1').load()) == ['10']
+
+    def test_reads_legacy_progress_without_payload(self, tmp_path):
+        """El formato anterior aporta IDs sin contenido (se vuelven a scrapear)."""
+        legacy = tmp_path / '.progress_1.json'
+        legacy.write_text(json.dumps({'normas_procesadas': ['10', '11'],
+                                      'normas_pendientes': ['12']}))
+        journal = ProgressJournal(tmp_path, '1')
+        journal.append('11', {'id': '11'})
+        journal.close()
+
+        assert ProgressJournal(tmp_path, '1').load() == {'10': None, '11': {'id': '11'}}
+
+    def test_remove_deletes_both_formats(self, tmp_path):
+        """Al completar el boletín no quedan archivos de progreso."""
+        (tmp_path / '.progress_1.json').write_text('{}')
+        journal = ProgressJournal(tmp_path, '1')
+        journal.append('10', {'id': '10'})
+
+        journal.remove()
+
+        assert not journal.exists()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests para el rate limiter por host (token buckets).
+"""
+
+import threading
+import time
+
+import pytest
+
+from http_client import HTTPClient
+from rate_limiter import RateLimiter, TokenBucket, host_of, parse_retry_after
+
+
+# ============================================================================
+# TESTS DE TOKEN BUCKET
+# ============================================================================
+
+class TestTokenBucket:
+    """Tests del token bucket individual."""
+
+    def test_burst_is_immediate(self):
+        """Las primeras `burst` peticiones no esperan."""
+        bucket = TokenBucket(rate=1.0, burst=3)
+
+        waits = [bucket.acquire() for _ in range(3)]
+
+        assert waits == [0.0, 0.0, 0.0]
+
+    def test_paces_after_burst(self):
+        """Agotada la ráfaga, espacia según la tasa."""
+        bucket = TokenBucket(rate=20.0, burst=1)
+
+        start = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+        elapsed = time.monotonic() - start
+
+        assert elapsed == pytest.approx(4 / 20.0, abs=0.05)
+
+    def test_thread_safe_pacing(self):
+        """Hilos concurrentes quedan espaciados (sin carreras sobre el estado)."""
+        bucket = TokenBucket(rate=50.0, burst=1)
+        stamps = []
+        lock = threading.Lock()
+
+        def worker():
+            for _ in range(5):
+                bucket.acquire()
+                with lock:
+                    stamps.append(time.monotonic())
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        start = time.monotonic()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(stamps) == 20
+        assert max(stamps) - start >= 19 / 50.0 - 0.02
+
+    def test_penalize_honors_retry_after(self):
+        """Tras un 429 con Retry-After no entrega tokens antes del plazo."""
+        bucket = TokenBucket(rate=100.0, burst=5)
+        bucket.penalize(retry_after=0.3)
+
+        wait = bucket.acquire()
+
+        assert wait >= 0.3
+        assert bucket.rate == 50.0
+
+    def test_rate_recovers_on_success(self):
+        """La tasa vuelve gradualmente a la base tras respuestas exitosas."""
+        bucket = TokenBucket(rate=10.0, burst=1)
+        bucket.penalize()
+        for _ in range(20):
+            bucket.record_success()
+
+        assert bucket.rate == 10.0
+
+    def test_invalid_rate(self):
+        """Rechaza tasas no positivas."""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+# ============================================================================
+# TESTS DE RATE LIMITER POR HOST
+# ============================================================================
+
+class TestRateLimiter:
+    """Tests del limitador multi-host."""
+
+    def test_hosts_are_independent(self):
+        """Agotar un host no frena a otro."""
+        limiter = RateLimiter()
+        limiter.configure('sibom.slyt.gba.gob.ar', rate=0.1, burst=1)
+        limiter.configure('openrouter.ai', rate=0.1, burst=1)
+
+        assert limiter.acquire('https://sibom.slyt.gba.gob.ar/cities/1') == 0.0
+        assert limiter.acquire('openrouter.ai') == 0.0
+
+    def test_unknown_host_uses_defaults(self):
+        """Hosts sin configurar usan la tasa por defecto."""
+        limiter = RateLimiter(default_rate=2.0, default_burst=4)
+
+        bucket = limiter.bucket('example.com')
+
+        assert bucket.rate == 2.0
+        assert bucket.burst == 4
+
+    def test_host_of(self):
+        """Normaliza URLs a host."""
+        assert host_of('https://sibom.slyt.gba.gob.ar/bulletins/1') == 'sibom.slyt.gba.gob.ar'
+        assert host_of('openrouter.ai') == 'openrouter.ai'
+
+    def test_parse_retry_after(self):
+        """Interpreta segundos y fechas HTTP."""
+        assert parse_retry_after('12') == 12.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after('basura') is None
+        assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+
+
+# ============================================================================
+# TESTS DE INTEGRACIÓN CON EL CLIENTE HTTP
+# ============================================================================
+
+class TestHTTPThrottling:
+    """Tests de frenado ante 429/503."""
+
+    def test_429_is_retried_after_retry_after(self, sibom_server):
+        """Reintenta tras el Retry-After y luego obtiene la página."""
+        calls = {'n': 0}
+
+        def flaky(_headers):
+            calls['n'] += 1
+            if calls['n'] == 1:
+                return 429, {'Retry-After': '1'}, 'slow down'
+            return 200, {}, 'ok'
+
+        sibom_server.routes['/cities/5'] = flaky
+        limiter = RateLimiter(default_rate=100.0, default_burst=5)
+        client = HTTPClient(rate_limiter=limiter, timeout=5)
+
+        start = time.monotonic()
+        html = client.fetch_text(f"{sibom_server.base_url}/cities/5")
+        elapsed = time.monotonic() - start
+        client.close()
+
+        assert html == 'ok'
+        assert elapsed >= 1.0
+        assert limiter.stats()['127.0.0.1']['penalties'] == 1
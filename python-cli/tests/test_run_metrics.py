@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Tests para las métricas por etapa de una corrida.
+"""
+
+import json
+import time
+
+import pytest
+
+from http_client import HTTPClient
+from norm_parser import build_norm_timed
+from rate_limiter import RateLimiter
+from run_metrics import LatencyStats, RunMetrics
+
+NORM_HTML = ('<html><body><div id="frontend-container"><p>Decreto</p>'
+             '<p>' + 'Visto el expediente y considerando lo dispuesto. ' * 5 + '</p>'
+             '<p>Artículo 1: Fíjase el monto de $ 1.500,00.</p></div></body></html>')
+
+
+# ============================================================================
+# TESTS DE HISTOGRAMAS Y CONTADORES
+# ============================================================================
+
+class TestLatencyStats:
+    """Tests de percentiles."""
+
+    def test_quantiles(self):
+        """p50/p95/max por rango más cercano."""
+        stats = LatencyStats()
+        for ms in range(1, 101):
+            stats.observe(ms / 1000)
+
+        data = stats.to_dict()
+        assert data['count'] == 100
+        assert data['p50_seconds'] == pytest.approx(0.050)
+        assert data['p95_seconds'] == pytest.approx(0.095)
+        assert data['max_seconds'] == pytest.approx(0.100)
+        assert data['total_seconds'] == pytest.approx(5.05)
+
+    def test_reservoir_is_bounded(self):
+        """Con muchas observaciones la memoria queda acotada y count/max son exactos."""
+        stats = LatencyStats(reservoir_size=64)
+        for n in range(10_000):
+            stats.observe(n)
+
+        assert len(stats._samples) == 64
+        assert stats.count == 10_000
+        assert stats.max == 9_999
+
+    def test_empty(self):
+        """Sin observaciones los percentiles son 0."""
+        assert LatencyStats().to_dict()['p95_seconds'] == 0.0
+
+
+class TestRunMetrics:
+    """Tests de registro y exportación."""
+
+    def test_timer_records_on_error(self):
+        """El timer registra la duración aunque el bloque falle."""
+        metrics = RunMetrics()
+        with pytest.raises(RuntimeError):
+            with metrics.timer('fetch'):
+                raise RuntimeError('boom')
+
+        assert metrics.snapshot()['stages']['fetch']['count'] == 1
+
+    def test_snapshot_contents(self):
+        """El snapshot incluye contadores, etapas y memoria pico."""
+        metrics = RunMetrics()
+        metrics.count('bytes_fetched', 1500)
+        metrics.count('bytes_fetched', 500)
+        metrics.observe_many({'norm_parse': 0.01, 'norm_montos': 0.002})
+
+        snap = metrics.snapshot()
+        assert snap['counters'] == {'bytes_fetched': 2000}
+        assert set(snap['stages']) == {'norm_parse', 'norm_montos'}
+        assert snap['run']['peak_rss_bytes'] > 0
+
+    def test_write_json_and_prometheus(self, tmp_path):
+        """El formato del reporte depende de la extensión."""
+        metrics = RunMetrics()
+        metrics.count('http_requests', 3)
+        metrics.observe('fetch', 0.25)
+
+        report = json.loads(metrics.write(tmp_path / 'run.json').read_text())
+        assert report['counters']['http_requests'] == 3
+
+        prom = metrics.write(tmp_path / 'run.prom').read_text()
+        assert 'sibom_scraper_http_requests_total 3' in prom
+        assert 'sibom_scraper_stage_seconds{stage="fetch",quantile="0.95"} 0.25' in prom
+        assert 'sibom_scraper_stage_seconds_count{stage="fetch"} 1' in prom
+        assert not list(tmp_path.glob('*.tmp'))
+
+    def test_periodic_reporting(self, tmp_path):
+        """Con intervalo, el reporte se reescribe durante la corrida."""
+        metrics = RunMetrics()
+        path = tmp_path / 'run.json'
+        metrics.start_reporting(path, interval=0.05)
+        try:
+            metrics.count('norms_processed')
+            deadline = time.monotonic() + 2
+            while not path.exists() and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            metrics.stop_reporting()
+
+        assert json.loads(path.read_text())['counters']['norms_processed'] == 1
+
+
+# ============================================================================
+# TESTS DE INSTRUMENTACIÓN
+# ============================================================================
+
+class TestInstrumentation:
+    """Tests de las etapas registradas por el cliente y el parseo."""
+
+    def test_http_client_records_fetch(self, sibom_server):
+        """Cada petición registra espera, latencia y bytes."""
+        sibom_server.add_page('/bulletins/1', 'x' * 2048)
+        metrics = RunMetrics()
+        client = HTTPClient({}, rate_limiter=RateLimiter(default_rate=1000, default_burst=10),
+                            metrics=metrics)
+        try:
+            client.fetch_text(f'{sibom_server.base_url}/bulletins/1')
+        finally:
+            client.close()
+
+        snap = metrics.snapshot()
+        assert snap['counters']['bytes_fetched'] == 2048
+        assert snap['counters']['http_requests'] == 1
+        assert snap['stages']['fetch']['count'] == 1
+        assert snap['stages']['rate_limit_wait']['count'] == 1
+
+    def test_build_norm_timed(self):
+        """La etapa CPU devuelve la norma y la duración de cada sub-etapa."""
+        meta = {'id': '1', 'tipo': 'decreto', 'titulo': 'Decreto Nº 1/2026',
+                'fecha': '02/01/2026', 'preview': ''}
+        norma, timings = build_norm_timed((meta, 'https://x/bulletins/1/contents/1',
+                                           NORM_HTML, None, 'Merlo'))
+
+        assert norma['montos_extraidos']
+        assert set(timings) == {'norm_parse', 'norm_extract', 'norm_montos'}
+
+    def test_build_norm_timed_on_download_error(self):
+        """Si la descarga falló no hay etapas medidas."""
+        meta = {'id': '1', 'tipo': 'decreto', 'titulo': 'Decreto', 'fecha': ''}
+        norma, timings = build_norm_timed((meta, 'https://x', None, 'timeout', 'Merlo'))
+
+        assert norma['metadata']['scraping_failed']
+        assert timings == {}
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests para el particionado determinístico y el merge de shards.
+"""
+
+import json
+
+import pytest
+
+from crawl_state import CityWatermarks
+from monto_extractor import MontoExtractor
+from normativas_extractor import save_indexes_from_jsonl
+from sharding import filter_shard, merge_shards, parse_shard, shard_of
+from status_store import BulletinStatusStore
+from test_index_spool import make_monto, make_normativa
+
+
+def write_shard(shard_dir, montos, normativas, statuses, watermarks):
+    """Simula las salidas de un runner en su directorio de trabajo"""
+    boletines = shard_dir / 'boletines'
+    boletines.mkdir(parents=True)
+    MontoExtractor().save_index_from_jsonl(montos, shard_dir / 'montos_index.json')
+    save_indexes_from_jsonl([n.to_dict() for n in normativas], shard_dir / 'normativas_index.json',
+                            shard_dir / 'c.json', shard_dir / 'm.json')
+    store = BulletinStatusStore(boletines / '.status.db')
+    for url, status in statuses:
+        store.upsert('1º', '', '', url, status)
+    marks = CityWatermarks(boletines / '.watermarks.json')
+    for city_id, bulletin_id in watermarks:
+        marks.update(city_id, bulletin_id)
+
+
+class TestPartition:
+    """Tests de la asignación de shards."""
+
+    def test_parse_shard(self):
+        assert parse_shard('2/4') == (2, 4)
+        for bad in ('0/4', '5/4', '2', 'a/b', '1/0'):
+            with pytest.raises(ValueError):
+                parse_shard(bad)
+
+    def test_every_item_in_exactly_one_shard(self):
+        """Las particiones son disjuntas y cubren todo, en orden original."""
+        cities = list(range(1, 137))
+        parts = [filter_shard(cities, (i, 4)) for i in range(1, 5)]
+
+        assert sorted(c for part in parts for c in part) == cities
+        assert all(part == sorted(part) for part in parts)
+        assert all(part for part in parts)
+
+    def test_assignment_is_stable(self):
+        """La asignación no depende del proceso (no usa hash())."""
+        assert [shard_of(f'/bulletins/{n}', 3) for n in (1, 2, 3)] == [
+            shard_of(f'/bulletins/{n}', 3) for n in (1, 2, 3)]
+        assert shard_of(22, 4) == shard_of('22', 4)
+
+
+class TestMergeShards:
+    """Tests de merge_shards."""
+
+    def test_merges_all_outputs(self, tmp_path):
+        write_shard(tmp_path / 's1', [make_monto(1), make_monto(1)], [make_normativa(1)],
+                    [('u1', 'completed')], [(22, 100), (23, 50)])
+        write_shard(tmp_path / 's2', [make_monto(2)], [make_normativa(2), make_normativa(1)],
+                    [('u2', 'error')], [(22, 90)])
+        out = tmp_path / 'out'
+
+        counts = merge_shards([tmp_path / 's1', tmp_path / 's2'], out)
+
+        assert counts == {'montos': 3, 'normativas': 2, 'boletines': 2, 'ciudades': 2}
+        assert len(json.loads((out / 'montos_index.json').read_text())['records']) == 3
+        assert [n['id'] for n in json.loads((out / 'normativas_index_minimal.json').read_text())] == ['1', '2']
+        assert '❌ Error' in (out / 'boletines' / 'boletines.md').read_text()
+        marks = CityWatermarks(out / 'boletines' / '.watermarks.json')
+        assert marks.get(22) == 90 and marks.get(23) == 50
+
+    def test_missing_shard_outputs(self, tmp_path):
+        """Un shard sin salidas (sin ciudades asignadas) no rompe el merge."""
+        (tmp_path / 'empty').mkdir()
+
+        counts = merge_shards([tmp_path / 'empty'], tmp_path / 'out')
+
+        assert counts['montos'] == counts['normativas'] == 0
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests para el store de status de boletines (SQLite) y el render de boletines.md.
+"""
+
+import threading
+
+from status_store import MD_HEADER, BulletinStatusStore
+
+URL = 'https://sibom.slyt.gba.gob.ar/bulletins/{}'
+
+
+class TestBulletinStatusStore:
+    """Tests de BulletinStatusStore."""
+
+    def test_upsert_keeps_position(self, tmp_path):
+        """Actualizar un boletín cambia su status sin moverlo de lugar."""
+        store = BulletinStatusStore(tmp_path / 's.db')
+        store.upsert('105º', '23/12/2025', '105º de Carlos Tejedor', URL.format(1), 'error')
+        store.upsert('104º', '11/12/2025', '104º de Carlos Tejedor', URL.format(2), 'completed')
+        store.upsert('105º', '23/12/2025', '105º de Carlos Tejedor', URL.format(1), 'completed')
+
+        assert [(r[3], r[4]) for r in store.rows()] == [
+            (URL.format(1), 'completed'), (URL.format(2), 'completed')]
+
+    def test_same_number_different_city(self, tmp_path):
+        """Boletines con el mismo número en distintas ciudades no se pisan."""
+        store = BulletinStatusStore(tmp_path / 's.db')
+        store.upsert('58º', '', '58º de Daireaux', URL.format(1), 'completed')
+        store.upsert('58º', '', '58º de Campana', URL.format(2), 'no_content')
+
+        assert len(store.rows()) == 2
+
+    def test_concurrent_upserts(self, tmp_path):
+        """Varios hilos escriben a la vez sin perder filas."""
+        store = BulletinStatusStore(tmp_path / 's.db')
+
+        def worker(offset):
+            for i in range(25):
+                store.upsert(f'{offset + i}º', '', '', URL.format(offset + i), 'completed')
+
+        threads = [threading.Thread(target=worker, args=(n * 100,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(store.rows()) == 200
+
+    def test_imports_existing_markdown_and_renders(self, tmp_path):
+        """Un boletines.md existente se importa y se vuelve a generar igual."""
+        md = tmp_path / 'boletines.md'
+        rows = (
+            f"| 105º | 23/12/2025 | 105º de Carlos Tejedor | [{URL.format(1)}]({URL.format(1)}) | ✅ Completado |\n"
+            f"| 103º | 04/12/2025 | 103º de Carlos Tejedor | [{URL.format(3)}]({URL.format(3)}) | ⚠️ Sin contenido |\n"
+        )
+        md.write_text(MD_HEADER + rows, encoding='utf-8')
+
+        store = BulletinStatusStore(tmp_path / 's.db', markdown_path=md)
+        assert store.get(URL.format(3))['status'] == 'no_content'
+
+        store.upsert('106º', '30/12/2025', '106º de Carlos Tejedor', URL.format(4), 'skipped')
+        store.render_markdown()
+
+        assert md.read_text(encoding='utf-8') == MD_HEADER + rows + (
+            f"| 106º | 30/12/2025 | 106º de Carlos Tejedor | [{URL.format(4)}]({URL.format(4)}) | 🤖 Creado |\n")
+
+    def test_scraper_records_status(self, scraper, tmp_path):
+        """_update_index_md registra en el store y el render queda al final."""
+        scraper._update_index_md(
+            {'number': '33º', 'date': '01/02/2025', 'description': '33º de Merlo',
+             'link': '/bulletins/1636', 'status': 'error'},
+            tmp_path, 'https://sibom.slyt.gba.gob.ar')
+
+        assert not (tmp_path / 'boletines.md').exists()
+        scraper.render_status_indexes()
+        assert '❌ Error' in (tmp_path / 'boletines.md').read_text(encoding='utf-8')
@@ -11,6 +11,8 @@ import json
 import sys
 from pathlib import Path
 
+from bs4 import BeautifulSoup
+
 # Agregar directorio padre al path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -487,6 +489,21 @@ class TestErrorHandling:
         
         # Ambas tablas deben procesarse
         assert len(tables) == 2
+    
+    def test_fallback_after_partial_replacement(self, extractor, multiple_tables_html, monkeypatch):
+        """El fallback no usa el árbol con tablas ya reemplazadas a medias."""
+        def replace_first_then_fail(soup, table_elements, tables):
+            table_elements[0].replace_with("[TABLA_1]")
+            raise RuntimeError("falla a mitad del reemplazo")
+        
+        monkeypatch.setattr(extractor, '_replace_tables_with_placeholders', replace_first_then_fail)
+        soup = BeautifulSoup(multiple_tables_html, 'lxml')
+        
+        text, tables = extractor.extract_tables(multiple_tables_html, soup=soup)
+        
+        assert tables == []
+        assert "[TABLA_" not in text
+        assert "A1" in text and "Segunda sección" in text
 
 
 # ============================================================================